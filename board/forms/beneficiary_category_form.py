@@ -40,10 +40,8 @@ class BeneficiaryCategoryForm(forms.ModelForm, ValidationMixin):
                     'beneficiary_category'
                 ).filter(
                     user=self.cleaned_data.get('user'),
-                    ben_status=True
-                ).extra(
-                    where=['MD5(ben_slug)=%s'],
-                    params=[self.data.get('edit_beneficiary')]
+                    ben_status=True,
+                    ben_slug_hash=self.data.get('edit_beneficiary')
                 ).values(
                     'beneficiary_category__id',
                     'beneficiary_category__user_id',
@@ -65,9 +63,7 @@ class BeneficiaryCategoryForm(forms.ModelForm, ValidationMixin):
                         cat_description=description,
                         cat_status=True,
                         beneficiary__ben_status=True,
-                    ).extra(
-                        where=['MD5(ben_slug)=%s'],
-                        params=[self.data.get('edit_beneficiary')]
+                        beneficiary__ben_slug_hash=self.data.get('edit_beneficiary')  # noqa: E501
                     ).exists()
                     if itself:
                         exists = False
@@ -106,10 +102,8 @@ class BeneficiaryForm(forms.ModelForm, ValidationMixin):
             itself = Beneficiary.objects.filter(
                 user=self.cleaned_data.get('user'),
                 ben_name=name,
-                ben_status=True
-            ).extra(
-                where=['MD5(ben_slug)=%s'],
-                params=[self.data.get('edit_beneficiary')]
+                ben_status=True,
+                ben_slug_hash=self.data.get('edit_beneficiary')
             ).exists()
             if itself:
                 exists = False
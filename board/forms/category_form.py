@@ -32,9 +32,7 @@ class CategoryForm(forms.ModelForm, ValidationMixin):
                 cat_name=category,
                 cat_status=True,
                 subcategory__sub_status=True,
-            ).extra(
-                where=['MD5(sub_slug)=%s'],
-                params=[self.data.get('edit_category')]
+                subcategory__sub_slug_hash=self.data.get('edit_category')
             ).exists()
             if itself:
                 exists = False
@@ -72,10 +70,8 @@ class SubCategoryForm(forms.ModelForm, ValidationMixin):
             itself = SubCategory.objects.filter(
                 category=self.cleaned_data.get('category'),
                 sub_name=subcategory,
-                sub_status=True
-            ).extra(
-                where=['MD5(sub_slug)=%s'],
-                params=[self.data.get('edit_category')]
+                sub_status=True,
+                sub_slug_hash=self.data.get('edit_category')
             ).exists()
             if itself:
                 exists = False
@@ -43,10 +43,8 @@ class ClientForm(forms.ModelForm, ValidationMixin):
             itself = Client.objects.filter(
                 user=self.cleaned_data.get('user'),
                 cli_name__iexact=name,
-                cli_status=True
-            ).extra(
-                where=['MD5(cli_slug)=%s'],
-                params=[self.data.get('edit_client')]
+                cli_status=True,
+                cli_slug_hash=self.data.get('edit_client')
             ).exists()
             if itself:
                 exists = False
@@ -84,10 +82,8 @@ class ClientForm(forms.ModelForm, ValidationMixin):
                 itself = Client.objects.filter(
                     user=self.cleaned_data.get('user'),
                     cli_email=email,
-                    cli_status=True
-                ).extra(
-                    where=['MD5(cli_slug)=%s'],
-                    params=[self.data.get('edit_client')]
+                    cli_status=True,
+                    cli_slug_hash=self.data.get('edit_client')
                 ).exists()
                 if itself:
                     exists = False
@@ -41,10 +41,8 @@ class FinancialForm(forms.ModelForm, ValidationMixin):
                 itself = Financial.objects.filter(
                     user=self.cleaned_data.get('user'),
                     fin_cost_center__iexact=cost_center,
-                    fin_status=True
-                ).extra(
-                    where=['MD5(fin_slug)=%s'],
-                    params=[self.data.get('edit_financial')]
+                    fin_status=True,
+                    fin_slug_hash=self.data.get('edit_financial')
                 ).exists()
                 if itself:
                     exists = False
@@ -120,10 +118,8 @@ class FinancialForm(forms.ModelForm, ValidationMixin):
                     fin_bank_name=self.cleaned_data.get('fin_bank_name'),
                     fin_bank_branch=self.cleaned_data.get('fin_bank_branch'),
                     fin_bank_account=account,
-                    fin_status=True
-                ).extra(
-                    where=['MD5(fin_slug)=%s'],
-                    params=[self.data.get('edit_financial')]
+                    fin_status=True,
+                    fin_slug_hash=self.data.get('edit_financial')
                 ).exists()
                 if itself:
                     exists = False
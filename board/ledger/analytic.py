@@ -0,0 +1,187 @@
+from datetime import datetime
+
+from board.ledger.balance import signed_amount
+from board.models import MonthlySummary, Release
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+from library.utils.cache import bump_version
+
+CAT_TYPES = (1, 2)
+
+SUMMARY_FIELDS = [
+    'mon_amount',
+    'mon_entries',
+    'mon_overall_balance',
+    'mon_status',
+    'mon_date_updated'
+]
+
+
+def recalculate(user, date):
+    ''' Rebuild monthly summaries from the cycle of date onwards '''
+    cycle = date.replace(day=1)
+
+    with transaction.atomic():
+        # overall balance carried into the first affected cycle
+        anchor = Release.objects.filter(
+            user=user,
+            rel_entry_date__lt=cycle,
+            rel_status=True,
+        ).order_by(
+            '-rel_sqn'
+        ).values('rel_overall_balance').first()
+
+        # amount and entries of every affected cycle and type in one query
+        totals = Release.objects.filter(
+            user=user,
+            rel_entry_date__gte=cycle,
+            rel_status=True,
+        ).annotate(
+            cycle=TruncMonth('rel_entry_date')
+        ).values(
+            'cycle',
+            'subcategory__category__cat_type'
+        ).annotate(
+            total=Sum('rel_amount'),
+            entries=Count('id')
+        ).order_by('cycle')
+
+        cycles = {}
+        for each in totals:
+            cat_type = each['subcategory__category__cat_type']
+            cycles.setdefault(each['cycle'], {})[cat_type] = (
+                each['total'], each['entries']
+            )
+
+        existing = {
+            (summary.mon_cycle, summary.mon_cat_type): summary
+            for summary in MonthlySummary.objects.filter(
+                user=user,
+                mon_cycle__gte=cycle
+            )
+        }
+
+        now = datetime.now()
+        overall = anchor['rel_overall_balance'] if anchor else 0
+        changed, created = [], []
+        months = set(cycles) | {month for month, _ in existing}
+        for month in sorted(months):
+            values = cycles.get(month, {})
+            for cat_type, (total, _) in values.items():
+                overall = overall + signed_amount(total, cat_type)
+
+            for cat_type in CAT_TYPES:
+                total, entries = values.get(cat_type, (0, 0))
+                summary = existing.get((month, cat_type))
+
+                # rows left without entries are disabled, not deleted
+                if summary is not None:
+                    summary.mon_amount = total
+                    summary.mon_entries = entries
+                    summary.mon_overall_balance = overall if values else 0
+                    summary.mon_status = bool(entries)
+                    summary.mon_date_updated = now
+                    changed.append(summary)
+                elif values:
+                    created.append(MonthlySummary(
+                        user_id=user,
+                        mon_cycle=month,
+                        mon_cat_type=cat_type,
+                        mon_amount=total,
+                        mon_entries=entries,
+                        mon_overall_balance=overall,
+                        mon_status=bool(entries),
+                        mon_date_created=now,
+                        mon_date_updated=now
+                    ))
+
+        if changed:
+            MonthlySummary.objects.bulk_update(changed, SUMMARY_FIELDS)
+        if created:
+            MonthlySummary.objects.bulk_create(created)
+
+    # reports cached against the previous ledger version are discarded
+    bump_version('ledger', user)
+    transaction.on_commit(lambda: bump_version('ledger', user))
+
+
+def append(user, date, cat_type, amount, overall):
+    ''' Add an entry placed after the tail to its cycle summaries '''
+    cycle = date.replace(day=1)
+
+    with transaction.atomic():
+        existing = {
+            summary.mon_cat_type: summary
+            for summary in MonthlySummary.objects.filter(
+                user=user,
+                mon_cycle=cycle
+            )
+        }
+
+        now = datetime.now()
+        changed, created = [], []
+        for each in CAT_TYPES:
+            summary = existing.get(each)
+            if summary is None:
+                summary = MonthlySummary(
+                    user_id=user,
+                    mon_cycle=cycle,
+                    mon_cat_type=each,
+                    mon_amount=0,
+                    mon_entries=0,
+                    mon_date_created=now
+                )
+                created.append(summary)
+            else:
+                changed.append(summary)
+
+            if each == cat_type:
+                summary.mon_amount += amount
+                summary.mon_entries += 1
+            summary.mon_overall_balance = overall
+            summary.mon_status = bool(summary.mon_entries)
+            summary.mon_date_updated = now
+
+        if changed:
+            MonthlySummary.objects.bulk_update(changed, SUMMARY_FIELDS)
+        if created:
+            MonthlySummary.objects.bulk_create(created)
+
+    bump_version('ledger', user)
+    transaction.on_commit(lambda: bump_version('ledger', user))
+
+
+def month_summary(user, cycle):
+    ''' Totals of the cycle, or of the last cycle before it with entries '''
+    summaries = MonthlySummary.objects.filter(
+        user=user,
+        mon_cycle=cycle,
+        mon_status=True
+    )
+    past = False
+
+    if not summaries:
+        last = MonthlySummary.objects.filter(
+            user=user,
+            mon_cycle__lt=cycle,
+            mon_status=True
+        ).order_by('-mon_cycle').values('mon_cycle').first()
+        if not last:
+            return None, True
+        summaries = MonthlySummary.objects.filter(
+            user=user,
+            mon_cycle=last['mon_cycle'],
+            mon_status=True
+        )
+        past = True
+
+    monthly = {'revenue': 0, 'expenses': 0, 'balance': 0}
+    for summary in summaries:
+        key = 'revenue' if summary.mon_cat_type == 1 else 'expenses'
+        monthly[key] += summary.mon_amount
+        monthly['balance'] += signed_amount(
+            summary.mon_amount, summary.mon_cat_type
+        )
+        overall = summary.mon_overall_balance
+    return {'monthly': monthly, 'overall': overall}, past
@@ -0,0 +1,225 @@
+import os
+from bisect import bisect_right
+from datetime import datetime
+from decimal import Decimal
+
+from board.models import LedgerHead, Release
+from django.db import transaction
+from django.db.models import F, Max
+
+CHUNK_SIZE = int(os.getenv('LEDGER_CHUNK_SIZE', 1000))
+# rows per UPDATE statement, keeps the CASE WHEN chains short to compile
+UPDATE_BATCH_SIZE = int(os.getenv('LEDGER_UPDATE_BATCH_SIZE', 200))
+
+BALANCE_FIELDS = [
+    'rel_sqn',
+    'rel_monthly_balance',
+    'rel_overall_balance',
+    'rel_date_updated'
+]
+
+
+def signed_amount(amount, cat_type):
+    # revenues add to the balance, everything else is subtracted
+    return amount * (1 if cat_type == 1 else -1)
+
+
+def same_month(date, other):
+    return (date.year, date.month) == (other.year, other.month)
+
+
+class Positions:
+    # last sequence number per entry date, to place backdated rows
+    def __init__(self, user):
+        positions = Release.objects.filter(
+            user=user,
+            rel_status=True
+        ).values(
+            'rel_entry_date'
+        ).annotate(
+            last_sqn=Max('rel_sqn')
+        ).order_by('rel_entry_date')
+        self.dates, self.sqns = [], []
+        for each in positions:
+            self.dates.append(each['rel_entry_date'])
+            self.sqns.append(max(self.sqns[-1:] + [each['last_sqn']]))
+
+    def sqn(self, entry_date):
+        ''' The position an entry of this date would get through the form '''
+        position = bisect_right(self.dates, entry_date)
+        return (self.sqns[position - 1] if position else 0) + 1
+
+
+def rebalance(user, sqn=None, chunk_size=CHUNK_SIZE, date=None):
+    ''' Renumber and recompute running balances from sqn, or from date '''
+    with transaction.atomic():
+        if date is None:
+            anchor = _anchor(user, sqn=sqn)
+            entries = Release.objects.filter(
+                user=user,
+                rel_sqn__gte=sqn,
+                rel_status=True,
+            ).order_by(
+                'rel_sqn',
+                'rel_entry_date',
+                'id'
+            )
+        else:
+            # positions from date onwards may be stale after deferred
+            # writes, the entry dates order them
+            anchor = _anchor(user, date=date)
+            entries = Release.objects.filter(
+                user=user,
+                rel_entry_date__gte=date,
+                rel_status=True,
+            ).order_by(
+                'rel_entry_date',
+                'rel_sqn',
+                'id'
+            )
+        entries = entries.values(
+            'id',
+            'rel_sqn',
+            'rel_entry_date',
+            'rel_amount',
+            'rel_monthly_balance',
+            'rel_overall_balance',
+            'subcategory__category__cat_type'
+        )
+
+        if anchor:
+            last_sqn = anchor['rel_sqn']
+            last_entry_date = anchor['rel_entry_date']
+            monthly_balance = anchor['rel_monthly_balance']
+            overall_balance = anchor['rel_overall_balance']
+        else:
+            last_sqn = 0
+            last_entry_date = None
+            monthly_balance = overall_balance = 0
+
+        now = datetime.now()
+        changed = []
+        updated = 0
+        for each in entries.iterator(chunk_size=chunk_size):
+            amount = signed_amount(
+                each['rel_amount'], each['subcategory__category__cat_type']
+            )
+            if last_entry_date and \
+               same_month(each['rel_entry_date'], last_entry_date):
+                monthly_balance = monthly_balance + amount
+            else:
+                monthly_balance = amount
+            overall_balance = overall_balance + amount
+            last_sqn = last_sqn + 1
+            last_entry_date = each['rel_entry_date']
+
+            # only rows whose derived values moved are written back
+            if each['rel_sqn'] != last_sqn or \
+               each['rel_monthly_balance'] != monthly_balance or \
+               each['rel_overall_balance'] != overall_balance:
+                changed.append((
+                    last_sqn,
+                    monthly_balance,
+                    overall_balance,
+                    now,
+                    each['id']
+                ))
+
+            if len(changed) == chunk_size:
+                updated += _write(changed)
+                changed = []
+
+        if changed:
+            updated += _write(changed)
+
+        # the head follows the renumbered tail of the ledger
+        LedgerHead.objects.filter(
+            user=user
+        ).update(
+            led_sqn=last_sqn,
+            led_date=last_entry_date,
+            led_monthly_balance=monthly_balance,
+            led_overall_balance=overall_balance,
+            led_version=F('led_version') + 1,
+            led_date_updated=now
+        )
+    return updated
+
+
+def append(release, head, cat_type):
+    ''' Running balances of a new entry placed right after the tail '''
+    amount = signed_amount(Decimal(release.rel_amount), cat_type)
+    if head.led_date and same_month(release.rel_entry_date, head.led_date):
+        monthly_balance = head.led_monthly_balance + amount
+    else:
+        monthly_balance = amount
+    overall_balance = head.led_overall_balance + amount
+
+    now = datetime.now()
+    _write([(
+        release.rel_sqn, monthly_balance, overall_balance, now, release.id
+    )])
+    LedgerHead.objects.filter(
+        user=head.user_id
+    ).update(
+        led_sqn=release.rel_sqn,
+        led_date=release.rel_entry_date,
+        led_monthly_balance=monthly_balance,
+        led_overall_balance=overall_balance,
+        led_version=F('led_version') + 1,
+        led_date_updated=now
+    )
+    release.rel_monthly_balance = monthly_balance
+    release.rel_overall_balance = overall_balance
+    return overall_balance
+
+
+def _anchor(user, sqn=None, date=None):
+    # last untouched entry, the running balances start from it; right
+    # after the tail it is the ledger head and no entry is scanned
+    if date is None:
+        head = LedgerHead.objects.filter(
+            user=user
+        ).values(
+            'led_sqn',
+            'led_date',
+            'led_monthly_balance',
+            'led_overall_balance'
+        ).first()
+        if head and head['led_sqn'] and sqn == head['led_sqn'] + 1:
+            return {
+                'rel_sqn': head['led_sqn'],
+                'rel_entry_date': head['led_date'],
+                'rel_monthly_balance': head['led_monthly_balance'],
+                'rel_overall_balance': head['led_overall_balance']
+            }
+        before = {'rel_sqn__lt': sqn}
+    else:
+        before = {'rel_entry_date__lt': date}
+
+    return Release.objects.filter(
+        user=user,
+        rel_status=True,
+        **before
+    ).order_by(
+        '-rel_sqn'
+    ).values(
+        'rel_sqn',
+        'rel_entry_date',
+        'rel_monthly_balance',
+        'rel_overall_balance'
+    ).first()
+
+
+def _write(rows):
+    # one statement per batch, executemany would send an UPDATE per row
+    Release.objects.bulk_update([
+        Release(
+            id=pk,
+            rel_sqn=sqn,
+            rel_monthly_balance=monthly,
+            rel_overall_balance=overall,
+            rel_date_updated=updated
+        ) for sqn, monthly, overall, updated, pk in rows
+    ], BALANCE_FIELDS, batch_size=UPDATE_BATCH_SIZE)
+    return len(rows)
@@ -0,0 +1,78 @@
+import os
+
+from board.models import Release
+from django.db.models import Q
+
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+
+STATUS = {1: 'Paid', 2: 'Open', 3: 'In negotiation', 4: 'Received',
+          5: 'Booked'}
+
+HEADER = [
+    'Sequence',
+    'Entry Date',
+    'Type',
+    'Category',
+    'Subcategory',
+    'Description',
+    'Beneficiary',
+    'Client',
+    'Cost Center',
+    'Bank',
+    'Account',
+    'Status',
+    'Amount',
+    'Monthly Balance',
+    'Overall Balance'
+]
+
+FIELDS = [
+    'rel_sqn',
+    'rel_entry_date',
+    'subcategory__category__cat_type',
+    'subcategory__category__cat_name',
+    'subcategory__sub_name',
+    'rel_description',
+    'beneficiary__ben_name',
+    'client__cli_name',
+    'financial_cost_center__fin_cost_center',
+    'financial_account__fin_bank_name',
+    'financial_account__fin_bank_account',
+    'rel_gen_status',
+    'rel_amount',
+    'rel_monthly_balance',
+    'rel_overall_balance'
+]
+
+
+def ledger_rows(user, chunk_size=None, **filters):
+    ''' Ledger rows in sequence order, read in keyset batches '''
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    entries = Release.objects.filter(
+        user=user,
+        rel_status=True,
+        **filters
+    ).order_by('rel_sqn', 'id')
+
+    # seeking by (rel_sqn, id) keeps each batch an index range scan and
+    # never holds more than one batch, whatever the client cursor does
+    last = None
+    while True:
+        batch = entries
+        if last:
+            batch = batch.filter(
+                Q(rel_sqn__gt=last[0]) | Q(rel_sqn=last[0], id__gt=last[1])
+            )
+        batch = list(batch.values_list('id', *FIELDS)[:chunk_size])
+        for row in batch:
+            yield _format(row[1:])
+        if len(batch) < chunk_size:
+            break
+        last = (batch[-1][1], batch[-1][0])
+
+
+def _format(row):
+    row = list(row)
+    row[2] = 'Revenue' if row[2] == 1 else 'Expense'
+    row[11] = STATUS.get(row[11], row[11])
+    return row
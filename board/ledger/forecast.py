@@ -0,0 +1,131 @@
+import calendar
+import os
+from datetime import timedelta
+from itertools import accumulate
+
+from board.ledger.balance import signed_amount
+from board.models import Release
+from dateutil.relativedelta import relativedelta
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from library.utils.cache import versioned
+
+FORECAST_MONTHS = int(os.getenv('FORECAST_MONTHS', 3))
+FORECAST_MAX_MONTHS = int(os.getenv('FORECAST_MAX_MONTHS', 24))
+FORECAST_LOOKBACK_MONTHS = int(os.getenv('FORECAST_LOOKBACK_MONTHS', 6))
+FORECAST_MIN_OCCURRENCES = int(os.getenv('FORECAST_MIN_OCCURRENCES', 3))
+
+# Open, In negotiation and Booked entries have not settled yet
+PENDING = (2, 3, 5)
+
+
+def forecast(user, today, months=FORECAST_MONTHS):
+    ''' Daily projected balances, cached per ledger version '''
+    return versioned(
+        'ledger',
+        user,
+        lambda: _build(user, today, months),
+        variant=f'forecast:{today:%Y%m%d}:{months}'
+    )
+
+
+def patterns(user, today):
+    ''' Entries repeated with the same beneficiary, amount and month day '''
+    history = Release.objects.filter(
+        user=user,
+        rel_status=True,
+        rel_entry_date__gt=today - relativedelta(
+            months=FORECAST_LOOKBACK_MONTHS
+        ),
+        rel_entry_date__lte=today,
+    ).values_list(
+        'beneficiary_id',
+        'beneficiary__ben_name',
+        'rel_amount',
+        'subcategory__category__cat_type',
+        'rel_entry_date'
+    )
+
+    months = {}
+    for beneficiary, name, amount, cat_type, entry_date in history:
+        key = (beneficiary, name, amount, cat_type, entry_date.day)
+        months.setdefault(key, set()).add(entry_date.replace(day=1))
+
+    # still active: seen last month or in the current one
+    active = (today - relativedelta(months=1)).replace(day=1)
+    return [
+        {
+            'beneficiary': beneficiary,
+            'name': name,
+            'amount': amount,
+            'type': cat_type,
+            'day': day
+        }
+        for (beneficiary, name, amount, cat_type, day), seen in months.items()
+        if len(seen) >= FORECAST_MIN_OCCURRENCES and max(seen) >= active
+    ]
+
+
+def _build(user, today, months):
+    end = today + relativedelta(months=months)
+    days = (end - today).days
+    entries = Release.objects.filter(user=user, rel_status=True)
+
+    # settled entries, whatever their date, make the opening balance
+    opening = sum(
+        signed_amount(each['total'], each['subcategory__category__cat_type'])
+        for each in entries.exclude(
+            rel_gen_status__in=PENDING
+        ).values(
+            'subcategory__category__cat_type'
+        ).annotate(
+            total=Sum('rel_amount')
+        ).order_by()
+    )
+
+    # pending entries fall on their date, overdue ones on the first day
+    deltas = [0] * days
+    for amount, cat_type, entry_date in entries.filter(
+        rel_gen_status__in=PENDING,
+        rel_entry_date__lte=end,
+    ).values_list(
+        'rel_amount',
+        'subcategory__category__cat_type',
+        'rel_entry_date'
+    ):
+        deltas[max((entry_date - today).days, 1) - 1] += signed_amount(
+            amount, cat_type
+        )
+
+    # months already holding an entry of the beneficiary and amount
+    scheduled = set(entries.filter(
+        rel_entry_date__gte=today.replace(day=1),
+        rel_entry_date__lte=end,
+    ).values_list(
+        'beneficiary_id',
+        'rel_amount',
+        TruncMonth('rel_entry_date')
+    ))
+
+    # detected patterns fill the months they were not entered for yet
+    detected = patterns(user, today)
+    for pattern in detected:
+        month = today.replace(day=1)
+        while month <= end:
+            day = month.replace(day=min(
+                pattern['day'],
+                calendar.monthrange(month.year, month.month)[1]
+            ))
+            key = (pattern['beneficiary'], pattern['amount'], month)
+            if today < day <= end and key not in scheduled:
+                deltas[(day - today).days - 1] += signed_amount(
+                    pattern['amount'], pattern['type']
+                )
+            month += relativedelta(months=1)
+
+    return {
+        'opening': opening,
+        'days': [today + timedelta(days=day) for day in range(1, days + 1)],
+        'balance': list(accumulate(deltas, initial=opening))[1:],
+        'patterns': detected
+    }
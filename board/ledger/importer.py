@@ -0,0 +1,206 @@
+import csv
+import os
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from uuid import uuid4
+
+from board.ledger.balance import Positions
+from board.ledger.jobs import settle
+from board.ledger.sequence import lock
+from board.models import Beneficiary, Financial, Release, SubCategory
+from board.search import reindex_created
+from django.db import transaction
+from library.utils.helper import hash_gen
+from slugify import slugify
+
+IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 2000))
+
+# characters accepted by the entry form description validation
+DISALLOWED = re.compile(r'[^A-Za-zÀ-ú0-9!@#$%^&*()_+\-=\[\]{}\\|,.<>/?~ ]')
+
+
+def parse_csv(stream):
+    # header: date,description,amount[,subcategory,beneficiary,account]
+    for line, row in enumerate(csv.DictReader(stream), start=2):
+        row = {key.strip().lower(): (value or '').strip()
+               for key, value in row.items() if key}
+        yield line, {
+            'date': row.get('date', ''),
+            'description': row.get('description', ''),
+            'amount': row.get('amount', ''),
+            'subcategory': row.get('subcategory', ''),
+            'beneficiary': row.get('beneficiary', ''),
+            'account': row.get('account', '')
+        }
+
+
+def parse_ofx(stream, size=65536):
+    # SGML (v1) and XML (v2) statements, read as a stream of <TAG>value
+    account, transaction, line = '', None, 0
+    buffer = ''
+    while True:
+        chunk = stream.read(size)
+        buffer += chunk
+        tokens = buffer.split('<')
+        buffer = tokens.pop() if chunk else ''
+        for token in tokens:
+            tag, _, value = token.partition('>')
+            tag, value = tag.strip().upper(), value.strip()
+            if tag == 'ACCTID':
+                account = value
+            elif tag == 'STMTTRN':
+                transaction, line = {}, line + 1
+            elif tag == '/STMTTRN' and transaction is not None:
+                yield line, {
+                    'date': transaction.get('DTPOSTED', '')[:8],
+                    'description': transaction.get('MEMO') or transaction.get('NAME', ''),  # noqa: E501
+                    'amount': transaction.get('TRNAMT', '').replace(',', '.'),  # noqa: E501
+                    'subcategory': '',
+                    'beneficiary': transaction.get('NAME', ''),
+                    'account': account
+                }
+                transaction = None
+            elif transaction is not None and tag and not tag.startswith('/'):
+                transaction[tag] = value
+        if not chunk:
+            break
+
+
+def parse_date(value):
+    for pattern in ('%Y-%m-%d', '%Y%m%d', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(value, pattern).date()
+        except ValueError:
+            continue
+    raise ValueError(f'invalid date "{value}"')
+
+
+class Importer:
+    # maps statement rows to releases by name, using in-memory lookups
+    def __init__(self, user, login, income=None, expense=None, account=None,
+                 chunk_size=IMPORT_CHUNK_SIZE):
+        self.user = user
+        self.login = login
+        self.chunk_size = chunk_size
+
+        self.subcategories = {}
+        for each in SubCategory.objects.filter(
+            category__user=user,
+            category__cat_status=True,
+            sub_status=True
+        ).values('id', 'sub_name', 'category__cat_name', 'category__cat_type'):  # noqa: E501
+            value = (each['id'], each['category__cat_type'])
+            self.subcategories.setdefault(each['sub_name'].lower(), value)
+            self.subcategories[
+                f'{each["category__cat_name"]}/{each["sub_name"]}'.lower()
+            ] = value
+
+        self.beneficiaries = {
+            each['ben_name'].lower(): each['id']
+            for each in Beneficiary.objects.filter(
+                user=user,
+                ben_status=True
+            ).values('id', 'ben_name')
+        }
+
+        self.accounts = {}
+        for each in Financial.objects.filter(
+            user=user,
+            fin_cost_center__isnull=True,
+            fin_status=True
+        ).values('id', 'fin_bank_name', 'fin_bank_account'):
+            self.accounts.setdefault(
+                (each['fin_bank_name'] or '').lower(), each['id']
+            )
+            self.accounts.setdefault(each['fin_bank_account'], each['id'])
+
+        self.income = self.subcategories.get((income or '').lower())
+        self.expense = self.subcategories.get((expense or '').lower())
+        self.account = self.accounts.get((account or '').lower())
+        self.positions = None
+
+    def run(self, rows):
+        ''' Create releases from parsed rows and rebalance once at the end '''
+        created, rejected = 0, []
+        first_sqn = None
+        cycles = set()
+        batch = []
+        now = datetime.now()
+
+        with transaction.atomic():
+            # positions are read once the ledger is locked
+            lock(self.user)
+            self.positions = Positions(self.user)
+            for line, row in rows:
+                try:
+                    release = self._release(row, now)
+                except ValueError as err:
+                    rejected.append((line, str(err)))
+                    continue
+
+                batch.append(release)
+                if first_sqn is None or release.rel_sqn < first_sqn:
+                    first_sqn = release.rel_sqn
+                cycles.add(release.rel_entry_date.replace(day=1))
+
+                if len(batch) == self.chunk_size:
+                    created += self._create(batch)
+                    batch = []
+
+            if batch:
+                created += self._create(batch)
+
+            if created:
+                settle(user=self.user, sqn=first_sqn, dates=cycles)
+        return {'created': created, 'rejected': rejected}
+
+    def _create(self, batch):
+        Release.objects.bulk_create(batch)
+        reindex_created('entry', batch)
+        return len(batch)
+
+    def _release(self, row, now):
+        entry_date = parse_date(row['date'])
+        try:
+            amount = Decimal(row['amount'].replace(' ', '').replace(',', ''))
+        except InvalidOperation:
+            raise ValueError(f'invalid amount "{row["amount"]}"')
+        if not amount:
+            raise ValueError('amount cannot be zero')
+
+        if row['subcategory']:
+            subcategory = self.subcategories.get(row['subcategory'].lower())
+        else:
+            subcategory = self.income if amount > 0 else self.expense
+        if subcategory is None:
+            raise ValueError(f'unknown subcategory "{row["subcategory"]}"')
+
+        account = self.accounts.get(row['account'].lower()) or \
+            self.accounts.get(row['account']) or self.account
+
+        sqn = self.positions.sqn(entry_date)
+
+        slug = slugify(f'{self.login}-import-{uuid4().hex}')
+        return Release(
+            user_id=self.user,
+            rel_slug=slug,
+            rel_slug_hash=hash_gen(slug),
+            rel_gen_status=1,
+            rel_entry_date=entry_date,
+            rel_amount=abs(amount),
+            rel_monthly_balance=0,
+            rel_overall_balance=0,
+            rel_description=DISALLOWED.sub('', row['description'])[:250] or None,  # noqa: E501
+            subcategory_id=subcategory[0],
+            beneficiary_id=self.beneficiaries.get(row['beneficiary'].lower()),
+            financial_account_id=account,
+            rel_sqn=sqn,
+            rel_status=True,
+            rel_date_created=now,
+            rel_date_updated=now
+        )
+
+
+def parser_for(name):
+    return parse_ofx if name.lower().endswith(('.ofx', '.qfx')) else parse_csv
@@ -0,0 +1,170 @@
+import os
+from itertools import accumulate
+
+from board.ledger.analytic import CAT_TYPES, recalculate
+from board.ledger.balance import rebalance, same_month, signed_amount
+from board.ledger.jobs import pending
+from board.ledger.sequence import lock
+from board.models import LedgerHead, MonthlySummary, Release
+from django.db import transaction
+from django.db.models import Q
+
+INTEGRITY_CHUNK_SIZE = int(os.getenv('INTEGRITY_CHUNK_SIZE', 5000))
+
+
+def check(user, repair=False, chunk_size=INTEGRITY_CHUNK_SIZE):
+    ''' Divergences of a ledger from balances recomputed from its amounts '''
+    if pending(user):
+        # queued rebalances leave the ledger stale on purpose
+        return {'user': user, 'pending': True}
+
+    if not repair:
+        return _check(user, chunk_size)
+
+    with transaction.atomic():
+        lock(user)
+        report = _check(user, chunk_size)
+        # the head goes first, rebalancing may start from it
+        if report['head']:
+            LedgerHead.objects.filter(user=user).update(**report['tail'])
+        if report['first_sqn'] is not None:
+            rebalance(user=user, sqn=report['first_sqn'])
+        if report['first_cycle'] is not None:
+            recalculate(user=user, date=report['first_cycle'])
+        report['repaired'] = report['diverged']
+    return report
+
+
+def _check(user, chunk_size):
+    entries = Release.objects.filter(
+        user=user,
+        rel_status=True
+    ).order_by(
+        'rel_sqn',
+        'id'
+    ).values_list(
+        'id',
+        'rel_sqn',
+        'rel_entry_date',
+        'rel_amount',
+        'rel_monthly_balance',
+        'rel_overall_balance',
+        'subcategory__category__cat_type'
+    )
+
+    position, overall, monthly, last_date = 0, 0, 0, None
+    balances, first_sqn = 0, None
+    cycles = {}
+    # seeking by (rel_sqn, id) holds one batch of the ledger at a time,
+    # iterator() alone would still buffer the whole result on mysql
+    last = None
+    while True:
+        chunk = entries
+        if last:
+            chunk = chunk.filter(
+                Q(rel_sqn__gt=last[1]) | Q(rel_sqn=last[1], id__gt=last[0])
+            )
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            break
+        position, overall, monthly, last_date, diverged, sqn = _verify(
+            [row[1:] for row in chunk],
+            position, overall, monthly, last_date, cycles
+        )
+        balances += diverged
+        if first_sqn is None:
+            first_sqn = sqn
+        if len(chunk) < chunk_size:
+            break
+        last = chunk[-1]
+
+    summaries, first_cycle = _verify_summaries(user, cycles)
+
+    tail = {
+        'led_sqn': position,
+        'led_date': last_date,
+        'led_monthly_balance': monthly,
+        'led_overall_balance': overall
+    }
+    head = LedgerHead.objects.filter(
+        user=user
+    ).values(*tail).first()
+    head = head is not None and head != tail
+
+    return {
+        'user': user,
+        'pending': False,
+        'entries': position,
+        'balances': balances,
+        'first_sqn': first_sqn,
+        'summaries': summaries,
+        'first_cycle': first_cycle,
+        'head': head,
+        'tail': tail,
+        'diverged': bool(balances or summaries or head),
+        'repaired': False
+    }
+
+
+def _verify(chunk, position, overall, monthly, last_date, cycles):
+    amounts = [signed_amount(amount, cat_type)
+               for _, _, amount, _, _, cat_type in chunk]
+    # overall balances of the chunk as one running sum from the carry
+    overalls = list(accumulate(amounts, initial=overall))[1:]
+
+    diverged, first_sqn = 0, None
+    for row, amount, overall in zip(chunk, amounts, overalls):
+        sqn, entry_date, value, stored_monthly, stored_overall, cat_type = row
+        position += 1
+        if last_date and same_month(entry_date, last_date):
+            monthly = monthly + amount
+        else:
+            monthly = amount
+        last_date = entry_date
+
+        if sqn != position or stored_monthly != monthly or \
+           stored_overall != overall:
+            diverged += 1
+            if first_sqn is None:
+                first_sqn = min(sqn, position)
+
+        cycle = cycles.setdefault(entry_date.replace(day=1), {})
+        total, entries = cycle.get(cat_type, (0, 0))
+        cycle[cat_type] = (total + value, entries + 1)
+        cycle['overall'] = overall
+
+    return position, overall, monthly, last_date, diverged, first_sqn
+
+
+def _verify_summaries(user, cycles):
+    stored = {
+        (summary['mon_cycle'], summary['mon_cat_type']): summary
+        for summary in MonthlySummary.objects.filter(
+            user=user
+        ).values(
+            'mon_cycle',
+            'mon_cat_type',
+            'mon_amount',
+            'mon_entries',
+            'mon_overall_balance',
+            'mon_status'
+        )
+    }
+
+    diverged = set()
+    for cycle, values in cycles.items():
+        for cat_type in CAT_TYPES:
+            total, entries = values.get(cat_type, (0, 0))
+            summary = stored.get((cycle, cat_type))
+            if summary is None or (
+                summary['mon_amount'], summary['mon_entries'],
+                summary['mon_overall_balance'], summary['mon_status']
+            ) != (total, entries, values['overall'], bool(entries)):
+                diverged.add(cycle)
+
+    # summaries of cycles left without entries must be disabled
+    diverged.update(
+        cycle for (cycle, _), summary in stored.items()
+        if cycle not in cycles and summary['mon_status']
+    )
+    return len(diverged), min(diverged) if diverged else None
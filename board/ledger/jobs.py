@@ -0,0 +1,69 @@
+import os
+from datetime import datetime
+
+from board.ledger.analytic import recalculate
+from board.ledger.balance import rebalance
+from board.ledger.rollup import refresh
+from board.models import LedgerHead, LedgerJob
+from django.db import transaction
+from django.db.models import Min
+
+LEDGER_DEFERRED = os.getenv('LEDGER_DEFERRED', '0') == '1'
+
+
+def settle(user, sqn, dates):
+    ''' Rebalance a ledger from sqn now, or queue it for the worker '''
+    dates = [date for date in dates if date]
+    if not LEDGER_DEFERRED:
+        rebalance(user=user, sqn=sqn)
+        recalculate(user=user, date=min(dates))
+        refresh(user=user, dates=dates)
+        return
+
+    now = datetime.now()
+    LedgerJob.objects.bulk_create([
+        LedgerJob(
+            user_id=user,
+            job_entry_date=date,
+            job_date_created=now
+        )
+        for date in set(dates)
+    ])
+
+
+def pending(user):
+    ''' Whether the balances of a ledger wait for the worker '''
+    return LedgerJob.objects.filter(user=user).exists()
+
+
+def process(user):
+    ''' Run every queued job of a ledger as a single rebalance '''
+    with transaction.atomic():
+        # writes to the ledger wait, the jobs read are all covered
+        LedgerHead.objects.select_for_update().filter(user=user).first()
+        jobs = list(LedgerJob.objects.filter(
+            user=user
+        ).values_list('id', 'job_entry_date'))
+        if not jobs:
+            return 0
+
+        # queued writes took positions from a ledger not renumbered yet,
+        # so everything from the first date touched is ordered by date
+        dates = [date for _, date in jobs]
+        rebalance(user=user, date=min(dates))
+        recalculate(user=user, date=min(dates))
+        refresh(user=user, dates=dates)
+        LedgerJob.objects.filter(id__in=[job for job, _ in jobs]).delete()
+    return len(jobs)
+
+
+def process_all():
+    ''' Process the queued jobs of every ledger, oldest first '''
+    users = LedgerJob.objects.values(
+        'user'
+    ).annotate(
+        first=Min('id')
+    ).order_by(
+        'first'
+    ).values_list('user', flat=True)
+    return {user: process(user) for user in list(users)}
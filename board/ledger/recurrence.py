@@ -0,0 +1,134 @@
+import os
+from datetime import date, datetime, time, timedelta
+
+from board.ledger.balance import Positions
+from board.ledger.jobs import settle
+from board.ledger.sequence import lock
+from board.models import Recurrence, Release
+from board.search import reindex_created
+from dateutil.rrule import rrulestr
+from django.db import transaction
+from library.utils.helper import hash_gen
+from slugify import slugify
+
+RECURRENCE_CHUNK_SIZE = int(os.getenv('RECURRENCE_CHUNK_SIZE', 1000))
+RECURRENCE_HORIZON_DAYS = int(os.getenv('RECURRENCE_HORIZON_DAYS', 0))
+
+# repeat choices of the entry form
+FREQUENCIES = {
+    'weekly': 'FREQ=WEEKLY',
+    'monthly': 'FREQ=MONTHLY',
+    'yearly': 'FREQ=YEARLY',
+}
+
+
+def schedule(rule, start):
+    ''' Parsed rule, counted from the first day of the template '''
+    return rrulestr(rule, dtstart=datetime.combine(start, time()))
+
+
+def following(rule, start, day, inc=False):
+    ''' First occurrence after day, or none once the rule ended '''
+    after = schedule(rule, start).after(datetime.combine(day, time()), inc)
+    return after.date() if after else None
+
+
+def occurrences(recurrence, until):
+    ''' Due dates of a template up to until, and the one following them '''
+    rule = schedule(recurrence.rec_rule, recurrence.rec_start)
+    days = [
+        each.date() for each in rule.between(
+            datetime.combine(recurrence.rec_next, time()),
+            datetime.combine(until, time()),
+            inc=True
+        )
+    ]
+    after = rule.after(datetime.combine(until, time()))
+    return days, after.date() if after else None
+
+
+def generate(until=None, users=None, chunk_size=RECURRENCE_CHUNK_SIZE):
+    ''' Materialize due occurrences, one rebalance per user '''
+    until = until or date.today() + timedelta(days=RECURRENCE_HORIZON_DAYS)
+    due = Recurrence.objects.filter(
+        rec_status=True,
+        rec_next__lte=until
+    )
+    if users is not None:
+        due = due.filter(user__in=users)
+
+    users = due.order_by('user').values_list('user', flat=True).distinct()
+    return {user: _materialize(user, until, chunk_size) for user in users}
+
+
+def _materialize(user, until, chunk_size):
+    now = datetime.now()
+    created = 0
+    first_sqn = None
+    cycles = set()
+    batch = []
+
+    with transaction.atomic():
+        # locked so concurrent runs never materialize the same occurrence
+        lock(user)
+        templates = list(Recurrence.objects.select_for_update().filter(
+            user=user,
+            rec_status=True,
+            rec_next__lte=until
+        ).order_by('id'))
+        positions = Positions(user)
+
+        for template in templates:
+            days, template.rec_next = occurrences(template, until)
+            template.rec_date_updated = now
+            for day in days:
+                release = _release(template, day, positions.sqn(day), now)
+                batch.append(release)
+                if first_sqn is None or release.rel_sqn < first_sqn:
+                    first_sqn = release.rel_sqn
+                cycles.add(day.replace(day=1))
+
+                if len(batch) == chunk_size:
+                    created += _create(batch)
+                    batch = []
+
+        if batch:
+            created += _create(batch)
+        Recurrence.objects.bulk_update(
+            templates, ['rec_next', 'rec_date_updated']
+        )
+
+        if created:
+            settle(user=user, sqn=first_sqn, dates=cycles)
+    return created
+
+
+def _create(batch):
+    Release.objects.bulk_create(batch)
+    reindex_created('entry', batch)
+    return len(batch)
+
+
+def _release(template, day, sqn, now):
+    # one slug per template and day, a repeated occurrence is rejected
+    slug = slugify(f'recurrence-{template.id}-{day:%Y%m%d}')
+    return Release(
+        user_id=template.user_id,
+        rel_slug=slug,
+        rel_slug_hash=hash_gen(slug),
+        rel_gen_status=template.rec_gen_status,
+        rel_entry_date=day,
+        rel_amount=template.rec_amount,
+        rel_monthly_balance=0,
+        rel_overall_balance=0,
+        rel_description=template.rec_description,
+        subcategory_id=template.subcategory_id,
+        beneficiary_id=template.beneficiary_id,
+        client_id=template.client_id,
+        financial_cost_center_id=template.financial_cost_center_id,
+        financial_account_id=template.financial_account_id,
+        rel_sqn=sqn,
+        rel_status=True,
+        rel_date_created=now,
+        rel_date_updated=now
+    )
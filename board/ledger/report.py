@@ -0,0 +1,92 @@
+import os
+
+from board.models import Release
+from dateutil.relativedelta import relativedelta
+from django.db.models import Sum
+from django.db.models.functions import (TruncDay, TruncMonth, TruncQuarter,
+                                        TruncWeek, TruncYear)
+from library.utils.cache import versioned
+
+REPORT_MAX_POINTS = int(os.getenv('REPORT_MAX_POINTS', 4000))
+
+# granularity: (truncate function, period length)
+GRANULARITIES = {
+    'day': (TruncDay, relativedelta(days=1)),
+    'week': (TruncWeek, relativedelta(weeks=1)),
+    'month': (TruncMonth, relativedelta(months=1)),
+    'quarter': (TruncQuarter, relativedelta(months=3)),
+    'year': (TruncYear, relativedelta(years=1)),
+}
+
+
+def periods(start, end, granularity):
+    ''' Start dates of every period between start and end, both included '''
+    _, step = GRANULARITIES[granularity]
+    period = _truncate(start, granularity)
+    while period <= end:
+        yield period
+        try:
+            period += step
+        except (OverflowError, ValueError):
+            # the last period of the calendar has no following one
+            return
+
+
+def report(user, start, end, granularity):
+    ''' Revenue, expense and balance series, cached per ledger version '''
+    return versioned(
+        'ledger',
+        user,
+        lambda: _build(user, start, end, granularity),
+        variant=f'report:{start:%Y%m%d}:{end:%Y%m%d}:{granularity}'
+    )
+
+
+def _build(user, start, end, granularity):
+    trunc, _ = GRANULARITIES[granularity]
+
+    # every period of the range in a single grouped query
+    totals = Release.objects.filter(
+        user=user,
+        rel_status=True,
+        rel_entry_date__gte=start,
+        rel_entry_date__lte=end,
+    ).annotate(
+        period=trunc('rel_entry_date')
+    ).values(
+        'period',
+        'subcategory__category__cat_type'
+    ).annotate(
+        total=Sum('rel_amount')
+    ).order_by()
+
+    revenue, expenses = {}, {}
+    for each in totals:
+        period = each['period']
+        target = revenue if each['subcategory__category__cat_type'] == 1 \
+            else expenses
+        target[period] = target.get(period, 0) + each['total']
+
+    series = {'periods': [], 'revenue': [], 'expenses': [], 'balance': []}
+    for period in periods(start, end, granularity):
+        series['periods'].append(period)
+        series['revenue'].append(revenue.get(period, 0))
+        series['expenses'].append(expenses.get(period, 0))
+        series['balance'].append(
+            revenue.get(period, 0) - expenses.get(period, 0)
+        )
+    return series
+
+
+def _truncate(date, granularity):
+    match granularity:
+        case 'week':
+            return date - relativedelta(days=date.weekday())
+        case 'month':
+            return date.replace(day=1)
+        case 'quarter':
+            return date.replace(month=(date.month - 1) // 3 * 3 + 1, day=1)
+        case 'year':
+            return date.replace(month=1, day=1)
+    return date
+
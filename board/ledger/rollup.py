@@ -0,0 +1,152 @@
+from datetime import datetime
+from functools import reduce
+from operator import or_
+
+from board.models import (Beneficiary, Category, Client, Financial, Release,
+                          Rollup, SubCategory)
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+from library.utils.helper import month_range
+
+# dimension: (code, release field, label model, name field, slug hash field)
+DIMENSIONS = {
+    'category': (1, 'subcategory__category', Category, 'cat_name', 'cat_slug_hash'),  # noqa: E501
+    'subcategory': (2, 'subcategory', SubCategory, 'sub_name', 'sub_slug_hash'),  # noqa: E501
+    'beneficiary': (3, 'beneficiary', Beneficiary, 'ben_name', 'ben_slug_hash'),  # noqa: E501
+    'client': (4, 'client', Client, 'cli_name', 'cli_slug_hash'),
+    'cost_center': (5, 'financial_cost_center', Financial, 'fin_cost_center', 'fin_slug_hash'),  # noqa: E501
+}
+
+
+def refresh(user, dates):
+    ''' Rebuild the label rollups of the cycles the dates fall in '''
+    cycles = sorted({date.replace(day=1) for date in dates if date})
+    if not cycles:
+        return
+
+    ranges = [month_range(cycle.year, cycle.month) for cycle in cycles]
+    keys = [f'{field}_id' for _, field, *_ in DIMENSIONS.values()]
+
+    with transaction.atomic():
+        # every label combination of the cycles in a single grouped query,
+        # folded below into one total per label and type
+        totals = Release.objects.filter(
+            reduce(or_, (
+                Q(rel_entry_date__gte=start, rel_entry_date__lt=end)
+                for start, end in ranges
+            )),
+            user=user,
+            rel_status=True
+        ).annotate(
+            cycle=TruncMonth('rel_entry_date')
+        ).values(
+            'cycle',
+            'subcategory__category__cat_type',
+            *keys
+        ).annotate(
+            total=Sum('rel_amount'),
+            entries=Count('id')
+        ).order_by()
+
+        rollups = {}
+        for each in totals:
+            # entries left without a subcategory have no type to total by
+            if each['subcategory__category__cat_type'] is None:
+                continue
+            for (code, *_), key in zip(DIMENSIONS.values(), keys):
+                if each[key] is None:
+                    continue
+                index = (
+                    each['cycle'],
+                    code,
+                    each[key],
+                    each['subcategory__category__cat_type']
+                )
+                amount, entries = rollups.get(index, (0, 0))
+                rollups[index] = (
+                    amount + each['total'], entries + each['entries']
+                )
+
+        now = datetime.now()
+        Rollup.objects.filter(user=user, rol_cycle__in=cycles).delete()
+        Rollup.objects.bulk_create([
+            Rollup(
+                user_id=user,
+                rol_cycle=cycle,
+                rol_dimension=code,
+                rol_key=key,
+                rol_cat_type=cat_type,
+                rol_amount=amount,
+                rol_entries=entries,
+                rol_date_created=now,
+                rol_date_updated=now
+            )
+            for (cycle, code, key, cat_type), (amount, entries)
+            in rollups.items()
+        ])
+
+
+def append(user, date, cat_type, amount, keys):
+    ''' Add one entry to the rollups of its labels, keyed by release field '''
+    if cat_type is None:
+        return
+    cycle = date.replace(day=1)
+    now = datetime.now()
+
+    with transaction.atomic():
+        for code, field, *_ in DIMENSIONS.values():
+            if keys.get(field) is None:
+                continue
+            rollup = {
+                'user_id': user,
+                'rol_cycle': cycle,
+                'rol_dimension': code,
+                'rol_key': keys[field],
+                'rol_cat_type': cat_type
+            }
+            if not Rollup.objects.filter(**rollup).update(
+                rol_amount=F('rol_amount') + amount,
+                rol_entries=F('rol_entries') + 1,
+                rol_date_updated=now
+            ):
+                Rollup.objects.create(
+                    **rollup,
+                    rol_amount=amount,
+                    rol_entries=1
+                )
+
+
+def breakdown(user, cycle, dimension):
+    ''' Totals of a cycle per label of the dimension, largest first '''
+    code, _, model, name, slug = DIMENSIONS[dimension]
+    rollups = list(Rollup.objects.filter(
+        user=user,
+        rol_cycle=cycle,
+        rol_dimension=code
+    ).order_by(
+        '-rol_amount'
+    ).values(
+        'rol_key',
+        'rol_cat_type',
+        'rol_amount',
+        'rol_entries'
+    ))
+
+    labels = {
+        each['id']: each
+        for each in model.objects.filter(
+            id__in={rollup['rol_key'] for rollup in rollups}
+        ).values('id', name, slug)
+    }
+
+    return [
+        {
+            'name': labels[rollup['rol_key']][name],
+            'slug': labels[rollup['rol_key']][slug],
+            'type': rollup['rol_cat_type'],
+            'amount': rollup['rol_amount'],
+            'entries': rollup['rol_entries']
+        }
+        for rollup in rollups if rollup['rol_key'] in labels
+    ]
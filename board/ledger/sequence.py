@@ -0,0 +1,100 @@
+from board.ledger import analytic, balance, rollup
+from board.ledger.jobs import pending, settle
+from board.models import LedgerHead, Release, SubCategory
+from django.db import transaction
+from django.db.models import Max
+
+
+def lock(user):
+    ''' Ledger head of a user, locked until the transaction ends '''
+    # creating the head is raced safely through its unique user
+    if not LedgerHead.objects.filter(user_id=user).exists():
+        LedgerHead.objects.get_or_create(user_id=user, defaults=_tail(user))
+    return LedgerHead.objects.select_for_update().get(user_id=user)
+
+
+def allocate(user, entry_date, exclude=None):
+    ''' Sequence number of an entry of the date, with the ledger locked '''
+    head = lock(user)
+
+    # appending after the tail is answered by the head alone
+    if not exclude and (head.led_date is None or entry_date >= head.led_date):
+        return head.led_sqn + 1
+
+    last = Release.objects.filter(
+        user=user,
+        rel_entry_date__lte=entry_date,
+        rel_status=True,
+    )
+    if exclude:
+        last = last.exclude(id=exclude)
+    last = last.aggregate(last=Max('rel_sqn'))['last']
+    return (last or 0) + 1
+
+
+def insert(release):
+    ''' Save a new entry, in constant time when it goes after the tail '''
+    user = release.user_id
+    with transaction.atomic():
+        head = lock(user)
+        # backdated entries renumber and rebalance every later one, and
+        # a head waiting for queued jobs holds no balance to start from
+        if head.led_date is not None and release.rel_entry_date < head.led_date or pending(user):  # noqa: E501
+            release.rel_sqn = allocate(user, release.rel_entry_date)
+            release.save()
+            settle(
+                user=user, sqn=release.rel_sqn, dates=[release.rel_entry_date]
+            )
+            return release
+
+        release.rel_sqn = head.led_sqn + 1
+        release.save()
+
+        labels = SubCategory.objects.filter(
+            id=release.subcategory_id
+        ).values('category_id', 'category__cat_type').first() or {}
+        cat_type = labels.get('category__cat_type')
+        overall = balance.append(release, head, cat_type)
+        analytic.append(
+            user=user,
+            date=release.rel_entry_date,
+            cat_type=cat_type,
+            amount=release.rel_amount,
+            overall=overall
+        )
+        rollup.append(
+            user=user,
+            date=release.rel_entry_date,
+            cat_type=cat_type,
+            amount=release.rel_amount,
+            keys={
+                'subcategory__category': labels.get('category_id'),
+                'subcategory': release.subcategory_id,
+                'beneficiary': release.beneficiary_id,
+                'client': release.client_id,
+                'financial_cost_center': release.financial_cost_center_id
+            }
+        )
+    return release
+
+
+def _tail(user):
+    tail = Release.objects.filter(
+        user=user,
+        rel_status=True
+    ).order_by(
+        '-rel_sqn'
+    ).values(
+        'rel_sqn',
+        'rel_entry_date',
+        'rel_monthly_balance',
+        'rel_overall_balance'
+    ).first()
+    if not tail:
+        return {}
+    return {
+        'led_sqn': tail['rel_sqn'],
+        'led_date': tail['rel_entry_date'],
+        'led_monthly_balance': tail['rel_monthly_balance'],
+        'led_overall_balance': tail['rel_overall_balance']
+    }
@@ -0,0 +1,92 @@
+import random
+import statistics
+import time
+from datetime import date, datetime
+
+from board.models import Release
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from home.models import User
+from library.utils.helper import hash_gen
+
+
+class Command(BaseCommand):
+    help = 'Compare MD5(rel_slug) scans with indexed rel_slug_hash lookups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--lookups', type=int, default=50)
+        parser.add_argument('--batch', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        # everything runs inside a transaction that is rolled back at the end
+        with transaction.atomic():
+            user = User.objects.create(
+                use_login='benchmark@invo.finance',
+                use_password=hash_gen('benchmark'),
+                use_status=True
+            )
+            self._populate(user, options['rows'], options['batch'])
+
+            sample = [
+                hash_gen(f'benchmark-{index}') for index in random.sample(
+                    range(options['rows']),
+                    min(options['lookups'], options['rows'])
+                )
+            ]
+
+            md5_times = self._measure(lambda value: list(
+                Release.objects.filter(
+                    rel_status=True
+                ).extra(
+                    where=['MD5(rel_slug)=%s'],
+                    params=[value]
+                ).values('id')
+            ), sample)
+            hash_times = self._measure(lambda value: list(
+                Release.objects.filter(
+                    rel_status=True,
+                    rel_slug_hash=value
+                ).values('id')
+            ), sample)
+
+            self.stdout.write(f'rows: {options["rows"]}, lookups: {len(sample)}')  # noqa: E501
+            self._report('MD5(rel_slug)', md5_times)
+            self._report('rel_slug_hash', hash_times)
+
+            transaction.set_rollback(True)
+
+    def _populate(self, user, rows, batch):
+        now = datetime.now()
+        for start in range(0, rows, batch):
+            Release.objects.bulk_create([
+                Release(
+                    user=user,
+                    rel_slug=f'benchmark-{index}',
+                    rel_slug_hash=hash_gen(f'benchmark-{index}'),
+                    rel_gen_status=4,
+                    rel_entry_date=date(2012, 1, 1),
+                    rel_amount=1,
+                    rel_monthly_balance=0,
+                    rel_overall_balance=0,
+                    rel_sqn=index + 1,
+                    rel_status=True,
+                    rel_date_created=now,
+                    rel_date_updated=now
+                ) for index in range(start, min(start + batch, rows))
+            ])
+
+    def _measure(self, lookup, sample):
+        times = []
+        for value in sample:
+            start = time.perf_counter()
+            lookup(value)
+            times.append((time.perf_counter() - start) * 1000)
+        return times
+
+    def _report(self, label, times):
+        self.stdout.write(
+            f'{label:<16} avg {statistics.mean(times):9.3f} ms  '
+            f'median {statistics.median(times):9.3f} ms  '
+            f'max {max(times):9.3f} ms'
+        )
@@ -0,0 +1,76 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from board.ledger.integrity import INTEGRITY_CHUNK_SIZE, check
+from board.models import Release
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from home.models import User
+
+
+def _check(user, repair, chunk_size):
+    # each worker process opens its own database connection
+    try:
+        return check(user, repair=repair, chunk_size=chunk_size)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Verify running balances and monthly summaries of the ledgers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--login', help='only the ledger of this user')
+        parser.add_argument(
+            '--repair', action='store_true',
+            help='rebalance the ledgers found diverging'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='ledgers checked in parallel processes'
+        )
+        parser.add_argument(
+            '--chunk', type=int, default=INTEGRITY_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        users = Release.objects.order_by('user').values_list(
+            'user', flat=True
+        ).distinct()
+        if options['login']:
+            user = User.objects.filter(
+                use_login=options['login'],
+                use_status=True
+            ).values('id').first()
+            if not user:
+                raise CommandError(f'User "{options["login"]}" not found.')
+            users = users.filter(user=user['id'])
+        users = list(users)
+        arguments = ([options['repair']] * len(users),
+                     [options['chunk']] * len(users))
+
+        if options['workers'] > 1:
+            # forked workers must not share the parent connections
+            connections.close_all()
+            with ProcessPoolExecutor(options['workers']) as pool:
+                reports = list(pool.map(_check, users, *arguments))
+        else:
+            reports = list(map(check, users, *arguments))
+
+        diverged = 0
+        for report in reports:
+            if report['pending']:
+                self.stdout.write(
+                    f'user {report["user"]}: skipped, rebalance queued.'
+                )
+            elif report['diverged']:
+                diverged += 1
+                self.stdout.write(
+                    f'user {report["user"]}: {report["balances"]} of '
+                    f'{report["entries"]} entries, {report["summaries"]} '
+                    f'monthly summaries, head '
+                    f'{"diverged" if report["head"] else "ok"}'
+                    f'{", repaired" if report["repaired"] else ""}.'
+                )
+        self.stdout.write(
+            f'{len(reports)} ledgers checked, {diverged} diverged.'
+        )
@@ -0,0 +1,62 @@
+import sys
+from datetime import datetime
+
+from board.ledger.export import HEADER, ledger_rows
+from django.core.management.base import BaseCommand, CommandError
+from home.models import User
+from library.utils.export import csv_stream, xlsx_stream
+from library.utils.helper import month_range
+
+
+class Command(BaseCommand):
+    help = 'Export the ledger of a user as CSV or XLSX'
+
+    def add_arguments(self, parser):
+        parser.add_argument('login')
+        parser.add_argument('path', help="output file, '-' for stdout")
+        parser.add_argument('--format', choices=['csv', 'xlsx'])
+        parser.add_argument('--from', dest='start', help='first month, YYYY-MM')  # noqa: E501
+        parser.add_argument('--to', dest='end', help='last month, YYYY-MM')
+        parser.add_argument('--category', help='category name')
+        parser.add_argument('--client', help='client name')
+        parser.add_argument('--account', help='bank name or account number')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(
+            use_login=options['login'],
+            use_status=True
+        ).values('id').first()
+        if not user:
+            raise CommandError(f'User "{options["login"]}" not found.')
+
+        filters = {}
+        try:
+            if options['start']:
+                start = datetime.strptime(options['start'], '%Y-%m')
+                filters['rel_entry_date__gte'] = month_range(start.year, start.month)[0]  # noqa: E501
+            if options['end']:
+                end = datetime.strptime(options['end'], '%Y-%m')
+                filters['rel_entry_date__lt'] = month_range(end.year, end.month)[1]  # noqa: E501
+        except ValueError as err:
+            raise CommandError(err)
+        if options['category']:
+            filters['subcategory__category__cat_name__iexact'] = options['category']  # noqa: E501
+        if options['client']:
+            filters['client__cli_name__iexact'] = options['client']
+        if options['account']:
+            filters['financial_account__fin_bank_name__iexact'] = options['account']  # noqa: E501
+
+        output = options['format'] or (
+            'xlsx' if options['path'].endswith('.xlsx') else 'csv'
+        )
+        rows = ledger_rows(user=user['id'], **filters)
+        stream = csv_stream(HEADER, rows) if output == 'csv' \
+            else xlsx_stream(HEADER, rows, sheet='Ledger')
+
+        if options['path'] == '-':
+            for chunk in stream:
+                sys.stdout.buffer.write(chunk)
+            return
+        with open(options['path'], 'wb') as file:
+            for chunk in stream:
+                file.write(chunk)
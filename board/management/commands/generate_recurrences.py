@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from board.ledger.recurrence import RECURRENCE_CHUNK_SIZE, generate
+from django.core.management.base import BaseCommand, CommandError
+from home.models import User
+
+
+class Command(BaseCommand):
+    help = 'Add the due occurrences of recurring entries as releases'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--login', help='only templates of this user')
+        parser.add_argument(
+            '--until', help='last date to materialize, as YYYY-MM-DD'
+        )
+        parser.add_argument(
+            '--chunk', type=int, default=RECURRENCE_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        until = None
+        if options['until']:
+            try:
+                until = datetime.strptime(
+                    options['until'], '%Y-%m-%d'
+                ).date()
+            except ValueError:
+                raise CommandError(f'Invalid date "{options["until"]}".')
+
+        users = None
+        if options['login']:
+            users = list(User.objects.filter(
+                use_login=options['login'],
+                use_status=True
+            ).values_list('id', flat=True))
+            if not users:
+                raise CommandError(f'User "{options["login"]}" not found.')
+
+        created = generate(
+            until=until, users=users, chunk_size=options['chunk']
+        )
+        self.stdout.write(
+            f'{sum(created.values())} entries added for '
+            f'{len(created)} users.'
+        )
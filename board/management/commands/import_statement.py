@@ -0,0 +1,42 @@
+from board.ledger.importer import IMPORT_CHUNK_SIZE, Importer, parser_for
+from django.core.management.base import BaseCommand, CommandError
+from home.models import User
+
+
+class Command(BaseCommand):
+    help = 'Import a CSV or OFX bank statement as releases of a user'
+
+    def add_arguments(self, parser):
+        parser.add_argument('login')
+        parser.add_argument('path')
+        parser.add_argument('--income', help='subcategory of credits')
+        parser.add_argument('--expense', help='subcategory of debits')
+        parser.add_argument('--account', help='bank name or account number')
+        parser.add_argument('--chunk', type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(
+            use_login=options['login'],
+            use_status=True
+        ).values('id', 'use_login').first()
+        if not user:
+            raise CommandError(f'User "{options["login"]}" not found.')
+
+        importer = Importer(
+            user=user['id'],
+            login=user['use_login'],
+            income=options['income'],
+            expense=options['expense'],
+            account=options['account'],
+            chunk_size=options['chunk']
+        )
+        with open(options['path'], newline='', encoding='utf-8-sig',
+                  errors='replace') as file:
+            result = importer.run(parser_for(options['path'])(file))
+
+        for line, error in result['rejected']:
+            self.stderr.write(f'line {line}: {error}')
+        self.stdout.write(
+            f'{result["created"]} entries imported, '
+            f'{len(result["rejected"])} rejected.'
+        )
@@ -0,0 +1,31 @@
+import os
+import time
+
+from board.ledger.jobs import process_all
+from django.core.management.base import BaseCommand
+
+LEDGER_WORKER_SLEEP = float(os.getenv('LEDGER_WORKER_SLEEP', 2))
+
+
+class Command(BaseCommand):
+    help = 'Run the queued ledger rebalances, one pass per user'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='process the queue once and exit'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=LEDGER_WORKER_SLEEP,
+            help='seconds to wait while the queue is empty'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_all()
+            for user, jobs in processed.items():
+                self.stdout.write(f'user {user}: {jobs} jobs coalesced.')
+            if options['once']:
+                break
+            if not processed:
+                time.sleep(options['sleep'])
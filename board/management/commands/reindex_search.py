@@ -0,0 +1,20 @@
+from board.search import KINDS, reindex_all
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index of labels and ledger descriptions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'kinds', nargs='*', help=f'any of {", ".join(KINDS)}, all if empty'
+        )
+
+    def handle(self, *args, **options):
+        for kind in options['kinds']:
+            if kind not in KINDS:
+                raise CommandError(f'Unknown kind "{kind}".')
+
+        for kind in options['kinds'] or KINDS:
+            reindex_all(kind)
+            self.stdout.write(f'{kind} reindexed.')
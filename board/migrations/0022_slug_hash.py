@@ -0,0 +1,55 @@
+# Generated by Django 4.0.3 on 2026-10-18 08:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0021_release_analytic'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='beneficiary',
+            name='ben_slug_hash',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='beneficiarycategory',
+            name='cat_slug_hash',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='cat_slug_hash',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='cli_slug_hash',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='financial',
+            name='fin_slug_hash',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='release',
+            name='rel_slug_hash',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='subcategory',
+            name='sub_slug_hash',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=32),
+            preserve_default=False,
+        ),
+    ]
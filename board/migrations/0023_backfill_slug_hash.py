@@ -0,0 +1,47 @@
+import hashlib
+
+from django.db import migrations
+
+CHUNK_SIZE = 2000
+
+SLUG_FIELDS = [
+    ('beneficiarycategory', 'cat_slug'),
+    ('beneficiary', 'ben_slug'),
+    ('category', 'cat_slug'),
+    ('subcategory', 'sub_slug'),
+    ('client', 'cli_slug'),
+    ('financial', 'fin_slug'),
+    ('release', 'rel_slug'),
+]
+
+
+def backfill_slug_hash(apps, schema_editor):
+    for model_name, slug_field in SLUG_FIELDS:
+        model = apps.get_model('board', model_name)
+        hash_field = f'{slug_field}_hash'
+
+        rows = []
+        for row in model.objects.only('id', slug_field).iterator(
+            chunk_size=CHUNK_SIZE
+        ):
+            slug = getattr(row, slug_field)
+            setattr(row, hash_field, hashlib.md5(slug.encode()).hexdigest())
+            rows.append(row)
+
+            if len(rows) == CHUNK_SIZE:
+                model.objects.bulk_update(rows, [hash_field])
+                rows = []
+
+        if rows:
+            model.objects.bulk_update(rows, [hash_field])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0022_slug_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_slug_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.3 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0023_backfill_slug_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='release',
+            index=models.Index(fields=['user', 'rel_status', 'rel_entry_date', 'rel_sqn'], name='release_user_month_idx'),
+        ),
+    ]
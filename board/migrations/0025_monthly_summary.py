@@ -0,0 +1,38 @@
+# Generated by Django 4.0.3 on 2026-10-18 08:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0015_iplocation'),
+        ('board', '0024_release_user_month_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mon_cycle', models.DateField()),
+                ('mon_cat_type', models.SmallIntegerField()),
+                ('mon_amount', models.DecimalField(decimal_places=3, max_digits=15)),
+                ('mon_entries', models.IntegerField(default=0)),
+                ('mon_overall_balance', models.DecimalField(decimal_places=3, max_digits=15)),
+                ('mon_status', models.BooleanField(default=False)),
+                ('mon_date_created', models.DateTimeField(editable=False)),
+                ('mon_date_updated', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='home.user')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='monthlysummary',
+            index=models.Index(fields=['user', 'mon_cat_type', 'mon_cycle'], name='monthly_summary_user_type_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlysummary',
+            constraint=models.UniqueConstraint(fields=('user', 'mon_cycle', 'mon_cat_type'), name='monthly_summary_user_cycle_type'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+CHUNK_SIZE = 2000
+CAT_TYPES = (1, 2)
+
+
+def backfill_monthly_summary(apps, schema_editor):
+    release = apps.get_model('board', 'release')
+    summary = apps.get_model('board', 'monthlysummary')
+
+    totals = release.objects.filter(
+        rel_status=True
+    ).annotate(
+        cycle=TruncMonth('rel_entry_date')
+    ).values(
+        'user_id',
+        'cycle',
+        'subcategory__category__cat_type'
+    ).annotate(
+        total=Sum('rel_amount'),
+        entries=Count('id')
+    ).order_by('user_id', 'cycle')
+
+    now = datetime.now()
+    rows, overall = [], 0
+
+    def close(user, cycle, values):
+        # same rows as analytic.recalculate: both types of every cycle with
+        # entries, entries of no category only move the overall balance
+        nonlocal overall
+        for cat_type, (total, _) in values.items():
+            overall += total if cat_type == 1 else -total
+        for cat_type in CAT_TYPES:
+            total, entries = values.get(cat_type, (0, 0))
+            rows.append(summary(
+                user_id=user,
+                mon_cycle=cycle,
+                mon_cat_type=cat_type,
+                mon_amount=total,
+                mon_entries=entries,
+                mon_overall_balance=overall,
+                mon_status=bool(entries),
+                mon_date_created=now,
+                mon_date_updated=now
+            ))
+
+    current, values = None, {}
+    for each in totals.iterator(chunk_size=CHUNK_SIZE):
+        key = (each['user_id'], each['cycle'])
+        if key != current:
+            if current is not None:
+                close(*current, values)
+            if current is None or current[0] != key[0]:
+                overall = 0
+            current, values = key, {}
+        values[each['subcategory__category__cat_type']] = (
+            each['total'], each['entries']
+        )
+
+        if len(rows) >= CHUNK_SIZE:
+            summary.objects.bulk_create(rows)
+            rows = []
+
+    if current is not None:
+        close(*current, values)
+    if rows:
+        summary.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0025_monthly_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_monthly_summary, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.0.3 on 2026-10-18 08:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0015_iplocation'),
+        ('board', '0026_backfill_monthly_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Rollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rol_cycle', models.DateField()),
+                ('rol_dimension', models.SmallIntegerField()),
+                ('rol_key', models.IntegerField()),
+                ('rol_cat_type', models.SmallIntegerField()),
+                ('rol_amount', models.DecimalField(decimal_places=3, max_digits=15)),
+                ('rol_entries', models.IntegerField(default=0)),
+                ('rol_date_created', models.DateTimeField(editable=False)),
+                ('rol_date_updated', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='home.user')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='rollup',
+            constraint=models.UniqueConstraint(fields=('user', 'rol_cycle', 'rol_dimension', 'rol_key', 'rol_cat_type'), name='rollup_user_cycle_dimension_key'),
+        ),
+    ]
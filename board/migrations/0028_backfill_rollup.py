@@ -0,0 +1,82 @@
+from datetime import datetime
+
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+CHUNK_SIZE = 2000
+
+DIMENSIONS = [
+    (1, 'subcategory__category_id'),
+    (2, 'subcategory_id'),
+    (3, 'beneficiary_id'),
+    (4, 'client_id'),
+    (5, 'financial_cost_center_id'),
+]
+
+
+def backfill_rollup(apps, schema_editor):
+    release = apps.get_model('board', 'release')
+    rollup = apps.get_model('board', 'rollup')
+
+    totals = release.objects.filter(
+        rel_status=True
+    ).annotate(
+        cycle=TruncMonth('rel_entry_date')
+    ).values(
+        'user_id',
+        'cycle',
+        'subcategory__category__cat_type',
+        *[key for _, key in DIMENSIONS]
+    ).annotate(
+        total=Sum('rel_amount'),
+        entries=Count('id')
+    ).order_by()
+
+    rollups = {}
+    for each in totals.iterator(chunk_size=CHUNK_SIZE):
+        # entries left without a subcategory have no type to total by
+        if each['subcategory__category__cat_type'] is None:
+            continue
+        for code, key in DIMENSIONS:
+            if each[key] is None:
+                continue
+            index = (
+                each['user_id'],
+                each['cycle'],
+                code,
+                each[key],
+                each['subcategory__category__cat_type']
+            )
+            amount, entries = rollups.get(index, (0, 0))
+            rollups[index] = (
+                amount + each['total'], entries + each['entries']
+            )
+
+    now = datetime.now()
+    rollup.objects.bulk_create([
+        rollup(
+            user_id=user,
+            rol_cycle=cycle,
+            rol_dimension=code,
+            rol_key=key,
+            rol_cat_type=cat_type,
+            rol_amount=amount,
+            rol_entries=entries,
+            rol_date_created=now,
+            rol_date_updated=now
+        )
+        for (user, cycle, code, key, cat_type), (amount, entries)
+        in rollups.items()
+    ], batch_size=CHUNK_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0027_rollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.0.3 on 2026-10-18 08:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0015_iplocation'),
+        ('board', '0028_backfill_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sea_kind', models.SmallIntegerField()),
+                ('sea_object', models.IntegerField()),
+                ('sea_token', models.CharField(max_length=3)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='home.user')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='searchtoken',
+            index=models.Index(fields=['user', 'sea_token', 'sea_kind'], name='search_token_user_token_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchtoken',
+            index=models.Index(fields=['sea_kind', 'sea_object'], name='search_token_object_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.0.3 on 2026-10-18 08:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0015_iplocation'),
+        ('board', '0029_search_token'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Recurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rec_slug', models.SlugField(max_length=250, unique=True)),
+                ('rec_slug_hash', models.CharField(db_index=True, editable=False, max_length=32)),
+                ('rec_rule', models.CharField(max_length=250)),
+                ('rec_start', models.DateField()),
+                ('rec_next', models.DateField(blank=True, default=None, null=True)),
+                ('rec_gen_status', models.SmallIntegerField()),
+                ('rec_amount', models.DecimalField(decimal_places=3, max_digits=15)),
+                ('rec_description', models.CharField(blank=True, default=None, max_length=250, null=True)),
+                ('rec_status', models.BooleanField(default=False)),
+                ('rec_date_created', models.DateTimeField(editable=False)),
+                ('rec_date_updated', models.DateTimeField()),
+                ('rec_date_deleted', models.DateTimeField(blank=True, default=None, null=True)),
+                ('beneficiary', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, to='board.beneficiary')),
+                ('client', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, to='board.client')),
+                ('financial_account', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recurrence_account', to='board.financial')),
+                ('financial_cost_center', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recurrence_cost_center', to='board.financial')),
+                ('subcategory', models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, to='board.subcategory')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='home.user')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='recurrence',
+            index=models.Index(fields=['rec_status', 'rec_next', 'user'], name='recurrence_due_idx'),
+        ),
+    ]
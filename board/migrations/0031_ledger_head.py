@@ -0,0 +1,25 @@
+# Generated by Django 4.0.3 on 2026-10-18 08:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0015_iplocation'),
+        ('board', '0030_recurrence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerHead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('led_sqn', models.IntegerField(default=0)),
+                ('led_date_created', models.DateTimeField(editable=False)),
+                ('led_date_updated', models.DateTimeField()),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='home.user')),
+            ],
+        ),
+    ]
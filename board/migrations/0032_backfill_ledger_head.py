@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from django.db import migrations
+from django.db.models import Max
+
+CHUNK_SIZE = 2000
+
+
+def backfill_ledger_head(apps, schema_editor):
+    release = apps.get_model('board', 'release')
+    ledger_head = apps.get_model('board', 'ledgerhead')
+
+    heads = release.objects.filter(
+        rel_status=True
+    ).values(
+        'user_id'
+    ).annotate(
+        last_sqn=Max('rel_sqn')
+    ).order_by()
+
+    now = datetime.now()
+    ledger_head.objects.bulk_create([
+        ledger_head(
+            user_id=each['user_id'],
+            led_sqn=each['last_sqn'],
+            led_date_created=now,
+            led_date_updated=now
+        )
+        for each in heads
+    ], batch_size=CHUNK_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0031_ledger_head'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ledger_head, migrations.RunPython.noop),
+    ]
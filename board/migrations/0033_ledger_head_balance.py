@@ -0,0 +1,33 @@
+# Generated by Django 4.0.3 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0032_backfill_ledger_head'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ledgerhead',
+            name='led_date',
+            field=models.DateField(blank=True, default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name='ledgerhead',
+            name='led_monthly_balance',
+            field=models.DecimalField(decimal_places=3, default=0, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name='ledgerhead',
+            name='led_overall_balance',
+            field=models.DecimalField(decimal_places=3, default=0, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name='ledgerhead',
+            name='led_version',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+CHUNK_SIZE = 2000
+
+FIELDS = ['led_sqn', 'led_date', 'led_monthly_balance', 'led_overall_balance']
+
+
+def backfill_ledger_head_balance(apps, schema_editor):
+    release = apps.get_model('board', 'release')
+    ledger_head = apps.get_model('board', 'ledgerhead')
+
+    heads = []
+    for head in ledger_head.objects.iterator(chunk_size=CHUNK_SIZE):
+        tail = release.objects.filter(
+            user_id=head.user_id,
+            rel_status=True
+        ).order_by(
+            '-rel_sqn'
+        ).values(
+            'rel_sqn',
+            'rel_entry_date',
+            'rel_monthly_balance',
+            'rel_overall_balance'
+        ).first()
+        if tail:
+            head.led_sqn = tail['rel_sqn']
+            head.led_date = tail['rel_entry_date']
+            head.led_monthly_balance = tail['rel_monthly_balance']
+            head.led_overall_balance = tail['rel_overall_balance']
+            heads.append(head)
+
+    ledger_head.objects.bulk_update(heads, FIELDS, batch_size=CHUNK_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0033_ledger_head_balance'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_ledger_head_balance, migrations.RunPython.noop
+        ),
+    ]
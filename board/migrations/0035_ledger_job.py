@@ -0,0 +1,29 @@
+# Generated by Django 4.0.3 on 2026-10-18 08:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0015_iplocation'),
+        ('board', '0034_backfill_ledger_head_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_sqn', models.IntegerField()),
+                ('job_entry_date', models.DateField()),
+                ('job_date_created', models.DateTimeField(editable=False)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='home.user')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='ledgerjob',
+            index=models.Index(fields=['user', 'id'], name='ledger_job_user_idx'),
+        ),
+    ]
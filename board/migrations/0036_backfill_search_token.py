@@ -0,0 +1,73 @@
+from django.db import migrations
+from slugify import slugify
+
+CHUNK_SIZE = 2000
+
+# model: (kind code, owner field, status field, indexed fields)
+KINDS = {
+    'beneficiary': (1, 'user_id', 'ben_status', ['ben_name']),
+    'category': (2, 'user_id', 'cat_status', ['cat_name']),
+    'subcategory': (3, 'category__user_id', 'sub_status', ['sub_name']),
+    'client': (4, 'user_id', 'cli_status', ['cli_name']),
+    'financial': (5, 'user_id', 'fin_status', [
+        'fin_cost_center',
+        'fin_description',
+        'fin_bank_name',
+        'fin_bank_account'
+    ]),
+    'release': (6, 'user_id', 'rel_status', ['rel_description']),
+}
+
+
+def tokens(text):
+    # same trigrams and short suffixes as board.search.tokens
+    text = slugify(text or '', separator=' ')
+    grams = {text[i:i + 3] for i in range(len(text) - 2)}
+    grams.update({text[-2:], text[-1:]} if text else set())
+    return grams
+
+
+def backfill_search_token(apps, schema_editor):
+    search_token = apps.get_model('board', 'searchtoken')
+
+    for model_name, (code, owner, status, fields) in KINDS.items():
+        model = apps.get_model('board', model_name)
+        rows = model.objects.filter(
+            **{status: True}
+        ).values('id', owner, *fields)
+
+        batch = []
+        for row in rows.iterator(chunk_size=CHUNK_SIZE):
+            if not row[owner]:
+                continue
+            batch.extend(
+                search_token(
+                    user_id=row[owner],
+                    sea_kind=code,
+                    sea_object=row['id'],
+                    sea_token=token
+                )
+                for token in tokens(' '.join(filter(None, (
+                    row[field] for field in fields
+                ))))
+            )
+
+            if len(batch) >= CHUNK_SIZE:
+                search_token.objects.bulk_create(batch)
+                batch = []
+
+        if batch:
+            search_token.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0035_ledger_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_search_token, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.3 on 2026-10-18 09:24
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0036_backfill_search_token'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='ledgerjob',
+            name='job_sqn',
+        ),
+    ]
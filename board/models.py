@@ -2,6 +2,7 @@ from datetime import datetime
 
 from django.db import models
 from home.models import User
+from library.utils.helper import hash_gen
 
 
 class BeneficiaryCategory(models.Model):
@@ -11,6 +12,9 @@ class BeneficiaryCategory(models.Model):
     )
     cat_description = models.CharField(max_length=250)
     cat_slug = models.SlugField(unique=True, max_length=250)
+    cat_slug_hash = models.CharField(
+        max_length=32, db_index=True, editable=False
+    )
     cat_status = models.BooleanField(default=False)
     cat_date_created = models.DateTimeField(editable=False)
     cat_date_updated = models.DateTimeField()
@@ -26,6 +30,7 @@ class BeneficiaryCategory(models.Model):
         if not self.id:
             self.cat_date_created = datetime.now()
         self.cat_date_updated = datetime.now()
+        self.cat_slug_hash = hash_gen(str(self.cat_slug))
         return super().save(*args, **kwargs)
 
 
@@ -36,6 +41,9 @@ class Beneficiary(models.Model):
     )
     ben_name = models.CharField(max_length=250)
     ben_slug = models.SlugField(unique=True, max_length=250)
+    ben_slug_hash = models.CharField(
+        max_length=32, db_index=True, editable=False
+    )
     ben_status = models.BooleanField(default=False)
     ben_date_created = models.DateTimeField(editable=False)
     ben_date_updated = models.DateTimeField()
@@ -51,6 +59,7 @@ class Beneficiary(models.Model):
         if not self.id:
             self.ben_date_created = datetime.now()
         self.ben_date_updated = datetime.now()
+        self.ben_slug_hash = hash_gen(str(self.ben_slug))
         return super().save(*args, **kwargs)
 
 
@@ -58,6 +67,9 @@ class Category(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     cat_name = models.CharField(max_length=250)
     cat_slug = models.SlugField(unique=True, max_length=250)
+    cat_slug_hash = models.CharField(
+        max_length=32, db_index=True, editable=False
+    )
     cat_type = models.SmallIntegerField()
     cat_status = models.BooleanField(default=False)
     cat_date_created = models.DateTimeField(editable=False)
@@ -74,6 +86,7 @@ class Category(models.Model):
         if not self.id:
             self.cat_date_created = datetime.now()
         self.cat_date_updated = datetime.now()
+        self.cat_slug_hash = hash_gen(str(self.cat_slug))
         return super().save(*args, **kwargs)
 
 
@@ -81,6 +94,9 @@ class SubCategory(models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     sub_name = models.CharField(max_length=250)
     sub_slug = models.SlugField(unique=True, max_length=250)
+    sub_slug_hash = models.CharField(
+        max_length=32, db_index=True, editable=False
+    )
     sub_status = models.BooleanField(default=False)
     sub_date_created = models.DateTimeField(editable=False)
     sub_date_updated = models.DateTimeField()
@@ -96,6 +112,7 @@ class SubCategory(models.Model):
         if not self.id:
             self.sub_date_created = datetime.now()
         self.sub_date_updated = datetime.now()
+        self.sub_slug_hash = hash_gen(str(self.sub_slug))
         return super().save(*args, **kwargs)
 
 
@@ -149,6 +166,9 @@ class Client(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     cli_name = models.CharField(max_length=250)
     cli_slug = models.SlugField(unique=True, max_length=250)
+    cli_slug_hash = models.CharField(
+        max_length=32, db_index=True, editable=False
+    )
     country = models.ForeignKey(
         Country, on_delete=models.SET_NULL, null=True,
         blank=True, default=None
@@ -182,12 +202,16 @@ class Client(models.Model):
         if not self.id:
             self.cli_date_created = datetime.now()
         self.cli_date_updated = datetime.now()
+        self.cli_slug_hash = hash_gen(str(self.cli_slug))
         return super().save(*args, **kwargs)
 
 
 class Financial(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     fin_slug = models.SlugField(unique=True, max_length=250)
+    fin_slug_hash = models.CharField(
+        max_length=32, db_index=True, editable=False
+    )
     fin_cost_center = models.CharField(
         max_length=250, null=True, blank=True, default=None
     )
@@ -219,12 +243,16 @@ class Financial(models.Model):
         if not self.id:
             self.fin_date_created = datetime.now()
         self.fin_date_updated = datetime.now()
+        self.fin_slug_hash = hash_gen(str(self.fin_slug))
         return super().save(*args, **kwargs)
 
 
 class Release(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     rel_slug = models.SlugField(unique=True, max_length=250)
+    rel_slug_hash = models.CharField(
+        max_length=32, db_index=True, editable=False
+    )
     rel_gen_status = models.SmallIntegerField()
     rel_entry_date = models.DateField()
     rel_amount = models.DecimalField(max_digits=15, decimal_places=3)
@@ -261,6 +289,14 @@ class Release(models.Model):
         null=True, default=None, blank=True
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'rel_status', 'rel_entry_date', 'rel_sqn'],
+                name='release_user_month_idx'
+            ),
+        ]
+
     def __str__(self) -> str:
         return str(self.user)
 
@@ -269,6 +305,7 @@ class Release(models.Model):
         if not self.id:
             self.rel_date_created = datetime.now()
         self.rel_date_updated = datetime.now()
+        self.rel_slug_hash = hash_gen(str(self.rel_slug))
         return super().save(*args, **kwargs)
 
 
@@ -292,3 +329,206 @@ class Analytic(models.Model):
             self.ana_date_created = datetime.now()
         self.ana_date_updated = datetime.now()
         return super().save(*args, **kwargs)
+
+
+class MonthlySummary(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    mon_cycle = models.DateField()
+    mon_cat_type = models.SmallIntegerField()
+    mon_amount = models.DecimalField(max_digits=15, decimal_places=3)
+    mon_entries = models.IntegerField(default=0)
+    mon_overall_balance = models.DecimalField(max_digits=15, decimal_places=3)
+    mon_status = models.BooleanField(default=False)
+    mon_date_created = models.DateTimeField(editable=False)
+    mon_date_updated = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'mon_cycle', 'mon_cat_type'],
+                name='monthly_summary_user_cycle_type'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', 'mon_cat_type', 'mon_cycle'],
+                name='monthly_summary_user_type_idx'
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return str(self.user)
+
+    def save(self, *args, **kwargs):
+        ''' On save, update timestamps '''
+        if not self.id:
+            self.mon_date_created = datetime.now()
+        self.mon_date_updated = datetime.now()
+        return super().save(*args, **kwargs)
+
+
+class Rollup(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    rol_cycle = models.DateField()
+    rol_dimension = models.SmallIntegerField()
+    rol_key = models.IntegerField()
+    rol_cat_type = models.SmallIntegerField()
+    rol_amount = models.DecimalField(max_digits=15, decimal_places=3)
+    rol_entries = models.IntegerField(default=0)
+    rol_date_created = models.DateTimeField(editable=False)
+    rol_date_updated = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    'user', 'rol_cycle', 'rol_dimension', 'rol_key',
+                    'rol_cat_type'
+                ],
+                name='rollup_user_cycle_dimension_key'
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return str(self.user)
+
+    def save(self, *args, **kwargs):
+        ''' On save, update timestamps '''
+        if not self.id:
+            self.rol_date_created = datetime.now()
+        self.rol_date_updated = datetime.now()
+        return super().save(*args, **kwargs)
+
+
+class SearchToken(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    sea_kind = models.SmallIntegerField()
+    sea_object = models.IntegerField()
+    sea_token = models.CharField(max_length=3)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'sea_token', 'sea_kind'],
+                name='search_token_user_token_idx'
+            ),
+            models.Index(
+                fields=['sea_kind', 'sea_object'],
+                name='search_token_object_idx'
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.sea_token
+
+
+class Recurrence(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    rec_slug = models.SlugField(unique=True, max_length=250)
+    rec_slug_hash = models.CharField(
+        max_length=32, db_index=True, editable=False
+    )
+    # RFC 5545 RRULE body, e.g. FREQ=MONTHLY;BYMONTHDAY=5
+    rec_rule = models.CharField(max_length=250)
+    rec_start = models.DateField()
+    # first occurrence not materialized yet, none once the rule ends
+    rec_next = models.DateField(null=True, blank=True, default=None)
+    rec_gen_status = models.SmallIntegerField()
+    rec_amount = models.DecimalField(max_digits=15, decimal_places=3)
+    rec_description = models.CharField(
+        max_length=250, null=True, blank=True, default=None
+    )
+    subcategory = models.ForeignKey(
+        SubCategory, on_delete=models.SET_NULL, null=True,
+        blank=True, default=None
+    )
+    beneficiary = models.ForeignKey(
+        Beneficiary, on_delete=models.SET_NULL, null=True,
+        blank=True, default=None
+    )
+    client = models.ForeignKey(
+        Client, on_delete=models.SET_NULL, null=True,
+        blank=True, default=None
+    )
+    financial_cost_center = models.ForeignKey(
+        Financial, on_delete=models.SET_NULL, null=True,
+        blank=True, default=None, related_name='recurrence_cost_center'
+    )
+    financial_account = models.ForeignKey(
+        Financial, on_delete=models.SET_NULL, null=True,
+        blank=True, default=None, related_name='recurrence_account'
+    )
+    rec_status = models.BooleanField(default=False)
+    rec_date_created = models.DateTimeField(editable=False)
+    rec_date_updated = models.DateTimeField()
+    rec_date_deleted = models.DateTimeField(
+        null=True, default=None, blank=True
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['rec_status', 'rec_next', 'user'],
+                name='recurrence_due_idx'
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.rec_rule
+
+    def save(self, *args, **kwargs):
+        ''' On save, update timestamps '''
+        if not self.id:
+            self.rec_date_created = datetime.now()
+        self.rec_date_updated = datetime.now()
+        self.rec_slug_hash = hash_gen(str(self.rec_slug))
+        return super().save(*args, **kwargs)
+
+
+class LedgerHead(models.Model):
+    # one row per user, locked by every write to that user ledger
+    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    # tail of the ledger: last entry position, date and running balances
+    led_sqn = models.IntegerField(default=0)
+    led_date = models.DateField(null=True, blank=True, default=None)
+    led_monthly_balance = models.DecimalField(
+        max_digits=15, decimal_places=3, default=0
+    )
+    led_overall_balance = models.DecimalField(
+        max_digits=15, decimal_places=3, default=0
+    )
+    # raised on every rebalance of the ledger
+    led_version = models.BigIntegerField(default=0)
+    led_date_created = models.DateTimeField(editable=False)
+    led_date_updated = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return str(self.user)
+
+    def save(self, *args, **kwargs):
+        ''' On save, update timestamps '''
+        if not self.id:
+            self.led_date_created = datetime.now()
+        self.led_date_updated = datetime.now()
+        return super().save(*args, **kwargs)
+
+
+class LedgerJob(models.Model):
+    # pending rebalance of a ledger, from one entry date onwards
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    job_entry_date = models.DateField()
+    job_date_created = models.DateTimeField(editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id'], name='ledger_job_user_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return str(self.user)
+
+    def save(self, *args, **kwargs):
+        ''' On save, update timestamps '''
+        if not self.id:
+            self.job_date_created = datetime.now()
+        return super().save(*args, **kwargs)
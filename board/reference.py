@@ -0,0 +1,156 @@
+import os
+
+from board.models import Beneficiary, Category, Client, Financial, SubCategory
+from django.db.models import F
+from library.utils.cache import TTLCache, current_version, versioned
+from library.utils.prefix import PrefixIndex
+
+SUBCATEGORY_CACHE_TTL = int(os.getenv('SUBCATEGORY_CACHE_TTL', 300))
+TYPEAHEAD_LIMIT = int(os.getenv('TYPEAHEAD_LIMIT', 20))
+
+# kind: (bundle list, option value and text of a row)
+TYPEAHEAD = {
+    'category': ('categories', lambda row: (
+        row['cat_slug_hash'], row['cat_name']
+    )),
+    'beneficiary': ('beneficiaries', lambda row: (
+        row['ben_slug_hash'],
+        f"{(row['beneficiary_category__cat_description'] or '')[:3].upper()}-{row['ben_name']}"  # noqa: E501
+    )),
+    'client': ('clients', lambda row: (
+        row['cli_slug_hash'], row['cli_name']
+    )),
+    'cost_center': ('cost_centers', lambda row: (
+        row['fin_slug_hash'], row['fin_cost_center']
+    )),
+    'account': ('accounts', lambda row: (
+        row['fin_slug_hash'],
+        f"{row['fin_bank_name']}: {row['fin_bank_branch']} / {row['fin_bank_account']}"  # noqa: E501
+    )),
+}
+
+# prefix indexes per (user, kind), tagged with the bundle version they read
+prefixes = TTLCache(max_size=1024)
+
+
+def reference_bundle(user):
+    ''' Dropdown options of the new entry modal, cached per user '''
+    return versioned('reference', user, lambda: _build(user))
+
+
+def reference_counts(user):
+    ''' Number of options of each kind, cached alongside the bundle '''
+    return versioned('reference', user, lambda: {
+        key: queryset.count() for key, queryset in _options(user).items()
+    }, variant='counts')
+
+
+def subcategory_options(user, category):
+    ''' Subcategory options of a category, cached until one of them changes '''
+    return versioned(
+        'subcategories',
+        f'{user}:{category}',
+        lambda: list(SubCategory.objects.filter(
+            category=category,
+            category__user=user,
+            sub_status=True,
+        ).order_by(
+            'sub_name'
+        ).values(
+            name=F('sub_name'),
+            slug=F('sub_slug_hash')
+        )),
+        timeout=SUBCATEGORY_CACHE_TTL
+    )
+
+
+def typeahead(user, kind, query, page=1):
+    ''' One page of the options of a kind whose words start with the query '''
+    version = current_version('reference', user)
+    cached = prefixes.get((user, kind))
+    if cached is None or cached[0] != version:
+        key, option = TYPEAHEAD[kind]
+        cached = (version, PrefixIndex(
+            option(row) for row in reference_bundle(user)[key]
+        ))
+        prefixes.set((user, kind), cached)
+
+    return cached[1].lookup(
+        query,
+        offset=(page - 1) * TYPEAHEAD_LIMIT,
+        limit=TYPEAHEAD_LIMIT
+    )
+
+
+def _build(user):
+    return {
+        key: list(queryset) for key, queryset in _options(user).items()
+    }
+
+
+def _options(user):
+    categories = Category.objects.filter(
+        user_id=user,
+        cat_status=True
+    ).order_by(
+        'cat_name'
+    ).values(
+        'cat_slug_hash',
+        'cat_name'
+    )
+
+    beneficiaries = Beneficiary.objects.select_related(
+        'beneficiary_category'
+    ).filter(
+        user_id=user,
+        ben_status=True
+    ).order_by(
+        'beneficiary_category__cat_description',
+        'ben_name'
+    ).values(
+        'ben_slug_hash',
+        'ben_name',
+        'beneficiary_category__cat_description'
+    )
+
+    clients = Client.objects.filter(
+        user_id=user,
+        cli_status=True
+    ).order_by(
+        'cli_name'
+    ).values(
+        'cli_slug_hash',
+        'cli_name'
+    )
+
+    cost_centers = Financial.objects.filter(
+        user_id=user,
+        fin_bank_name__isnull=True,
+        fin_status=True
+    ).order_by(
+        'fin_cost_center'
+    ).values(
+        'fin_slug_hash',
+        'fin_cost_center'
+    )
+
+    accounts = Financial.objects.filter(
+        user_id=user,
+        fin_cost_center__isnull=True,
+        fin_status=True
+    ).order_by(
+        'fin_bank_name'
+    ).values(
+        'fin_slug_hash',
+        'fin_bank_name',
+        'fin_bank_branch',
+        'fin_bank_account'
+    )
+
+    return {
+        'categories': categories,
+        'beneficiaries': beneficiaries,
+        'clients': clients,
+        'cost_centers': cost_centers,
+        'accounts': accounts
+    }
@@ -0,0 +1,99 @@
+import os
+import threading
+from types import MappingProxyType
+
+from board.models import Country, State
+from library.utils.helper import hash_gen
+
+FIXTURES = [
+    os.path.join(os.path.dirname(__file__), 'fixtures', 'country_data.json'),
+    os.path.join(os.path.dirname(__file__), 'fixtures', 'state_data.json'),
+]
+
+_lock = threading.Lock()
+_loaded = {'version': None, 'regions': None}
+
+
+class Regions:
+    # immutable snapshot of the active countries and their states
+    def __init__(self, countries, states):
+        self.countries = tuple(
+            MappingProxyType({
+                'id': country['id'],
+                'hash': hash_gen(str(country['id'])),
+                'cou_name': country['cou_name'],
+                'cou_image': country['cou_image'],
+            })
+            for country in sorted(countries, key=lambda row: row['cou_name'])
+        )
+        self.by_id = MappingProxyType(
+            {country['id']: country for country in self.countries}
+        )
+        self.by_hash = MappingProxyType(
+            {country['hash']: country for country in self.countries}
+        )
+
+        grouped = {}
+        for state in sorted(states, key=lambda row: row['sta_name']):
+            country = self.by_id.get(state['country_id'])
+            if country is None:
+                continue
+            grouped.setdefault(country['id'], []).append(MappingProxyType({
+                'id': state['id'],
+                'state': state['sta_name'],
+                'region': country['cou_name'],
+            }))
+        self.states_by_country = MappingProxyType(
+            {key: tuple(value) for key, value in grouped.items()}
+        )
+        self.states_by_id = MappingProxyType({
+            state['id']: state
+            for value in self.states_by_country.values() for state in value
+        })
+
+    def country(self, value):
+        ''' Country by id or by its id hash '''
+        return self.by_id.get(value) or self.by_hash.get(value)
+
+    def states(self, country):
+        ''' States of a country given by id or by its id hash '''
+        country = self.country(country)
+        return self.states_by_country.get(country['id'], ()) \
+            if country else ()
+
+
+def regions():
+    ''' Countries and states, loaded once and reloaded with the fixtures '''
+    version = fixture_version()
+    current = _loaded['regions']
+    if current is not None and _loaded['version'] == version:
+        return current
+
+    with _lock:
+        if _loaded['regions'] is None or _loaded['version'] != version:
+            _loaded['regions'] = Regions(
+                countries=Country.objects.filter(
+                    cou_status=True
+                ).values('id', 'cou_name', 'cou_image'),
+                states=State.objects.filter(
+                    sta_status=True
+                ).values('id', 'country_id', 'sta_name')
+            )
+            _loaded['version'] = version
+        return _loaded['regions']
+
+
+def fixture_version():
+    version = []
+    for path in FIXTURES:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        version.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
+
+
+def invalidate():
+    with _lock:
+        _loaded['regions'] = None
@@ -0,0 +1,168 @@
+import os
+
+from board.models import (Beneficiary, Category, Client, Financial, Release,
+                          SearchToken, SubCategory)
+from django.db import transaction
+from django.db.models import Count
+from library.utils.prefix import normalize
+
+SEARCH_LIMIT = int(os.getenv('SEARCH_LIMIT', 20))
+SEARCH_MIN_SCORE = float(os.getenv('SEARCH_MIN_SCORE', 0.6))
+SEARCH_CHUNK_SIZE = int(os.getenv('SEARCH_CHUNK_SIZE', 1000))
+
+# kind: (code, model, owner field, status field, indexed fields, slug field)
+KINDS = {
+    'beneficiary': (1, Beneficiary, 'user_id', 'ben_status', ['ben_name'], 'ben_slug_hash'),  # noqa: E501
+    'category': (2, Category, 'user_id', 'cat_status', ['cat_name'], 'cat_slug_hash'),  # noqa: E501
+    'subcategory': (3, SubCategory, 'category__user_id', 'sub_status', ['sub_name'], 'sub_slug_hash'),  # noqa: E501
+    'client': (4, Client, 'user_id', 'cli_status', ['cli_name'], 'cli_slug_hash'),  # noqa: E501
+    'financial': (5, Financial, 'user_id', 'fin_status', ['fin_cost_center', 'fin_description', 'fin_bank_name', 'fin_bank_account'], 'fin_slug_hash'),  # noqa: E501
+    'entry': (6, Release, 'user_id', 'rel_status', ['rel_description'], 'rel_slug_hash'),  # noqa: E501
+}
+
+MODELS = {model: kind for kind, (_, model, *_) in KINDS.items()}
+
+
+def tokens(text):
+    ''' Trigrams of the text, plus its short suffixes for prefix lookups '''
+    text = normalize(text)
+    grams = {text[i:i + 3] for i in range(len(text) - 2)}
+    grams.update({text[-2:], text[-1:]} if text else set())
+    return grams
+
+
+def tracked(kind):
+    ''' Columns of the kind whose change alters its search tokens '''
+    _, _, owner, status, fields, _ = KINDS[kind]
+    owner = owner.split('__')[0]
+    owner = owner if owner.endswith('_id') else f'{owner}_id'
+    return [owner, status, *fields]
+
+
+def reindex(kind, ids):
+    ''' Replace the tokens of the given rows, dropping inactive ones '''
+    code, model, owner, status, fields, _ = KINDS[kind]
+    ids = list(ids)
+    rows = model.objects.filter(
+        id__in=ids,
+        **{status: True}
+    ).values('id', owner, *fields)
+
+    with transaction.atomic():
+        SearchToken.objects.filter(sea_kind=code, sea_object__in=ids).delete()
+        SearchToken.objects.bulk_create([
+            SearchToken(
+                user_id=row[owner],
+                sea_kind=code,
+                sea_object=row['id'],
+                sea_token=token
+            )
+            for row in rows if row[owner]
+            for token in tokens(' '.join(filter(None, (
+                row[field] for field in fields
+            ))))
+        ], batch_size=SEARCH_CHUNK_SIZE)
+
+
+def reindex_all(kind, queryset=None):
+    ''' Reindex a queryset of the kind, one batch of rows at a time '''
+    _, model, *_ = KINDS[kind]
+    queryset = model.objects.all() if queryset is None else queryset
+    ids = queryset.order_by('id').values_list('id', flat=True)
+
+    last = 0
+    while True:
+        batch = list(ids.filter(id__gt=last)[:SEARCH_CHUNK_SIZE])
+        if not batch:
+            break
+        reindex(kind, batch)
+        last = batch[-1]
+
+
+def reindex_created(kind, objects):
+    ''' Reindex rows saved by bulk_create, which sends no signals '''
+    _, model, *_, slug = KINDS[kind]
+    ids = [obj.pk for obj in objects]
+    if None in ids:
+        # backends without RETURNING leave the primary keys unset
+        ids = model.objects.filter(**{
+            f'{slug}__in': [getattr(obj, slug) for obj in objects]
+        }).values_list('id', flat=True)
+    reindex(kind, ids)
+
+
+def matches(user, kind, query):
+    ''' Ids of the kind whose indexed text may contain the query '''
+    query = normalize(query)
+    candidates = SearchToken.objects.filter(
+        user=user,
+        sea_kind=KINDS[kind][0]
+    )
+
+    # short queries are a prefix of some stored token
+    if len(query) < 3:
+        return candidates.filter(
+            sea_token__startswith=query
+        ).values('sea_object')
+
+    grams = tokens(query) - {query[-2:], query[-1:]}
+    return candidates.filter(
+        sea_token__in=grams
+    ).values(
+        'sea_object'
+    ).annotate(
+        hits=Count('sea_token', distinct=True)
+    ).filter(
+        hits=len(grams)
+    ).values('sea_object')
+
+
+def search(user, query, limit=None):
+    ''' Labels and entries ranked by the share of query trigrams they hold '''
+    query = normalize(query)
+    if not query:
+        return []
+
+    ranked = SearchToken.objects.filter(user=user)
+    if len(query) < 3:
+        ranked, size = ranked.filter(sea_token__startswith=query), 1
+    else:
+        grams = tokens(query) - {query[-2:], query[-1:]}
+        ranked, size = ranked.filter(sea_token__in=grams), len(grams)
+    ranked = ranked.values(
+        'sea_kind',
+        'sea_object'
+    ).annotate(
+        hits=Count('sea_token', distinct=True)
+    ).filter(
+        hits__gte=max(1, round(size * SEARCH_MIN_SCORE))
+    ).order_by(
+        '-hits',
+        'sea_kind',
+        '-sea_object'
+    )[:limit or SEARCH_LIMIT]
+
+    ranked = list(ranked)
+    objects = {}
+    for kind, (code, model, owner, status, fields, slug) in KINDS.items():
+        ids = [row['sea_object'] for row in ranked if row['sea_kind'] == code]
+        if ids:
+            for row in model.objects.filter(
+                id__in=ids,
+                **{status: True}
+            ).values('id', slug, *fields):
+                # financial descriptions are searched but not part of the name
+                objects[code, row['id']] = {
+                    'kind': kind,
+                    'name': ' - '.join(filter(None, (
+                        row[field] for field in fields
+                        if field != 'fin_description'
+                    ))),
+                    'slug': row[slug]
+                }
+
+    return [
+        {**objects[row['sea_kind'], row['sea_object']],
+         'score': round(min(row['hits'] / size, 1), 3)}
+        for row in ranked if (row['sea_kind'], row['sea_object']) in objects
+    ]
@@ -0,0 +1,80 @@
+from board.models import (Beneficiary, BeneficiaryCategory, Category, Client,
+                          Country, Financial, Release, State, SubCategory)
+from board.regions import invalidate
+from board.search import MODELS, reindex, tracked
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+from library.utils.cache import bump_version
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Beneficiary)
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Financial)
+def reference_changed(sender, instance, **kwargs):
+    # bump now and again after commit, so a bundle rebuilt from
+    # uncommitted data in between is discarded as well
+    bump_version('reference', instance.user_id)
+    transaction.on_commit(lambda: bump_version('reference', instance.user_id))
+
+
+@receiver(post_save, sender=BeneficiaryCategory)
+def beneficiary_category_changed(sender, instance, **kwargs):
+    # descriptions are part of the beneficiary options, shared categories
+    # have no owner and reach every user with a beneficiary in them
+    users = set(Beneficiary.objects.filter(
+        beneficiary_category=instance
+    ).values_list('user_id', flat=True).distinct())
+    users.discard(None)
+    if instance.user_id:
+        users.add(instance.user_id)
+
+    def bump():
+        for user in users:
+            bump_version('reference', user)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+@receiver(post_save, sender=SubCategory)
+def subcategory_changed(sender, instance, **kwargs):
+    key = f'{instance.category.user_id}:{instance.category_id}'
+    bump_version('subcategories', key)
+    transaction.on_commit(lambda: bump_version('subcategories', key))
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_save, sender=State)
+def region_changed(sender, instance, **kwargs):
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(pre_save, sender=Beneficiary)
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=SubCategory)
+@receiver(pre_save, sender=Client)
+@receiver(pre_save, sender=Financial)
+@receiver(pre_save, sender=Release)
+def searchable_saving(sender, instance, **kwargs):
+    # indexed values as stored, to skip the reindex when none changed
+    instance._indexed = None
+    if instance.pk and not instance._state.adding:
+        instance._indexed = sender.objects.filter(
+            pk=instance.pk
+        ).values_list(*tracked(MODELS[sender])).first()
+
+
+@receiver(post_save, sender=Beneficiary)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=SubCategory)
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Financial)
+@receiver(post_save, sender=Release)
+def searchable_changed(sender, instance, created, **kwargs):
+    kind = MODELS[sender]
+    current = tuple(getattr(instance, field) for field in tracked(kind))
+    if created or getattr(instance, '_indexed', None) != current:
+        reindex(kind, [instance.id])
@@ -226,7 +226,7 @@ $(document).ready(function(){
                     }
                 } else if (edit) {
                     $('.entry_val').val(data['entry']['date']);
-                    $('.category_modal_edit option[value="'+data['subcategory']['category_value']+'"]').prop('selected', true);
+                    selectOption('.category_modal_edit', data['subcategory']['category_value'], data['subcategory']['category_name']);
 
                     $('.subcategory_modal').find('option').remove().end()
                     $(data['subcategory']['list']).each(function(index, value) {
@@ -236,13 +236,13 @@ $(document).ready(function(){
 
                     $('.note_modal').val(data['entry']['description']);
 
-                    $('.beneficiary_modal option[value="'+data['beneficiary']['value']+'"]').prop('selected', true);
-                    $('.client_modal option[value="'+data['client']['value']+'"]').prop('selected', true);
+                    selectOption('.beneficiary_modal', data['beneficiary']['value'], (data['beneficiary']['category'] || '').substring(0, 3).toUpperCase()+'-'+data['beneficiary']['name']);
+                    selectOption('select.client_modal', data['client']['value'], data['client']['name']);
 
-                    $('.cost_center_modal option[value="'+data['financial_cost_center']['value']+'"]').prop('selected', true);
+                    selectOption('select.cost_center_modal', data['financial_cost_center']['value'], data['financial_cost_center']['name']);
                     $('.status_modal option[value="'+data['entry']['status']+'"]').prop('selected', true);
 
-                    $('.account_modal option[value="'+data['financial_account']['value']+'"]').prop('selected', true);
+                    selectOption('.account_modal', data['financial_account']['value'], data['financial_account']['bank']+': '+data['financial_account']['branch']+' / '+data['financial_account']['account']);
                     $('.amount_modal').val(formatCurrency(data['entry']['amount']).replace('$', ''));
 
                     $('#edit_index').val(formData['detail']);
@@ -255,6 +255,85 @@ $(document).ready(function(){
         });
     });
 
+    // dashboard index - dropdown options are searched on the server as the user types
+    $('.typeahead').each(function() {
+        let select = $(this);
+        select.select2({
+            width: '100%',
+            dropdownParent: select.closest('.modal').length ? select.closest('.modal') : $(document.body),
+            ajax: {
+                method: 'POST',
+                url: '/board/autocomplete/js/',
+                headers: {'X-CSRFToken': csrftoken},
+                delay: 250,
+                dataType: 'json',
+                data: function(params) {
+                    return {'kind': select.data('kind'), 'q': params.term || '', 'page': params.page || 1};
+                }
+            }
+        });
+    });
+
+    // edit modal - a typeahead only holds the chosen option, so it is added before selecting
+    function selectOption(selector, value, text) {
+        $(selector).find('option[value!=""]').remove();
+        if (value) {
+            $(selector).append(new Option(text, value, true, true));
+        } else {
+            $(selector).val('');
+        }
+        $(selector).trigger('change.select2');
+    }
+
+    // dashboard index - monthly breakdown, read from the precomputed rollups
+    function loadBreakdown() {
+        let formData = {
+            'month': $('#breakdown').data('month'),
+            'dimension': $('#breakdown_dimension').val()
+        }
+        $.ajax({
+            method: 'POST',
+            url: '/board/rollup/js/',
+            headers: {'X-CSRFToken': csrftoken},
+            mode: 'same-origin', // Do not send CSRF token to another domain.
+            data: formData,
+            success: function(data) {
+                data = JSON.parse(data);
+                let largest = Math.max(...data.map(value => parseFloat(value['amount'])), 0);
+                $('#breakdown').empty();
+                if (data.length == 0) {
+                    $('#breakdown').append($('<p>').addClass('text-muted mb-0').text('No entries in this month.'));
+                }
+                $(data).each(function(index, value) {
+                    let width = largest ? parseFloat(value['amount']) / largest * 100 : 0;
+                    let color = value['type'] == 1 ? 'bg-success' : 'bg-danger';
+                    $('#breakdown').append(
+                        $('<div>').addClass('mb-3').append(
+                            $('<div>').addClass('d-flex justify-content-between').append(
+                                $('<span>').text(value['name']),
+                                $('<span>').text(formatCurrency(value['amount']))
+                            ),
+                            $('<div>').addClass('progress progress-sm').append(
+                                $('<div>').addClass('progress-bar ' + color).css('width', width + '%')
+                            )
+                        )
+                    );
+                });
+            },
+            error: function(data) {
+                alert('Data not found');
+            }
+        });
+    }
+
+    if ($('#breakdown').length) {
+        loadBreakdown();
+    }
+
+    $(document).on('change', '#breakdown_dimension', function() {
+        loadBreakdown();
+    });
+
     // dashboard index - category selection
     $(document).on('change', '.category_modal, .category_modal_edit', function() {
         let formData = {'category': $(this).val()}
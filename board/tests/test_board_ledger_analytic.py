@@ -0,0 +1,126 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from board.ledger.analytic import month_summary, recalculate
+from board.models import Category, MonthlySummary, SubCategory
+from board.tests.test_board_helper import BoardHelperMixin
+from django.test import TestCase
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+
+
+@pytest.mark.fast
+class TestBoardLedgerAnalytic(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        self.user = self.make_user()
+        self.income = self.make_subcategory(
+            category=self.make_category(
+                user=User.objects.get(id=self.user.id),
+            )
+        )
+        self.expense = self.make_subcategory(
+            category=Category.objects.get(id=self.make_category(
+                user=User.objects.get(id=self.user.id),
+                cat_slug='slug_expense',
+                cat_type=2
+            ).id),
+            sub_slug='slug_expense',
+        )
+        # +100 (jan), -30 (jan), +50 (mar)
+        self.make_entry(1, '2022-01-10', 100, 100, 100)
+        self.make_entry(2, '2022-01-20', -30, 70, 70)
+        self.make_entry(3, '2022-03-05', 50, 50, 120)
+        return super().setUp()
+
+    def make_entry(self, sqn, date, amount, monthly, overall):
+        return self.make_release(
+            user=User.objects.get(id=self.user.id),
+            rel_slug=f'slug_{sqn}',
+            rel_entry_date=date,
+            rel_amount=abs(amount),
+            rel_monthly_balance=monthly,
+            rel_overall_balance=overall,
+            subcategory=SubCategory.objects.get(
+                id=self.income.id if amount > 0 else self.expense.id
+            ),
+            rel_sqn=sqn
+        )
+
+    def snapshot(self, cycle):
+        return {
+            summary.mon_cat_type: (
+                summary.mon_status,
+                summary.mon_amount,
+                summary.mon_entries,
+                summary.mon_overall_balance
+            )
+            for summary in MonthlySummary.objects.filter(
+                user=self.user.id,
+                mon_cycle=cycle
+            )
+        }
+
+    def make_summary(self, cycle, cat_type):
+        return MonthlySummary.objects.create(
+            user=User.objects.get(id=self.user.id),
+            mon_cycle=cycle,
+            mon_cat_type=cat_type,
+            mon_amount=999,
+            mon_entries=9,
+            mon_overall_balance=999,
+            mon_status=True
+        )
+
+    # every cycle with entries gets one row per type, in constant queries
+    def test_ledger_analytic_creates_summaries(self):
+        # anchor, totals, summaries and one insert (plus the savepoints)
+        with self.assertNumQueries(6):
+            recalculate(user=self.user.id, date=date(2022, 1, 15))
+
+        self.assertEqual(self.snapshot('2022-01-01'), {
+            1: (True, Decimal(100), 1, Decimal(70)),
+            2: (True, Decimal(30), 1, Decimal(70)),
+        })
+        self.assertEqual(self.snapshot('2022-03-01'), {
+            1: (True, Decimal(50), 1, Decimal(120)),
+            2: (False, Decimal(0), 0, Decimal(120)),
+        })
+        self.assertFalse(
+            MonthlySummary.objects.filter(mon_cycle='2022-02-01').exists()
+        )
+
+    # existing summaries are updated in place, emptied cycles are disabled
+    def test_ledger_analytic_updates_summaries(self):
+        self.make_summary('2022-02-01', 2)
+        self.make_summary('2022-03-01', 1)
+
+        recalculate(user=self.user.id, date=date(2022, 2, 1))
+
+        self.assertEqual(MonthlySummary.objects.count(), 3)
+        self.assertEqual(self.snapshot('2022-02-01'), {
+            2: (False, Decimal(0), 0, Decimal(0)),
+        })
+        self.assertEqual(self.snapshot('2022-03-01'), {
+            1: (True, Decimal(50), 1, Decimal(120)),
+            2: (False, Decimal(0), 0, Decimal(120)),
+        })
+
+    # the board reads the cycle totals, or the last cycle before it
+    def test_ledger_analytic_month_summary(self):
+        recalculate(user=self.user.id, date=date(2022, 1, 1))
+
+        self.assertEqual(
+            month_summary(user=self.user.id, cycle=date(2022, 1, 1)),
+            ({'monthly': {'revenue': 100, 'expenses': 30, 'balance': 70},
+              'overall': 70}, False)
+        )
+        self.assertEqual(
+            month_summary(user=self.user.id, cycle=date(2022, 2, 1)),
+            ({'monthly': {'revenue': 100, 'expenses': 30, 'balance': 70},
+              'overall': 70}, True)
+        )
+        self.assertEqual(
+            month_summary(user=self.user.id, cycle=date(2021, 12, 1)),
+            (None, True)
+        )
@@ -0,0 +1,112 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from board.ledger import balance
+from board.ledger.balance import rebalance
+from board.models import Category, Release, SubCategory
+from board.tests.test_board_helper import BoardHelperMixin
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+
+
+@pytest.mark.fast
+class TestBoardLedgerBalance(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        self.user = self.make_user()
+        self.category_income = self.make_category(
+            user=User.objects.get(id=self.user.id),
+        )
+        self.category_expense = self.make_category(
+            user=User.objects.get(id=self.user.id),
+            cat_slug='slug_expense',
+            cat_type=2
+        )
+        self.income = self.make_subcategory(
+            category=Category.objects.get(id=self.category_income.id)
+        )
+        self.expense = self.make_subcategory(
+            category=Category.objects.get(id=self.category_expense.id),
+            sub_slug='slug_expense',
+        )
+        # ledger already balanced: +100 (jan), -30 (jan), +50 (feb)
+        self.entries = [
+            self.make_entry(1, '2022-01-10', 100, 100, 100),
+            self.make_entry(2, '2022-01-20', -30, 70, 70),
+            self.make_entry(3, '2022-02-05', 50, 50, 120),
+        ]
+        return super().setUp()
+
+    def make_entry(self, sqn, date, amount, monthly, overall):
+        return self.make_release(
+            user=User.objects.get(id=self.user.id),
+            rel_slug=f'slug_{sqn}_{date}',
+            rel_entry_date=date,
+            rel_amount=abs(amount),
+            rel_monthly_balance=monthly,
+            rel_overall_balance=overall,
+            subcategory=SubCategory.objects.get(
+                id=self.income.id if amount > 0 else self.expense.id
+            ),
+            rel_sqn=sqn
+        )
+
+    def ledger(self):
+        return list(Release.objects.filter(
+            user=self.user.id,
+            rel_status=True
+        ).order_by('rel_sqn').values_list(
+            'rel_sqn', 'rel_monthly_balance', 'rel_overall_balance'
+        ))
+
+    # backdated insert shifts every later entry and recomputes balances
+    def test_ledger_balance_backdated_insert(self):
+        self.make_entry(2, '2022-01-15', 10, 0, 0)
+        updated = rebalance(user=self.user.id, sqn=2)
+        self.assertEqual(updated, 3)
+        self.assertEqual(self.ledger(), [
+            (1, Decimal('100'), Decimal('100')),
+            (2, Decimal('110'), Decimal('110')),
+            (3, Decimal('80'), Decimal('80')),
+            (4, Decimal('50'), Decimal('130')),
+        ])
+
+    # untouched rows are not written back
+    def test_ledger_balance_only_changed_rows(self):
+        self.assertEqual(rebalance(user=self.user.id, sqn=1), 0)
+        self.make_entry(4, '2022-03-01', -20, 0, 0)
+        self.assertEqual(rebalance(user=self.user.id, sqn=4), 1)
+        self.assertEqual(
+            self.ledger()[-1], (4, Decimal('-20'), Decimal('100'))
+        )
+
+    # removed entries leave no gap in the sequence
+    def test_ledger_balance_after_delete(self):
+        Release.objects.filter(id=self.entries[0].id).update(rel_status=False)
+        rebalance(user=self.user.id, sqn=1, chunk_size=1)
+        self.assertEqual(self.ledger(), [
+            (1, Decimal('-30'), Decimal('-30')),
+            (2, Decimal('50'), Decimal('20')),
+        ])
+
+    # changed rows are written in batches, not one statement per row
+    @patch.object(balance, 'UPDATE_BATCH_SIZE', 2)
+    def test_ledger_balance_batched_writes(self):
+        self.make_entry(1, '2022-01-01', 10, 0, 0)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(rebalance(user=self.user.id, sqn=1), 4)
+        table = connection.ops.quote_name(Release._meta.db_table)
+        updates = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith(f'UPDATE {table}')
+        ]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(self.ledger(), [
+            (1, Decimal('10'), Decimal('10')),
+            (2, Decimal('110'), Decimal('110')),
+            (3, Decimal('80'), Decimal('80')),
+            (4, Decimal('50'), Decimal('130')),
+        ])
@@ -0,0 +1,126 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from board.ledger.balance import rebalance
+from board.ledger.forecast import forecast, patterns
+from board.models import Beneficiary, Category, SubCategory
+from board.tests.test_board_helper import BoardHelperMixin
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+
+
+@pytest.mark.fast
+class TestBoardLedgerForecast(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = self.make_user(use_is_valid=True)
+        self.income = self.make_subcategory(
+            category=self.make_category(
+                user=User.objects.get(id=self.user.id),
+            )
+        )
+        self.expense = self.make_subcategory(
+            category=Category.objects.get(id=self.make_category(
+                user=User.objects.get(id=self.user.id),
+                cat_slug='slug_expense',
+                cat_type=2
+            ).id),
+            sub_slug='slug_expense',
+        )
+        self.landlord = self.make_beneficiary(
+            user=User.objects.get(id=self.user.id),
+            beneficiary_category=self.make_beneficiary_category(),
+            ben_name='Landlord'
+        )
+        # salary, rent on the 5th for four months, a pending payment
+        self.make_entry(1, '2022-03-01', 2000)
+        for sqn, month in enumerate((3, 4, 5, 6), start=2):
+            self.make_entry(sqn, f'2022-{month:02}-05', -300, self.landlord)
+        self.make_entry(6, '2022-06-20', 1000, status=2)
+        rebalance(user=self.user.id, sqn=1)
+        return super().setUp()
+
+    def make_entry(self, sqn, date, amount, beneficiary=None, status=4):
+        return self.make_release(
+            user=User.objects.get(id=self.user.id),
+            rel_slug=f'slug_{sqn}',
+            rel_gen_status=status,
+            rel_entry_date=date,
+            rel_amount=abs(amount),
+            subcategory=SubCategory.objects.get(
+                id=self.income.id if amount > 0 else self.expense.id
+            ),
+            beneficiary=Beneficiary.objects.get(id=beneficiary.id)
+            if beneficiary else None,
+            rel_sqn=sqn
+        )
+
+    # repeated beneficiary, amount and day are detected
+    def test_forecast_patterns(self):
+        self.assertEqual(patterns(self.user.id, date(2022, 6, 15)), [{
+            'beneficiary': self.landlord.id,
+            'name': 'Landlord',
+            'amount': Decimal('300'),
+            'type': 2,
+            'day': 5
+        }])
+        self.assertEqual(patterns(self.user.id, date(2022, 9, 15)), [])
+
+    # pending entries and patterns are summed day by day
+    def test_forecast_balances(self):
+        data = forecast(self.user.id, date(2022, 6, 15), months=1)
+        self.assertEqual(data['opening'], 800)
+        self.assertEqual(len(data['days']), 30)
+        balances = dict(zip(data['days'], data['balance']))
+        self.assertEqual(balances[date(2022, 6, 19)], 800)
+        self.assertEqual(balances[date(2022, 6, 20)], 1800)
+        self.assertEqual(balances[date(2022, 7, 5)], 1500)
+        self.assertEqual(balances[date(2022, 7, 15)], 1500)
+
+        with self.assertNumQueries(0):
+            forecast(self.user.id, date(2022, 6, 15), months=1)
+
+    # pending is told by the entry condition, not by its date
+    def test_forecast_pending_status(self):
+        self.make_entry(7, '2022-06-10', -100, status=2)
+        self.make_entry(8, '2022-06-25', -50, status=1)
+        rebalance(user=self.user.id, sqn=7)
+        data = forecast(self.user.id, date(2022, 6, 15), months=1)
+        self.assertEqual(data['opening'], 750)
+        balances = dict(zip(data['days'], data['balance']))
+        self.assertEqual(balances[date(2022, 6, 16)], 650)
+        self.assertEqual(balances[date(2022, 6, 20)], 1650)
+        self.assertEqual(balances[date(2022, 6, 25)], 1650)
+
+    # a pattern is not projected for a month it was already entered
+    def test_forecast_scheduled_pattern(self):
+        self.make_entry(7, '2022-07-04', -300, self.landlord)
+        rebalance(user=self.user.id, sqn=7)
+        data = forecast(self.user.id, date(2022, 6, 15), months=1)
+        balances = dict(zip(data['days'], data['balance']))
+        self.assertEqual(balances[date(2022, 7, 4)], 1500)
+        self.assertEqual(balances[date(2022, 7, 5)], 1500)
+
+    # the endpoint validates the number of months
+    def test_forecast_endpoint(self):
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+        response = self.client.get(reverse('board:forecast'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['months'], 3)
+
+        response = self.client.get(
+            reverse('board:forecast'), data={'months': 99}
+        )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,175 @@
+import io
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from board.ledger.importer import Importer, parse_csv, parse_ofx
+from board.models import Category, Financial, Release, SubCategory
+from board.search import search
+from board.tests.test_board_helper import BoardHelperMixin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+
+OFX = '''OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS>
+<BANKACCTFROM><BANKID>001<ACCTID>123456789</BANKACCTFROM>
+<BANKTRANLIST>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20220110120000<TRNAMT>100,00<NAME>Employer</STMTTRN>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20220112<TRNAMT>-30.50<NAME>Market<MEMO>Groceries</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+'''  # noqa: E501
+
+
+@pytest.mark.fast
+class TestBoardLedgerImporter(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        self.user = self.make_user(use_is_valid=True)
+        self.income = self.make_subcategory(
+            category=self.make_category(
+                user=User.objects.get(id=self.user.id),
+            ),
+            sub_name='Salary'
+        )
+        self.expense = self.make_subcategory(
+            category=Category.objects.get(id=self.make_category(
+                user=User.objects.get(id=self.user.id),
+                cat_slug='slug_expense',
+                cat_type=2
+            ).id),
+            sub_name='Food',
+            sub_slug='slug_expense',
+        )
+        self.account = self.make_financial(
+            user=User.objects.get(id=self.user.id),
+            fin_bank_name='Bank Name',
+            fin_bank_branch='1234',
+            fin_bank_account='123456789',
+            fin_type=2
+        )
+        # existing entry in february, imported january rows go before it
+        self.make_release(
+            user=User.objects.get(id=self.user.id),
+            rel_entry_date='2022-02-01',
+            rel_amount=10,
+            rel_monthly_balance=10,
+            rel_overall_balance=10,
+            subcategory=SubCategory.objects.get(id=self.income.id),
+            rel_sqn=1
+        )
+        return super().setUp()
+
+    def importer(self, **kwargs):
+        return Importer(
+            user=self.user.id, login='jane.doe@email.com', **kwargs
+        )
+
+    def ledger(self):
+        return list(Release.objects.filter(
+            user=self.user.id,
+            rel_status=True
+        ).order_by('rel_sqn').values_list(
+            'rel_sqn', 'rel_entry_date', 'rel_overall_balance'
+        ))
+
+    # ofx tags are read across chunk boundaries
+    def test_importer_parse_ofx(self):
+        rows = list(parse_ofx(io.StringIO(OFX), size=7))
+        self.assertEqual(rows[0], (1, {
+            'date': '20220110',
+            'description': 'Employer',
+            'amount': '100.00',
+            'subcategory': '',
+            'beneficiary': 'Employer',
+            'account': '123456789'
+        }))
+        self.assertEqual(rows[1][1]['description'], 'Groceries')
+        self.assertEqual(len(rows), 2)
+
+    # rows are bulk created and the ledger rebalanced once
+    def test_importer_csv(self):
+        stream = io.StringIO(
+            'date,description,amount,subcategory,account\n'
+            '2022-01-20,Lunch,"1,000.50",Food,Bank Name\n'
+            '2022-01-05,Payment,2000,Salary,\n'
+            '2022-01-06,Unknown,5,Travel,\n'
+            '2022-13-01,Bad date,5,Food,\n'
+        )
+        result = self.importer().run(parse_csv(stream))
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual([line for line, _ in result['rejected']], [4, 5])
+        self.assertEqual(
+            [(sqn, str(date), total) for sqn, date, total in self.ledger()],
+            [
+                (1, '2022-01-05', Decimal('2000')),
+                (2, '2022-01-20', Decimal('999.5')),
+                (3, '2022-02-01', Decimal('1009.5')),
+            ]
+        )
+        self.assertEqual(
+            Release.objects.get(rel_description='Lunch').financial_account_id,
+            Financial.objects.get(id=self.account.id).id
+        )
+        self.assertEqual(
+            [row['name'] for row in search(self.user.id, 'lunch')], ['Lunch']
+        )
+
+    # descriptions keep the characters the entry form accepts
+    def test_importer_description(self):
+        stream = io.StringIO(
+            'date,description,amount\n'
+            '2022-01-05,"Café `a-b` [x] ""y"";: 5%",10\n'
+        )
+        self.importer(income='Salary').run(parse_csv(stream))
+
+        self.assertTrue(Release.objects.filter(
+            rel_description='Café a-b [x] y 5%'
+        ).exists())
+
+    # rows without primary keys after bulk_create are found by slug
+    def test_importer_reindex_without_pk(self):
+        stream = io.StringIO(
+            'date,description,amount,subcategory\n'
+            '2022-01-05,Groceries,-20,Food\n'
+        )
+        with patch.object(
+            type(connection.features),
+            'can_return_rows_from_bulk_insert',
+            False
+        ):
+            self.importer().run(parse_csv(stream))
+
+        self.assertEqual(
+            [row['name'] for row in search(self.user.id, 'grocer')],
+            ['Groceries']
+        )
+
+    # uploaded ofx falls back to the default subcategories by sign
+    def test_importer_upload_endpoint(self):
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+        response = self.client.post(
+            reverse('board:index_import'),
+            data={
+                'statement': SimpleUploadedFile('statement.ofx', OFX.encode()),
+                'income': 'Salary',
+                'expense': 'Food'
+            },
+            follow=True
+        )
+        self.assertEqual(
+            '2 entries imported successfully.', response.context['success']
+        )
+        self.assertEqual(self.ledger()[-1][2], Decimal('79.5'))
@@ -0,0 +1,92 @@
+from datetime import date
+from io import StringIO
+
+import pytest
+from board.ledger.integrity import check
+from board.ledger.sequence import insert
+from board.models import LedgerHead, MonthlySummary, Release
+from board.tests.test_board_helper import BoardHelperMixin
+from django.core.management import call_command
+from django.test import TestCase
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+
+
+@pytest.mark.fast
+class TestBoardLedgerIntegrity(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        self.user = self.make_user()
+        subcategory = self.make_subcategory(
+            category=self.make_category(
+                user=User.objects.get(id=self.user.id),
+            )
+        )
+        for number, (entry_date, amount) in enumerate([
+            (date(2022, 1, 10), 10),
+            (date(2022, 1, 20), 20),
+            (date(2022, 2, 5), 30),
+            (date(2022, 3, 1), 40),
+        ]):
+            insert(Release(
+                user_id=self.user.id,
+                rel_slug=f'slug-{number}',
+                rel_gen_status=1,
+                rel_entry_date=entry_date,
+                rel_amount=amount,
+                rel_monthly_balance=0,
+                rel_overall_balance=0,
+                subcategory_id=subcategory.id,
+                rel_status=True
+            ))
+        return super().setUp()
+
+    # a consistent ledger is reported clean, in any chunk size
+    def test_integrity_clean(self):
+        report = check(self.user.id, chunk_size=3)
+        self.assertFalse(report['diverged'])
+        self.assertEqual(report['entries'], 4)
+
+    # repeated sequence numbers are neither skipped nor read twice
+    def test_integrity_repeated_sqn(self):
+        Release.objects.filter(rel_slug='slug-2').update(rel_sqn=2)
+        report = check(self.user.id, chunk_size=1)
+        self.assertEqual(report['entries'], 4)
+        self.assertEqual(report['first_sqn'], 2)
+
+    # drifted balances, summaries and head are found and repaired
+    def test_integrity_repair(self):
+        Release.objects.filter(rel_slug='slug-2').update(
+            rel_overall_balance=0
+        )
+        MonthlySummary.objects.filter(
+            user=self.user.id, mon_cycle=date(2022, 1, 1)
+        ).update(mon_entries=5)
+        LedgerHead.objects.filter(user=self.user.id).update(led_sqn=2)
+
+        report = check(self.user.id, chunk_size=2)
+        self.assertEqual(
+            (report['balances'], report['first_sqn'], report['summaries'],
+             report['first_cycle'], report['head']),
+            (1, 3, 1, date(2022, 1, 1), True)
+        )
+        self.assertTrue(
+            check(self.user.id, repair=True, chunk_size=2)['repaired']
+        )
+        self.assertFalse(check(self.user.id)['diverged'])
+        self.assertEqual(
+            Release.objects.get(rel_slug='slug-2').rel_overall_balance, 60
+        )
+
+    # the command prints diverging ledgers only
+    def test_integrity_command(self):
+        Release.objects.filter(rel_slug='slug-3').update(rel_sqn=9)
+        out = StringIO()
+        call_command('check_ledger', '--repair', stdout=out)
+        self.assertEqual(out.getvalue(), (
+            f'user {self.user.id}: 1 of 4 entries, 0 monthly summaries, '
+            'head ok, repaired.\n'
+            '1 ledgers checked, 1 diverged.\n'
+        ))
+        self.assertEqual(
+            Release.objects.get(rel_slug='slug-3').rel_sqn, 4
+        )
@@ -0,0 +1,115 @@
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from board.ledger.jobs import pending, settle
+from board.ledger.sequence import insert
+from board.models import LedgerJob, MonthlySummary, Release
+from board.tests.test_board_helper import BoardHelperMixin
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+
+
+@pytest.mark.fast
+@patch('board.ledger.jobs.LEDGER_DEFERRED', True)
+class TestBoardLedgerJobs(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        self.user = self.make_user(use_is_valid=True)
+        self.subcategory = self.make_subcategory(
+            category=self.make_category(
+                user=User.objects.get(id=self.user.id),
+            )
+        )
+        return super().setUp()
+
+    def add_entry(self, entry_date, amount, slug):
+        return insert(Release(
+            user_id=self.user.id,
+            rel_slug=slug,
+            rel_gen_status=1,
+            rel_entry_date=entry_date,
+            rel_amount=amount,
+            rel_monthly_balance=0,
+            rel_overall_balance=0,
+            subcategory_id=self.subcategory.id,
+            rel_status=True
+        ))
+
+    def ledger(self):
+        return [
+            (sqn, float(balance)) for sqn, balance in Release.objects.filter(
+                user=self.user.id,
+                rel_status=True
+            ).order_by('rel_sqn', 'rel_entry_date', 'id').values_list(
+                'rel_sqn', 'rel_overall_balance'
+            )
+        ]
+
+    # backdated writes are queued and coalesced into one pass
+    def test_jobs_coalesced(self):
+        self.add_entry(date(2022, 1, 10), 10, 'a')
+        self.add_entry(date(2022, 2, 10), 20, 'b')
+        self.assertFalse(pending(self.user.id))
+
+        self.add_entry(date(2022, 1, 5), 5, 'c')
+        # the head is stale, so even a tail entry waits for the worker
+        self.add_entry(date(2022, 3, 1), 1, 'd')
+        settle(user=self.user.id, sqn=2, dates=[date(2022, 1, 10)])
+        self.assertTrue(pending(self.user.id))
+        self.assertEqual(LedgerJob.objects.count(), 3)
+
+        out = StringIO()
+        call_command('process_ledger_jobs', '--once', stdout=out)
+        self.assertEqual(
+            out.getvalue(), f'user {self.user.id}: 3 jobs coalesced.\n'
+        )
+        self.assertFalse(pending(self.user.id))
+        self.assertEqual(
+            self.ledger(), [(1, 5), (2, 15), (3, 35), (4, 36)]
+        )
+        self.assertEqual(MonthlySummary.objects.get(
+            user=self.user.id, mon_cycle=date(2022, 3, 1), mon_cat_type=1
+        ).mon_overall_balance, 36)
+
+    # queued writes into one gap are put back in entry date order
+    def test_jobs_same_gap(self):
+        self.add_entry(date(2022, 1, 1), 1, 'a')
+        self.add_entry(date(2022, 3, 1), 2, 'b')
+        self.add_entry(date(2022, 2, 1), 4, 'c')
+        self.add_entry(date(2022, 2, 15), 8, 'd')
+        self.add_entry(date(2022, 2, 15), 16, 'e')
+
+        call_command('process_ledger_jobs', '--once', stdout=StringIO())
+        self.assertEqual(list(Release.objects.filter(
+            user=self.user.id
+        ).order_by('rel_sqn').values_list(
+            'rel_slug', 'rel_sqn', 'rel_overall_balance'
+        )), [
+            ('a', 1, 1), ('c', 2, 5), ('d', 3, 13), ('e', 4, 29),
+            ('b', 5, 31)
+        ])
+        self.assertEqual(MonthlySummary.objects.get(
+            user=self.user.id, mon_cycle=date(2022, 2, 1), mon_cat_type=1
+        ).mon_overall_balance, 29)
+
+    # the dashboard shows a badge while balances wait for the worker
+    def test_jobs_recalculating_badge(self):
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+        self.assertNotContains(
+            self.client.get(reverse('board:index')), 'Recalculating'
+        )
+        settle(user=self.user.id, sqn=1, dates=[date(2022, 1, 1)])
+        self.assertContains(
+            self.client.get(reverse('board:index')), 'Recalculating'
+        )
@@ -0,0 +1,144 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from board.ledger.recurrence import generate
+from board.models import (Category, MonthlySummary, Recurrence, Release,
+                          SubCategory)
+from board.search import matches
+from board.tests.test_board_helper import BoardHelperMixin
+from django.test import TestCase
+from django.urls import reverse
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+from library.utils.helper import hash_gen
+
+
+@pytest.mark.fast
+class TestBoardLedgerRecurrence(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        self.user = self.make_user(use_is_valid=True)
+        self.expense = self.make_subcategory(
+            category=Category.objects.get(id=self.make_category(
+                user=User.objects.get(id=self.user.id),
+                cat_type=2
+            ).id)
+        )
+        # existing income in march, the rent of february goes before it
+        self.make_release(
+            user=User.objects.get(id=self.user.id),
+            rel_entry_date='2022-03-01',
+            rel_amount=1000,
+            rel_monthly_balance=1000,
+            rel_overall_balance=1000,
+            subcategory=SubCategory.objects.get(id=self.make_subcategory(
+                category=Category.objects.get(id=self.make_category(
+                    user=User.objects.get(id=self.user.id),
+                    cat_slug='slug_income'
+                ).id),
+                sub_slug='slug_income'
+            ).id),
+            rel_sqn=1
+        )
+        return super().setUp()
+
+    def make_recurrence(self, rule='FREQ=MONTHLY;BYMONTHDAY=5', **kwargs):
+        recurrence = Recurrence(
+            user=User.objects.get(id=self.user.id),
+            rec_slug='slug_rent',
+            rec_rule=rule,
+            rec_start=date(2022, 1, 5),
+            rec_next=date(2022, 2, 5),
+            rec_gen_status=5,
+            rec_amount=300,
+            rec_description='Rent',
+            subcategory=SubCategory.objects.get(id=self.expense.id),
+            rec_status=True
+        )
+        for field, value in kwargs.items():
+            setattr(recurrence, field, value)
+        recurrence.save()
+        return recurrence
+
+    def ledger(self):
+        return list(Release.objects.filter(
+            user=self.user.id,
+            rel_status=True
+        ).order_by('rel_sqn').values_list(
+            'rel_sqn', 'rel_entry_date', 'rel_overall_balance'
+        ))
+
+    # due occurrences are added in order and the ledger rebalanced once
+    def test_recurrence_generate(self):
+        recurrence = self.make_recurrence()
+        self.assertEqual(
+            generate(until=date(2022, 4, 30), chunk_size=2),
+            {self.user.id: 3}
+        )
+        self.assertEqual(self.ledger(), [
+            (1, date(2022, 2, 5), Decimal('-300')),
+            (2, date(2022, 3, 1), Decimal('700')),
+            (3, date(2022, 3, 5), Decimal('400')),
+            (4, date(2022, 4, 5), Decimal('100')),
+        ])
+        self.assertEqual(
+            Recurrence.objects.get(id=recurrence.id).rec_next,
+            date(2022, 5, 5)
+        )
+        self.assertEqual(MonthlySummary.objects.get(
+            user=self.user.id, mon_cycle=date(2022, 4, 1), mon_cat_type=2
+        ).mon_amount, 300)
+
+        # every occurrence is indexed for search
+        self.assertEqual(len(matches(self.user.id, 'entry', 'rent')), 3)
+
+        # nothing is due again until the next occurrence
+        self.assertEqual(generate(until=date(2022, 5, 4)), {})
+
+    # bounded rules stop being due after their last occurrence
+    def test_recurrence_generate_count(self):
+        recurrence = self.make_recurrence(rule='FREQ=MONTHLY;COUNT=3')
+        self.assertEqual(
+            generate(until=date(2022, 12, 31)), {self.user.id: 2}
+        )
+        self.assertIsNone(Recurrence.objects.get(id=recurrence.id).rec_next)
+
+    # repeated new entries become a template and their due occurrences
+    def test_recurrence_from_new_entry(self):
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+        beneficiary = self.make_beneficiary(
+            user=User.objects.get(id=self.user.id),
+            beneficiary_category=self.make_beneficiary_category()
+        )
+        account = self.make_financial(
+            user=User.objects.get(id=self.user.id),
+            fin_bank_name='Bank Name',
+            fin_bank_branch='1234',
+            fin_bank_account='123456789',
+            fin_type=2
+        )
+        self.client.post(reverse('board:index_new'), data={
+            'entry_date': '2022-01-20',
+            'subcategory': hash_gen('slug'),
+            'beneficiary': beneficiary.ben_slug_hash,
+            'account': account.fin_slug_hash,
+            'condition': 5,
+            'amount': '50.00',
+            'repeat': 'monthly'
+        }, follow=True)
+
+        recurrence = Recurrence.objects.get(user=self.user.id)
+        self.assertEqual(recurrence.rec_rule, 'FREQ=MONTHLY')
+        self.assertTrue(Release.objects.filter(
+            user=self.user.id,
+            rel_entry_date=date(2022, 2, 20),
+            rel_gen_status=5
+        ))
+        self.assertGreater(recurrence.rec_next, date.today())
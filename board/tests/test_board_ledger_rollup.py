@@ -0,0 +1,147 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from board.ledger.rollup import append, breakdown, refresh
+from board.models import Category, Release, Rollup, SubCategory
+from board.tests.test_board_helper import BoardHelperMixin
+from django.test import TestCase
+from django.urls import reverse
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+
+
+@pytest.mark.fast
+class TestBoardLedgerRollup(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        self.user = self.make_user(use_is_valid=True)
+        self.income = self.make_subcategory(
+            category=self.make_category(
+                user=User.objects.get(id=self.user.id),
+            ),
+            sub_name='Salary'
+        )
+        self.expense = self.make_subcategory(
+            category=Category.objects.get(id=self.make_category(
+                user=User.objects.get(id=self.user.id),
+                cat_name='Home',
+                cat_slug='slug_expense',
+                cat_type=2
+            ).id),
+            sub_name='Rent',
+            sub_slug='slug_expense',
+        )
+        self.beneficiary = self.make_beneficiary(
+            user=User.objects.get(id=self.user.id),
+            beneficiary_category=self.make_beneficiary_category()
+        )
+        self.make_entry(1, '2022-01-10', 100)
+        self.make_entry(2, '2022-01-20', -30)
+        self.make_entry(3, '2022-01-25', -20)
+        self.make_entry(4, '2022-03-05', 50)
+        return super().setUp()
+
+    def make_entry(self, sqn, date, amount):
+        return self.make_release(
+            user=User.objects.get(id=self.user.id),
+            rel_slug=f'slug_{sqn}',
+            rel_entry_date=date,
+            rel_amount=abs(amount),
+            subcategory=SubCategory.objects.get(
+                id=self.income.id if amount > 0 else self.expense.id
+            ),
+            beneficiary=self.beneficiary if amount < 0 else None,
+            rel_sqn=sqn
+        )
+
+    # one row per label and type, only for the refreshed cycles
+    def test_ledger_rollup_refresh(self):
+        # grouped totals, stale rows and the insert (plus the savepoints)
+        with self.assertNumQueries(5):
+            refresh(user=self.user.id, dates=[date(2022, 1, 15)])
+
+        self.assertEqual(
+            sorted(Rollup.objects.values_list(
+                'rol_dimension', 'rol_cat_type', 'rol_amount', 'rol_entries'
+            )),
+            [
+                (1, 1, Decimal(100), 1),
+                (1, 2, Decimal(50), 2),
+                (2, 1, Decimal(100), 1),
+                (2, 2, Decimal(50), 2),
+                (3, 2, Decimal(50), 2),
+            ]
+        )
+        self.assertFalse(Rollup.objects.filter(rol_cycle='2022-03-01'))
+
+    # moved entries leave no stale rows behind
+    def test_ledger_rollup_refresh_moved_entry(self):
+        refresh(user=self.user.id, dates=[date(2022, 1, 1)])
+        Release.objects.filter(rel_slug='slug_3').update(
+            rel_entry_date='2022-03-10'
+        )
+        refresh(user=self.user.id, dates=[date(2022, 1, 1), date(2022, 3, 1)])
+
+        self.assertEqual(
+            breakdown(
+                user=self.user.id,
+                cycle=date(2022, 3, 1),
+                dimension='category'
+            ),
+            [
+                {'name': 'Category',
+                 'slug': self.income.category.cat_slug_hash,
+                 'type': 1, 'amount': Decimal(50), 'entries': 1},
+                {'name': 'Home',
+                 'slug': self.expense.category.cat_slug_hash,
+                 'type': 2, 'amount': Decimal(20), 'entries': 1},
+            ]
+        )
+        self.assertEqual(
+            Rollup.objects.get(
+                rol_cycle='2022-01-01', rol_dimension=3
+            ).rol_amount,
+            30
+        )
+
+    # entries without a subcategory have no type and are left out
+    def test_ledger_rollup_no_subcategory(self):
+        entry = self.make_entry(5, '2022-01-28', -5)
+        Release.objects.filter(id=entry.id).update(subcategory=None)
+        refresh(user=self.user.id, dates=[date(2022, 1, 1)])
+        append(
+            user=self.user.id,
+            date=date(2022, 1, 28),
+            cat_type=None,
+            amount=5,
+            keys={'beneficiary': self.beneficiary.id}
+        )
+        self.assertEqual(
+            Rollup.objects.get(
+                rol_cycle='2022-01-01', rol_dimension=3
+            ).rol_amount,
+            50
+        )
+
+    # the breakdown endpoint serves the rollups of the month
+    def test_ledger_rollup_endpoint(self):
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+        refresh(user=self.user.id, dates=[date(2022, 1, 1)])
+
+        response = self.client.post(
+            '/board/rollup/js/',
+            data={'month': '2022-01', 'dimension': 'beneficiary'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        data = json.loads(response.content)
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['entries'], 2)
+        self.assertEqual(Decimal(data[0]['amount']), 50)
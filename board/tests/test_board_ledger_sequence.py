@@ -0,0 +1,244 @@
+import threading
+from datetime import date, timedelta
+from unittest import skipUnless
+
+import pytest
+from board.ledger.analytic import recalculate
+from board.ledger.balance import rebalance
+from board.ledger.rollup import refresh
+from board.ledger.sequence import allocate, insert, lock
+from board.models import (Category, LedgerHead, MonthlySummary, Release,
+                          Rollup, SubCategory)
+from board.tests.test_board_helper import BoardHelperMixin
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+
+
+class SequenceHelperMixin(BoardHelperMixin, HomeHelperMixin):
+    def add_entry(self, user, subcategory, entry_date, amount, slug):
+        # same steps as a new entry posted through the index view
+        return insert(Release(
+            user_id=user,
+            rel_slug=slug,
+            rel_gen_status=1,
+            rel_entry_date=entry_date,
+            rel_amount=amount,
+            rel_monthly_balance=0,
+            rel_overall_balance=0,
+            subcategory_id=subcategory,
+            rel_status=True
+        ))
+
+    def ledger(self, user):
+        return list(Release.objects.filter(
+            user=user,
+            rel_status=True
+        ).order_by('rel_sqn').values_list(
+            'rel_sqn', 'rel_amount', 'rel_overall_balance'
+        ))
+
+
+@pytest.mark.fast
+class TestBoardLedgerSequence(TestCase, SequenceHelperMixin):
+    def setUp(self) -> None:
+        self.user = self.make_user()
+        self.subcategory = self.make_subcategory(
+            category=self.make_category(
+                user=User.objects.get(id=self.user.id),
+            )
+        )
+        return super().setUp()
+
+    # backdated entries are placed after the last one of their date
+    def test_sequence_allocate(self):
+        self.add_entry(
+            self.user.id, self.subcategory.id, date(2022, 1, 10), 10, 'a'
+        )
+        self.add_entry(
+            self.user.id, self.subcategory.id, date(2022, 1, 20), 20, 'b'
+        )
+        with transaction.atomic():
+            self.assertEqual(allocate(self.user.id, date(2022, 1, 15)), 2)
+            self.assertEqual(allocate(self.user.id, date(2022, 1, 20)), 3)
+            self.assertEqual(allocate(self.user.id, date(2022, 1, 1)), 1)
+
+        self.add_entry(
+            self.user.id, self.subcategory.id, date(2022, 1, 15), 5, 'c'
+        )
+        self.assertEqual(
+            [(sqn, float(balance)) for sqn, _, balance in self.ledger(
+                self.user.id
+            )],
+            [(1, 10), (2, 15), (3, 35)]
+        )
+        self.assertEqual(LedgerHead.objects.get(user=self.user.id).led_sqn, 3)
+
+    # the head keeps the tail balances, appending reads no entry
+    def test_sequence_head_tail(self):
+        self.add_entry(
+            self.user.id, self.subcategory.id, date(2022, 1, 10), 10, 'a'
+        )
+        self.add_entry(
+            self.user.id, self.subcategory.id, date(2022, 2, 1), 20, 'b'
+        )
+        head = LedgerHead.objects.get(user=self.user.id)
+        self.assertEqual(
+            (head.led_sqn, head.led_date, head.led_monthly_balance,
+             head.led_overall_balance, head.led_version),
+            (2, date(2022, 2, 1), 20, 30, 2)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            self.add_entry(
+                self.user.id, self.subcategory.id, date(2022, 2, 3), 5, 'c'
+            )
+        # neither the previous position nor the previous balance is searched
+        self.assertFalse([
+            query['sql'] for query in queries
+            if 'MAX("board_release"."rel_sqn")' in query['sql']
+            or '"board_release"."rel_sqn" DESC' in query['sql']
+        ])
+        self.assertEqual(
+            LedgerHead.objects.get(user=self.user.id).led_overall_balance, 35
+        )
+
+    # tail inserts match a full rebuild of balances, summaries and rollups
+    def test_sequence_insert_tail(self):
+        expense = self.make_subcategory(
+            category=Category.objects.get(id=self.make_category(
+                user=User.objects.get(id=self.user.id),
+                cat_slug='slug_expense',
+                cat_type=2
+            ).id),
+            sub_slug='slug_expense'
+        )
+        entries = [
+            (date(2022, 1, 10), 100, self.subcategory.id),
+            (date(2022, 1, 12), 30, expense.id),
+            (date(2022, 3, 1), 50, self.subcategory.id),
+            (date(2022, 1, 11), 5, expense.id),
+        ]
+        for number, (entry_date, amount, subcategory) in enumerate(entries):
+            with CaptureQueriesContext(connection) as queries:
+                self.add_entry(
+                    self.user.id, subcategory, entry_date, amount,
+                    f'insert-{number}'
+                )
+            # only the backdated one groups the ledger again
+            self.assertEqual(
+                any('GROUP BY' in query['sql'] for query in queries),
+                number == 3
+            )
+
+        def snapshot():
+            return (
+                self.ledger(self.user.id),
+                list(MonthlySummary.objects.filter(
+                    user=self.user.id
+                ).order_by('mon_cycle', 'mon_cat_type').values_list(
+                    'mon_cycle', 'mon_cat_type', 'mon_amount',
+                    'mon_entries', 'mon_overall_balance', 'mon_status'
+                )),
+                sorted(Rollup.objects.filter(
+                    user=self.user.id
+                ).values_list(
+                    'rol_cycle', 'rol_dimension', 'rol_key',
+                    'rol_cat_type', 'rol_amount', 'rol_entries'
+                ))
+            )
+
+        appended = snapshot()
+        rebalance(user=self.user.id, sqn=1)
+        recalculate(user=self.user.id, date=date(2022, 1, 1))
+        refresh(
+            user=self.user.id,
+            dates=[date(2022, 1, 1), date(2022, 3, 1)]
+        )
+        self.assertEqual(appended, snapshot())
+        self.assertEqual(
+            [float(balance) for _, _, balance in appended[0]],
+            [100, 95, 65, 115]
+        )
+
+    # the head of a ledger without one starts from its last entry
+    def test_sequence_lock_creates_head(self):
+        self.make_release(
+            user=User.objects.get(id=self.user.id),
+            subcategory=SubCategory.objects.get(id=self.subcategory.id),
+            rel_sqn=7
+        )
+        with transaction.atomic():
+            self.assertEqual(lock(self.user.id).led_sqn, 7)
+        self.assertEqual(LedgerHead.objects.filter(user=self.user.id).count(), 1)  # noqa: E501
+
+
+@skipUnless(
+    connection.features.has_select_for_update,
+    'concurrent writes need a database with row locks'
+)
+class TestBoardLedgerSequenceConcurrency(TransactionTestCase,
+                                         SequenceHelperMixin):
+    THREADS = 4
+    ENTRIES = 15
+
+    def setUp(self) -> None:
+        self.users = []
+        for login in ('jane.doe@email.com', 'john.doe@email.com'):
+            user = self.make_user(use_login=login)
+            subcategory = self.make_subcategory(
+                category=self.make_category(
+                    user=User.objects.get(id=user.id),
+                    cat_slug=f'slug_{user.id}'
+                ),
+                sub_slug=f'slug_{user.id}'
+            )
+            self.users.append((user.id, subcategory.id))
+        return super().setUp()
+
+    def writer(self, number, errors):
+        try:
+            for entry in range(self.ENTRIES):
+                user, subcategory = self.users[entry % len(self.users)]
+                # dates go back and forth so entries land mid ledger
+                self.add_entry(
+                    user, subcategory,
+                    date(2022, 1, 1) + timedelta(days=(entry * 7 + number) % 60),  # noqa: E501
+                    number + 1,
+                    f'thread-{number}-{entry}'
+                )
+        except Exception as err:
+            errors.append(err)
+        finally:
+            connection.close()
+
+    # parallel writers leave every ledger numbered and balanced
+    def test_sequence_concurrent_writers(self):
+        errors = []
+        threads = [
+            threading.Thread(target=self.writer, args=(number, errors))
+            for number in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+        for user, _ in self.users:
+            ledger = self.ledger(user)
+            self.assertEqual(
+                [sqn for sqn, _, _ in ledger], list(range(1, len(ledger) + 1))
+            )
+            total = 0
+            for _, amount, balance in ledger:
+                total += amount
+                self.assertEqual(balance, total)
+            self.assertEqual(
+                LedgerHead.objects.get(user=user).led_sqn, len(ledger)
+            )
+        self.assertEqual(
+            Release.objects.count(), self.THREADS * self.ENTRIES
+        )
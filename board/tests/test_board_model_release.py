@@ -332,3 +332,15 @@ class TestBoardReleaseModel(TestCase, BoardHelperMixin,
     def test_release_string_representation(self):
         self.entry.full_clean()
         self.assertEqual(str(self.entry), str(self.entry.user))
+
+    # checking if slug hash is kept in sync with the slug on save
+    def test_release_slug_hash_on_save(self):
+        self.assertEqual(
+            self.entry.rel_slug_hash, hash_gen(self.entry.rel_slug)
+        )
+        self.entry.rel_slug = 'new_slug'
+        self.entry.save()
+        self.assertEqual(
+            Release.objects.get(rel_slug_hash=hash_gen('new_slug')).id,
+            self.entry.id
+        )
@@ -6,6 +6,7 @@ from django.db.utils import IntegrityError
 from django.test import TestCase
 from home.models import User
 from home.tests.test_home_helper import HomeHelperMixin
+from library.utils.helper import hash_gen
 from parameterized import parameterized
 
 
@@ -84,3 +85,9 @@ class TestBoardCategoryModel(TestCase, BoardHelperMixin,
         self.subcategory.sub_slug = ('A' * (max + 1))
         with self.assertRaises(ValidationError):
             self.subcategory.full_clean()
+
+    # checking if slug hash is kept in sync with the slug on save
+    def test_subcategory_slug_hash_on_save(self):
+        self.assertEqual(
+            self.subcategory.sub_slug_hash, hash_gen(self.subcategory.sub_slug)
+        )
@@ -0,0 +1,167 @@
+import json
+
+import pytest
+from board.models import Category, SubCategory
+from board.reference import (prefixes, reference_bundle, reference_counts,
+                             subcategory_options, typeahead)
+from board.tests.test_board_helper import BoardHelperMixin
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+from library.utils.helper import hash_gen
+from library.utils.prefix import PrefixIndex
+
+
+@pytest.mark.fast
+class TestBoardReference(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        cache.clear()
+        prefixes.clear()
+        self.user = self.make_user()
+        self.category = self.make_category(
+            user=User.objects.get(id=self.user.id),
+        )
+        return super().setUp()
+
+    # second read is served from the cache
+    def test_reference_bundle_cached(self):
+        with self.assertNumQueries(5):
+            bundle = reference_bundle(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(reference_bundle(self.user.id), bundle)
+        self.assertEqual(
+            [row['cat_name'] for row in bundle['categories']], ['Category']
+        )
+
+    # saving a label invalidates only its owner bundle
+    def test_reference_bundle_invalidated_on_save(self):
+        other = self.make_user(use_login='other@email.com')
+        reference_bundle(self.user.id)
+        reference_bundle(other.id)
+
+        category = Category.objects.get(id=self.category.id)
+        category.cat_name = 'Renamed'
+        category.save()
+
+        with self.assertNumQueries(0):
+            reference_bundle(other.id)
+        self.assertEqual(
+            [row['cat_name'] for row in reference_bundle(self.user.id)['categories']],  # noqa: E501
+            ['Renamed']
+        )
+
+    # renaming a beneficiary category refreshes the beneficiary options
+    def test_reference_bundle_beneficiary_category(self):
+        beneficiary_category = self.make_beneficiary_category()
+        self.make_beneficiary(
+            user=User.objects.get(id=self.user.id),
+            beneficiary_category=beneficiary_category
+        )
+        reference_bundle(self.user.id)
+
+        beneficiary_category.cat_description = 'Renamed'
+        beneficiary_category.save()
+        self.assertEqual(
+            [row['beneficiary_category__cat_description']
+             for row in reference_bundle(self.user.id)['beneficiaries']],
+            ['Renamed']
+        )
+
+    # counts are cached and follow the bundle version
+    def test_reference_counts(self):
+        with self.assertNumQueries(5):
+            counts = reference_counts(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(reference_counts(self.user.id), counts)
+        self.assertEqual(counts['categories'], 1)
+        self.assertEqual(counts['accounts'], 0)
+
+        self.make_category(
+            user=User.objects.get(id=self.user.id),
+            cat_slug='slug_other'
+        )
+        self.assertEqual(reference_counts(self.user.id)['categories'], 2)
+
+    # subcategory options are kept until one of the category changes
+    def test_reference_subcategory_options_cached(self):
+        subcategory = self.make_subcategory(
+            category=Category.objects.get(id=self.category.id),
+            sub_name='Salary'
+        )
+        with self.assertNumQueries(1):
+            subcategory_options(self.user.id, self.category.id)
+        with self.assertNumQueries(0):
+            options = subcategory_options(self.user.id, self.category.id)
+        self.assertEqual([row['name'] for row in options], ['Salary'])
+
+        subcategory = SubCategory.objects.get(id=subcategory.id)
+        subcategory.sub_name = 'Wages'
+        subcategory.save()
+        self.assertEqual(
+            [row['name'] for row in subcategory_options(
+                self.user.id, self.category.id
+            )],
+            ['Wages']
+        )
+
+    # every query word must start one of the label words, in label order
+    def test_reference_prefix_index(self):
+        index = PrefixIndex([
+            (1, 'Água e Esgoto'),
+            (2, 'Aluguel'),
+            (3, 'Energia Elétrica'),
+        ])
+        self.assertEqual(index.lookup('a'), ([(1, 'Água e Esgoto'), (2, 'Aluguel')], False))  # noqa: E501
+        self.assertEqual(index.lookup('ESG agu'), ([(1, 'Água e Esgoto')], False))  # noqa: E501
+        self.assertEqual(index.lookup('elet'), ([(3, 'Energia Elétrica')], False))  # noqa: E501
+        self.assertEqual(index.lookup('x'), ([], False))
+        self.assertEqual(index.lookup('', offset=1, limit=1), ([(2, 'Aluguel')], True))  # noqa: E501
+
+    # typeahead indexes are kept until their owner bundle changes
+    def test_reference_typeahead_rebuilt(self):
+        with self.assertNumQueries(5):
+            typeahead(self.user.id, 'category', 'cat')
+        with self.assertNumQueries(0):
+            items, more = typeahead(self.user.id, 'category', 'cat')
+        self.assertEqual(items, [(hash_gen('slug'), 'Category')])
+        self.assertFalse(more)
+
+        category = Category.objects.get(id=self.category.id)
+        category.cat_name = 'Renamed'
+        category.save()
+        self.assertEqual(typeahead(self.user.id, 'category', 'cat'), ([], False))  # noqa: E501
+        self.assertEqual(
+            typeahead(self.user.id, 'category', 'ren')[0][0][1], 'Renamed'
+        )
+
+    # the autocomplete endpoint answers select2 pages
+    def test_reference_autocomplete_endpoint(self):
+        User.objects.filter(id=self.user.id).update(use_is_valid=True)
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+        response = self.client.post(
+            '/board/autocomplete/js/',
+            data={'kind': 'category', 'q': 'Cat', 'page': 1},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(json.loads(response.content), {
+            'results': [
+                {'id': hash_gen('slug'), 'text': 'Category'}
+            ],
+            'pagination': {'more': False}
+        })
+
+        missing = self.client.post(
+            '/board/autocomplete/js/',
+            data={'kind': 'subcategory', 'q': 'Cat'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(missing.status_code, 404)
@@ -0,0 +1,52 @@
+from unittest.mock import patch
+
+import pytest
+from board.models import Country, State
+from board.regions import regions
+from board.tests.test_board_helper import BoardHelperMixin
+from django.test import TestCase
+from library.utils.helper import hash_gen
+
+
+@pytest.mark.fast
+class TestBoardRegions(TestCase, BoardHelperMixin):
+    def setUp(self) -> None:
+        self.country = self.make_country()
+        self.make_state(
+            country=Country.objects.get(id=self.country.id),
+            sta_name='Texas'
+        )
+        self.make_state(
+            country=Country.objects.get(id=self.country.id),
+            sta_name='Alabama'
+        )
+        return super().setUp()
+
+    # states are served by country hash without touching the database
+    def test_regions_loaded_once(self):
+        regions()
+        with self.assertNumQueries(0):
+            states = regions().states(hash_gen(str(self.country.id)))
+            self.assertEqual(
+                regions().country(self.country.id)['cou_name'], 'Country'
+            )
+        self.assertEqual([row['state'] for row in states], ['Alabama', 'Texas'])  # noqa: E501
+        self.assertEqual(regions().states(hash_gen('missing')), ())
+
+    # saved regions and new fixture versions reload the registry
+    def test_regions_reloaded(self):
+        regions()
+        state = State.objects.get(sta_name='Texas')
+        state.sta_status = False
+        state.save()
+        self.assertEqual(
+            [row['state'] for row in regions().states(self.country.id)],
+            ['Alabama']
+        )
+
+        State.objects.filter(sta_name='Alabama').update(sta_name='Alaska')
+        with patch('board.regions.fixture_version', return_value=('new',)):
+            self.assertEqual(
+                [row['state'] for row in regions().states(self.country.id)],
+                ['Alaska']
+            )
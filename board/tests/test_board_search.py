@@ -0,0 +1,112 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from board.models import (Category, Financial, Release, SearchToken,
+                          SubCategory)
+from board.search import matches, search, tokens
+from board.tests.test_board_helper import BoardHelperMixin
+from django.test import TestCase
+from django.urls import reverse
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+
+
+@pytest.mark.fast
+class TestBoardSearch(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        self.user = self.make_user(use_is_valid=True)
+        self.category = self.make_category(
+            user=User.objects.get(id=self.user.id),
+            cat_name='Groceries'
+        )
+        self.subcategory = self.make_subcategory(
+            category=Category.objects.get(id=self.category.id),
+            sub_name='Supermarket'
+        )
+        self.account = self.make_financial(
+            user=User.objects.get(id=self.user.id),
+            fin_bank_name='Grocer Bank',
+            fin_bank_branch='1234',
+            fin_bank_account='987654',
+            fin_type=2
+        )
+        self.make_release(
+            user=User.objects.get(id=self.user.id),
+            rel_description='Weekly groceries at the market',
+            subcategory=SubCategory.objects.get(id=self.subcategory.id)
+        )
+        return super().setUp()
+
+    # trigrams are accent and case insensitive, with short suffixes
+    def test_search_tokens(self):
+        self.assertEqual(tokens('Café'), {'caf', 'afe', 'fe', 'e'})
+        self.assertEqual(tokens('AB'), {'ab', 'b'})
+        self.assertEqual(tokens(None), set())
+
+    # saved rows are indexed, inactive ones dropped from the index
+    def test_search_index_on_save(self):
+        self.assertEqual(
+            list(matches(self.user.id, 'subcategory', 'market')),
+            [{'sea_object': self.subcategory.id}]
+        )
+        self.assertFalse(matches(self.user.id, 'subcategory', 'marked'))
+        self.assertTrue(matches(self.user.id, 'financial', '65'))
+
+        account = Financial.objects.get(id=self.account.id)
+        account.fin_status = False
+        account.save()
+        self.assertFalse(
+            SearchToken.objects.filter(sea_kind=5, sea_object=account.id)
+        )
+
+    # saves that leave the indexed columns untouched skip the reindex
+    def test_search_index_unchanged(self):
+        release = Release.objects.get(user=self.user.id)
+        release.rel_amount = 50
+        with patch('board.signals.reindex') as reindex:
+            release.save()
+        reindex.assert_not_called()
+
+        release.rel_description = 'Monthly rent'
+        release.save()
+        self.assertEqual(
+            [row['name'] for row in search(self.user.id, 'rent')],
+            ['Monthly rent']
+        )
+
+    # labels and entries are ranked together by matched trigrams
+    def test_search_ranked(self):
+        results = search(self.user.id, 'grocer')
+        self.assertEqual(
+            [(row['kind'], row['name']) for row in results],
+            [
+                ('category', 'Groceries'),
+                ('financial', 'Grocer Bank - 987654'),
+                ('entry', 'Weekly groceries at the market'),
+            ]
+        )
+        self.assertEqual(results[0]['score'], 1)
+        self.assertEqual(
+            [row['kind'] for row in search(self.user.id, 'grocerx')],
+            ['category', 'financial', 'entry']
+        )
+        self.assertEqual(search(self.user.id, 'zzz'), [])
+
+    # the global endpoint answers the ranked results as json
+    def test_search_endpoint(self):
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+        response = self.client.get(reverse('board:search'), data={'q': 'sup'})
+        self.assertEqual(json.loads(response.content), [{
+            'kind': 'subcategory',
+            'name': 'Supermarket',
+            'slug': SubCategory.objects.get(id=self.subcategory.id).sub_slug_hash,  # noqa: E501
+            'score': 1
+        }])
@@ -145,6 +145,63 @@ class TestBoardViewCategories(TestCase, HomeHelperMixin, BoardHelperMixin):
             )
             self.assertEqual(response.context['pages']['total_pg'], 10)
 
+    # testing keyset pagination, repeated names are split by id
+    def test_board_labels_categories_keyset_pagination(self):
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+
+        for i in range(1, 24):
+            self.make_subcategory(
+                category=Category.objects.get(id=self.category.id),
+                sub_name='SubCategory' + str(i % 4),
+                sub_slug=i,
+            )
+
+        with patch('board.views.labels_categories_view.PG_KEYSET', new=True), \
+             patch('board.views.labels_categories_view.PG_LIMIT', new=5):
+            response = self.client.get(reverse('board:labels_categories'))
+            self.assertIsNone(response.context['pages']['prev'])
+            self.assertNotIn('total_pg', response.context['pages'])
+
+            forward = []
+            while True:
+                forward.append([
+                    row['sub_id'] for row in response.context['categories']
+                ])
+                if not response.context['pages']['next']:
+                    break
+                response = self.client.get(
+                    reverse('board:labels_categories'),
+                    data={'after': response.context['pages']['next']}
+                )
+
+            backward = []
+            while True:
+                backward.insert(0, [
+                    row['sub_id'] for row in response.context['categories']
+                ])
+                if not response.context['pages']['prev']:
+                    break
+                response = self.client.get(
+                    reverse('board:labels_categories'),
+                    data={'before': response.context['pages']['prev']}
+                )
+
+        expected = list(Category.objects.filter(
+            subcategory__sub_status=True
+        ).order_by(
+            'cat_name', 'subcategory__sub_name', 'subcategory__id'
+        ).values_list('subcategory__id', flat=True))
+        self.assertEqual(len(forward), 5)
+        self.assertEqual(sum(forward, []), expected)
+        self.assertEqual(backward, forward)
+
     # testing filters
     def test_board_labels_categories_filters(self):
         self.client.post(
@@ -0,0 +1,69 @@
+import csv
+import io
+import zipfile
+from unittest.mock import patch
+
+import pytest
+from board.models import Category, SubCategory
+from board.tests.test_board_helper import BoardHelperMixin
+from django.test import TestCase
+from django.urls import reverse
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+
+
+@pytest.mark.fast
+class TestBoardViewExport(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        self.user = self.make_user(use_is_valid=True)
+        self.category = self.make_category(
+            user=User.objects.get(id=self.user.id),
+        )
+        self.subcategory = self.make_subcategory(
+            category=Category.objects.get(id=self.category.id)
+        )
+        for i in range(1, 8):
+            self.make_release(
+                user=User.objects.get(id=self.user.id),
+                rel_slug=f'slug_{i}',
+                rel_entry_date=f'2022-0{i}-10',
+                subcategory=SubCategory.objects.get(id=self.subcategory.id),
+                rel_sqn=i
+            )
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+        return super().setUp()
+
+    # csv is streamed in sequence order across read batches
+    def test_board_export_csv(self):
+        with patch('board.ledger.export.EXPORT_CHUNK_SIZE', new=2):
+            response = self.client.get(
+                reverse('board:index_export'),
+                data={'format': 'csv', 'from': '2022-02', 'to': '2022-06'}
+            )
+            self.assertTrue(response.streaming)
+            rows = list(csv.reader(io.StringIO(
+                b''.join(response.streaming_content).decode('utf-8-sig')
+            )))
+        self.assertEqual(rows[0][:2], ['Sequence', 'Entry Date'])
+        self.assertEqual([row[0] for row in rows[1:]], ['2', '3', '4', '5', '6'])  # noqa: E501
+        self.assertEqual(rows[1][2], 'Revenue')
+
+    # xlsx is a valid zip with one row per entry plus the header
+    def test_board_export_xlsx(self):
+        response = self.client.get(
+            reverse('board:index_export'), data={'format': 'xlsx'}
+        )
+        archive = zipfile.ZipFile(
+            io.BytesIO(b''.join(response.streaming_content))
+        )
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(
+            archive.read('xl/worksheets/sheet1.xml').count(b'<row>'), 8
+        )
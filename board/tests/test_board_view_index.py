@@ -1,3 +1,4 @@
+import json
 from datetime import datetime, timedelta
 from unittest.mock import patch
 
@@ -6,12 +7,13 @@ from board.models import (Beneficiary, BeneficiaryCategory, Category, Client,
                           Country, Financial, State, SubCategory)
 from board.tests.test_board_helper import BoardHelperMixin
 from board.views import index_view
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import resolve, reverse
 from home.models import User
 from home.tests.test_home_helper import HomeHelperMixin
 from library.utils.auth import auth
-from library.utils.helper import hash_gen
+from library.utils.helper import cursor_encode, hash_gen
 from parameterized import parameterized
 
 
@@ -697,3 +699,119 @@ class TestBoardViewIndex(TestCase, BoardHelperMixin, HomeHelperMixin):
                 response.context['pages']['pg_range'], [2, 3, 4, 5, 6]
             )
             self.assertEqual(response.context['pages']['total_pg'], 6)
+
+    # tampered keyset cursors fall back to the first page
+    @parameterized.expand([
+        ([[1], [2]],),
+        (['sqn', 'id'],),
+        ([{'sqn': 1}, 2],),
+        ([1],),
+        ('not a list',),
+    ])
+    def test_board_index_keyset_tampered_cursor(self, cursor):
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+
+        for i in range(1, 8):
+            self.make_release(
+                user=User.objects.get(id=self.user.id),
+                rel_slug=i,
+                rel_entry_date=f'2022-05-{i}',
+                subcategory=SubCategory.objects.get(
+                    id=self.subcategory_income.id
+                ),
+                rel_sqn=i
+            )
+
+        with patch('board.views.index_view.PG_KEYSET', new=True), \
+             patch('board.views.index_view.PG_LIMIT', new=5):
+            first = self.client.get(
+                reverse('board:index'), data={'m': '5', 'y': '2022'}
+            )
+            for direction in ('after', 'before'):
+                response = self.client.get(
+                    reverse('board:index'),
+                    data={
+                        'm': '5',
+                        'y': '2022',
+                        direction: cursor_encode(cursor)
+                    }
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    [row['rel_sqn'] for row in response.context['entries']],
+                    [row['rel_sqn'] for row in first.context['entries']]
+                )
+
+    # month filter is a half-open range, edges belong to their own month
+    @parameterized.expand([
+        ('4', '2022', ['2022-04-30']),
+        ('5', '2022', ['2022-05-31', '2022-05-01', '2022-05-01']),
+        ('12', '2022', ['2022-12-31']),
+        ('1', '2023', ['2023-01-01']),
+    ])
+    def test_board_index_month_range(self, month, year, expected):
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+
+        dates = ['2022-04-30', '2022-05-01', '2022-05-31', '2022-12-31', '2023-01-01']  # noqa: E501
+        for i, entry_date in enumerate(dates, start=2):
+            self.make_release(
+                user=User.objects.get(id=self.user.id),
+                rel_slug=i,
+                rel_entry_date=entry_date,
+                subcategory=SubCategory.objects.get(id=self.subcategory_income.id),  # noqa: E501
+                rel_sqn=i
+            )
+
+        response = self.client.get(
+            reverse('board:index'),
+            data={
+                'm': month,
+                'y': year
+            }
+        )
+        self.assertEqual(
+            [str(row['rel_entry_date']) for row in response.context['entries']],  # noqa: E501
+            expected
+        )
+
+    # entry details list the sibling subcategories, unknown entries 404
+    def test_board_index_detail(self):
+        cache.clear()
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+        detail = {'detail': hash_gen('slug')}
+
+        response = self.client.post(
+            '/board/js/', data=detail, HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.content)['subcategory']['list'][0]['slug'],
+            hash_gen('slug')
+        )
+
+        missing = self.client.post(
+            '/board/js/', data={'detail': hash_gen('missing')},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(missing.status_code, 404)
@@ -0,0 +1,126 @@
+import json
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from board.ledger.analytic import recalculate
+from board.ledger.report import REPORT_MAX_POINTS, periods
+from board.models import Category, SubCategory
+from board.tests.test_board_helper import BoardHelperMixin
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from home.models import User
+from home.tests.test_home_helper import HomeHelperMixin
+
+
+@pytest.mark.fast
+class TestBoardViewReport(TestCase, BoardHelperMixin, HomeHelperMixin):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = self.make_user(use_is_valid=True)
+        self.income = self.make_subcategory(
+            category=self.make_category(
+                user=User.objects.get(id=self.user.id),
+            )
+        )
+        self.expense = self.make_subcategory(
+            category=Category.objects.get(id=self.make_category(
+                user=User.objects.get(id=self.user.id),
+                cat_slug='slug_expense',
+                cat_type=2
+            ).id),
+            sub_slug='slug_expense',
+        )
+        # +100 (jan/2021), -30 (mar/2021), +50 (feb/2022)
+        self.make_entry(1, '2021-01-10', 100)
+        self.make_entry(2, '2021-03-20', -30)
+        self.make_entry(3, '2022-02-05', 50)
+        self.client.post(
+            reverse('home:index_auth'),
+            data={
+                'use_login': 'jane.doe@email.com',
+                'use_password': '$Trong1234'
+            },
+            follow=True
+        )
+        return super().setUp()
+
+    def make_entry(self, sqn, date, amount):
+        return self.make_release(
+            user=User.objects.get(id=self.user.id),
+            rel_slug=f'slug_{sqn}',
+            rel_entry_date=date,
+            rel_amount=abs(amount),
+            subcategory=SubCategory.objects.get(
+                id=self.income.id if amount > 0 else self.expense.id
+            ),
+            rel_sqn=sqn
+        )
+
+    def report(self, **data):
+        response = self.client.get(reverse('board:report'), data=data)
+        return response.status_code, json.loads(response.content)
+
+    # every period of the range is listed, empty ones included
+    def test_board_report_quarter(self):
+        status, data = self.report(
+            **{'from': '2021-02-01', 'to': '2022-03-31'},
+            granularity='quarter'
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(data['periods'], [
+            '2021-01-01', '2021-04-01', '2021-07-01', '2021-10-01',
+            '2022-01-01'
+        ])
+        self.assertEqual(
+            [float(value) for value in data['balance']],
+            [-30, 0, 0, 0, 50]
+        )
+        self.assertEqual(float(data['expenses'][0]), 30)
+
+    # cached series are rebuilt once the ledger changes
+    def test_board_report_cache_version(self):
+        query = {'from': '2021-01-01', 'to': '2022-12-31',
+                 'granularity': 'year'}
+        _, data = self.report(**query)
+        self.assertEqual(
+            [float(value) for value in data['revenue']], [100, 50]
+        )
+
+        self.make_entry(4, '2022-06-01', 25)
+        _, data = self.report(**query)
+        self.assertEqual(float(data['revenue'][1]), 50)
+
+        recalculate(user=self.user.id, date=date(2022, 6, 1))
+        _, data = self.report(**query)
+        self.assertEqual(float(data['revenue'][1]), 75)
+
+    # invalid parameters are answered with an error message
+    def test_board_report_invalid(self):
+        self.assertEqual(self.report(granularity='hour')[0], 400)
+        self.assertEqual(self.report(**{'from': '2022-13-01'})[0], 400)
+        self.assertEqual(self.report(
+            **{'from': '1900-01-01', 'to': '2022-12-31'}, granularity='day'
+        )[0], 400)
+
+    # the calendar edges neither overflow nor count every period
+    def test_board_report_calendar_edges(self):
+        status, data = self.report(
+            **{'from': '9998-01-01', 'to': '9999-12-31'}, granularity='year'
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(data['periods'], ['9998-01-01', '9999-01-01'])
+        counted = []
+
+        def counting(*args):
+            for period in periods(*args):
+                counted.append(period)
+                yield period
+
+        with patch('board.views.report_view.periods', counting):
+            self.assertEqual(self.report(
+                **{'from': '0001-01-01', 'to': '9999-12-31'},
+                granularity='day'
+            )[0], 400)
+        self.assertEqual(len(counted), REPORT_MAX_POINTS + 1)
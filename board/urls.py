@@ -1,12 +1,13 @@
 from django.urls import path
 
-from board.views import (error_view, index_view, js_ajax,
+from board.views import (error_view, export_view, index_view, js_ajax,
                          labels_beneficiaries_form_view,
                          labels_beneficiaries_view,
                          labels_categories_form_view, labels_categories_view,
                          labels_clients_form_view, labels_clients_view,
                          labels_financial_form_view, labels_financial_view,
-                         profile_password_view, profile_view)
+                         profile_password_view, profile_view, report_view,
+                         search_view)
 
 app_name = 'board'
 
@@ -33,6 +34,37 @@ urlpatterns = [
         name='index_delete'
     ),
 
+    path(
+        'board/index/import/',
+        index_view.BoardIndexView.as_view(),
+        name='index_import'
+    ),
+
+    path(
+        'board/index/export/',
+        export_view.BoardExportView.as_view(),
+        name='index_export'
+    ),
+
+    # REPORT
+    path(
+        'board/report/',
+        report_view.BoardReportView.as_view(),
+        name='report'
+    ),
+    path(
+        'board/forecast/',
+        report_view.BoardForecastView.as_view(),
+        name='forecast'
+    ),
+
+    # SEARCH
+    path(
+        'board/search/',
+        search_view.BoardSearchView.as_view(),
+        name='search'
+    ),
+
     # LABELS/BENEFICIARIES
     path(
         'board/labels/beneficiaries/',
@@ -191,6 +223,8 @@ urlpatterns = [
     # JS
     path('board/js/', js_ajax.JsView.as_view()),
     path('board/category/js/', js_ajax.JsView.as_view()),
+    path('board/rollup/js/', js_ajax.JsView.as_view()),
+    path('board/autocomplete/js/', js_ajax.JsView.as_view()),
     path('board/labels/beneficiaries/js/', js_ajax.JsView.as_view()),
     path('board/labels/categories/js/', js_ajax.JsView.as_view()),
     path('board/labels/categories/form/js/', js_ajax.JsView.as_view()),
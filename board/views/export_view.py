@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from board.ledger.export import HEADER, ledger_rows
+from django.http import StreamingHttpResponse
+from django.views import View
+from library.utils.auth import credentials
+from library.utils.decorators import auth_check
+from library.utils.export import csv_stream, xlsx_stream
+from library.utils.helper import month_range
+from library.utils.logs import userlog
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'  # noqa: E501
+}
+
+
+class BoardExportView(View):
+    @auth_check
+    def dispatch(self, *args, **kwargs):
+        userlog(self.request)
+        return super().dispatch(self.request, *args, **kwargs)
+
+    @auth_check
+    def get(self, *args, **kwargs):
+        output = self.request.GET.get('format', 'csv')
+        if output not in CONTENT_TYPES:
+            output = 'csv'
+
+        # month range (YYYY-MM), both ends included, plus label filters
+        filters = {}
+        try:
+            if self.request.GET.get('from'):
+                start = datetime.strptime(self.request.GET.get('from'), '%Y-%m')  # noqa: E501
+                filters['rel_entry_date__gte'] = month_range(start.year, start.month)[0]  # noqa: E501
+            if self.request.GET.get('to'):
+                end = datetime.strptime(self.request.GET.get('to'), '%Y-%m')
+                filters['rel_entry_date__lt'] = month_range(end.year, end.month)[1]  # noqa: E501
+        except ValueError:
+            pass
+        if self.request.GET.get('category'):
+            filters['subcategory__category__cat_slug_hash'] = self.request.GET.get('category')  # noqa: E501
+        if self.request.GET.get('client'):
+            filters['client__cli_slug_hash'] = self.request.GET.get('client')  # noqa: E501
+        if self.request.GET.get('account'):
+            filters['financial_account__fin_slug_hash'] = self.request.GET.get('account')  # noqa: E501
+
+        rows = ledger_rows(
+            user=credentials(self.request.session['auth'], 'whoami'),
+            **filters
+        )
+        stream = csv_stream(HEADER, rows) if output == 'csv' \
+            else xlsx_stream(HEADER, rows, sheet='Ledger')
+
+        response = StreamingHttpResponse(
+            stream, content_type=CONTENT_TYPES[output]
+        )
+        response['Content-Disposition'] = \
+            f'attachment; filename="ledger-{datetime.now():%Y%m%d}.{output}"'
+        return response
@@ -1,14 +1,17 @@
 import json
+from datetime import datetime
 
+from board.ledger.rollup import DIMENSIONS, breakdown
 from board.models import (Beneficiary, Category, Client, Financial, Release,
-                          State, SubCategory)
+                          SubCategory)
+from board.reference import TYPEAHEAD, subcategory_options, typeahead
+from board.regions import regions
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db.models import F, Func
-from django.http import HttpResponse
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotFound
 from django.views import View
 from library.utils.auth import credentials
 from library.utils.decorators import auth_check
-from library.utils.helper import hash_gen
 from library.utils.logs import userlog
 
 
@@ -23,6 +26,7 @@ class JsView(View):
         if _is_ajax(self.request) and self.request.POST:
             match self.request.path:
                 case '/board/js/':
+                    user = credentials(self.request.session['auth'], 'whoami')
                     detail = Release.objects.select_related(
                         'subcategory',
                         'beneficiary',
@@ -30,13 +34,9 @@ class JsView(View):
                         'financial_cost_center',
                         'financial_account',
                     ).filter(
-                        user=credentials(
-                            self.request.session['auth'], 'whoami'
-                        ),
-                        rel_status=True
-                    ).extra(
-                        where=['MD5(rel_slug)=%s'],
-                        params=[self.request.POST.get('detail')]
+                        user=user,
+                        rel_status=True,
+                        rel_slug_hash=self.request.POST.get('detail')
                     ).values(
                         'rel_entry_date',
                         'rel_gen_status',
@@ -44,15 +44,15 @@ class JsView(View):
                         'rel_description',
                         'subcategory__category',
                         'subcategory__sub_name',
-                        'subcategory__sub_slug',
+                        'subcategory__sub_slug_hash',
                         'subcategory__category__cat_name',
                         'subcategory__category__cat_type',
-                        'subcategory__category__cat_slug',
+                        'subcategory__category__cat_slug_hash',
                         'beneficiary__ben_name',
-                        'beneficiary__ben_slug',
+                        'beneficiary__ben_slug_hash',
                         'beneficiary__beneficiary_category__cat_description',
                         'client__cli_name',
-                        'client__cli_slug',
+                        'client__cli_slug_hash',
                         'client__cli_city',
                         'client__cli_email',
                         'client__cli_phone',
@@ -60,23 +60,22 @@ class JsView(View):
                         'client__country__cou_name',
                         'client__country__cou_image',
                         'client__state__sta_name',
-                        'financial_cost_center__fin_slug',
+                        'financial_cost_center__fin_slug_hash',
                         'financial_cost_center__fin_cost_center',
                         'financial_cost_center__fin_description',
-                        'financial_account__fin_slug',
+                        'financial_account__fin_slug_hash',
                         'financial_account__fin_bank_name',
                         'financial_account__fin_bank_branch',
                         'financial_account__fin_bank_account',
-                    )[0]
+                    ).first()
 
-                    subcategories = SubCategory.objects.filter(
-                        category=detail.get('subcategory__category'),
-                        sub_status=True,
-                    ).order_by(
-                        'sub_name'
-                    ).values(
-                        name=F('sub_name'),
-                        slug=Func(F('sub_slug'), function='MD5')
+                    if not detail:
+                        return HttpResponseNotFound()
+
+                    # sibling subcategories come from the shared cache
+                    subcategories = subcategory_options(
+                        user=user,
+                        category=detail.get('subcategory__category')
                     )
 
                     data = {
@@ -88,22 +87,22 @@ class JsView(View):
                         },
                         'subcategory': {
                             'name': detail.get('subcategory__sub_name'),
-                            'value': hash_gen(detail.get('subcategory__sub_slug')),  # noqa: E501
+                            'value': detail.get('subcategory__sub_slug_hash'),
                             'list': list(subcategories),
                             'category_name': detail.get('subcategory__category__cat_name'),  # noqa: E501
                             'category_type': detail.get('subcategory__category__cat_type'),  # noqa: E501
-                            'category_value': hash_gen(str(detail.get('subcategory__category__cat_slug'))),  # noqa: E501
+                            'category_value': detail.get('subcategory__category__cat_slug_hash'),  # noqa: E501
                         },
                         'beneficiary': {
                             'name': detail.get('beneficiary__ben_name'),
-                            'value': hash_gen(detail.get('beneficiary__ben_slug')),  # noqa: E501
+                            'value': detail.get('beneficiary__ben_slug_hash'),
                             'category': detail.get('beneficiary__beneficiary_category__cat_description'),  # noqa: E501
                         },
                         'financial_account': {
                             'bank': detail.get('financial_account__fin_bank_name'),  # noqa: E501
                             'branch': detail.get('financial_account__fin_bank_branch'),  # noqa: E501
                             'account': detail.get('financial_account__fin_bank_account'),  # noqa: E501
-                            'value': hash_gen(detail.get('financial_account__fin_slug')),  # noqa: E501
+                            'value': detail.get('financial_account__fin_slug_hash'),  # noqa: E501
                         },
                         'client': {},
                         'financial_cost_center': {}
@@ -111,7 +110,7 @@ class JsView(View):
 
                     if detail.get('client__cli_name'):
                         data['client']['name'] = detail.get('client__cli_name')
-                        data['client']['value'] = hash_gen(detail.get('client__cli_slug'))  # noqa: E501
+                        data['client']['value'] = detail.get('client__cli_slug_hash')  # noqa: E501
                         data['client']['city'] = detail.get('client__cli_city')
                         data['client']['email'] = detail.get('client__cli_email')  # noqa: E501
                         data['client']['phone'] = detail.get('client__cli_phone')  # noqa: E501
@@ -123,7 +122,59 @@ class JsView(View):
                     if detail.get('financial_cost_center__fin_cost_center'):
                         data['financial_cost_center']['name'] = detail.get('financial_cost_center__fin_cost_center')  # noqa: E501
                         data['financial_cost_center']['description'] = detail.get('financial_cost_center__fin_description')  # noqa: E501
-                        data['financial_cost_center']['value'] = hash_gen(detail.get('financial_cost_center__fin_slug'))  # noqa: E501
+                        data['financial_cost_center']['value'] = detail.get('financial_cost_center__fin_slug_hash')  # noqa: E501
+
+                    return HttpResponse(
+                        json.dumps(data, cls=DjangoJSONEncoder)
+                    )
+                case '/board/rollup/js/':
+                    # breakdown chart of a month, read from the rollups
+                    dimension = self.request.POST.get('dimension')
+                    if dimension not in DIMENSIONS:
+                        dimension = 'category'
+                    try:
+                        cycle = datetime.strptime(
+                            self.request.POST.get('month', ''), '%Y-%m'
+                        ).date()
+                    except ValueError:
+                        cycle = datetime.now().date().replace(day=1)
+
+                    data = breakdown(
+                        user=credentials(
+                            self.request.session['auth'], 'whoami'
+                        ),
+                        cycle=cycle,
+                        dimension=dimension
+                    )
+
+                    return HttpResponse(
+                        json.dumps(data, cls=DjangoJSONEncoder)
+                    )
+                case '/board/autocomplete/js/':
+                    # one page of dropdown options matching the typed words
+                    kind = self.request.POST.get('kind')
+                    if kind not in TYPEAHEAD:
+                        return HttpResponseNotFound()
+                    try:
+                        page = max(int(self.request.POST.get('page', 1)), 1)
+                    except ValueError:
+                        page = 1
+
+                    items, more = typeahead(
+                        user=credentials(
+                            self.request.session['auth'], 'whoami'
+                        ),
+                        kind=kind,
+                        query=self.request.POST.get('q', ''),
+                        page=page
+                    )
+                    data = {
+                        'results': [
+                            {'id': value, 'text': text}
+                            for value, text in items
+                        ],
+                        'pagination': {'more': more}
+                    }
 
                     return HttpResponse(
                         json.dumps(data, cls=DjangoJSONEncoder)
@@ -134,14 +185,12 @@ class JsView(View):
                     ).filter(
                         sub_status=True,
                         category__cat_status=True,
-                    ).extra(
-                        where=['MD5(cat_slug)=%s'],
-                        params=[self.request.POST.get('category')]
+                        category__cat_slug_hash=self.request.POST.get('category')  # noqa: E501
                     ).order_by(
                         'sub_name'
                     ).values(
                         subcategory=F('sub_name'),
-                        slug=Func(F('sub_slug'), function='MD5')
+                        slug=F('sub_slug_hash')
                     )
 
                     return HttpResponse(
@@ -152,9 +201,7 @@ class JsView(View):
                         'beneficiary_category'
                     ).filter(
                         ben_status=True,
-                    ).extra(
-                        where=['MD5(ben_slug)=%s'],
-                        params=[self.request.POST.get('detail')]
+                        ben_slug_hash=self.request.POST.get('detail')
                     ).values(
                         'ben_name',
                         'ben_date_created',
@@ -176,9 +223,7 @@ class JsView(View):
                     ).filter(
                         sub_status=True,
                         category__cat_status=True,
-                    ).extra(
-                        where=['MD5(sub_slug)=%s'],
-                        params=[self.request.POST.get('detail')]
+                        sub_slug_hash=self.request.POST.get('detail')
                     ).values(
                         'sub_name',
                         'sub_date_created',
@@ -203,9 +248,7 @@ class JsView(View):
                             'whoami'
                         ),
                         cat_status=True,
-                    ).extra(
-                        where=['MD5(cat_slug)=%s'],
-                        params=[self.request.POST.get('name')]
+                        cat_slug_hash=self.request.POST.get('name')
                     ).values('cat_type')
 
                     if name:
@@ -217,16 +260,9 @@ class JsView(View):
                         json.dumps(data, cls=DjangoJSONEncoder)
                     )
                 case '/board/labels/clients/js/':
-                    client = Client.objects.select_related(
-                        'country',
-                        'state'
-                    ).filter(
+                    client = Client.objects.filter(
                         cli_status=True,
-                        country__cou_status=True,
-                        state__sta_status=True,
-                    ).extra(
-                        where=['MD5(cli_slug)=%s'],
-                        params=[self.request.POST.get('detail')]
+                        cli_slug_hash=self.request.POST.get('detail')
                     ).values(
                         'cli_name',
                         'cli_city',
@@ -234,26 +270,19 @@ class JsView(View):
                         'cli_phone',
                         'cli_responsible',
                         'cli_date_created',
-                        'country__id',
-                        'country__cou_name',
-                        'country__cou_image',
-                        'state__id',
-                        'state__sta_name'
-                    )[0]
+                        'country_id',
+                        'state_id'
+                    ).first()
 
-                    states = State.objects.select_related(
-                        'country'
-                    ).filter(
-                        country=client.get('country__id'),
-                        sta_status=True,
-                        country__cou_status=True,
-                    ).order_by(
-                        'sta_name'
-                    ).values(
-                        'id',
-                        state=F('sta_name'),
-                        region=F('country__cou_name')
-                    )
+                    if not client:
+                        return HttpResponseNotFound()
+
+                    # country and states come from the in-memory registry
+                    registry = regions()
+                    country = registry.country(client.get('country_id'))
+                    state = registry.states_by_id.get(client.get('state_id'))
+                    if not country or not state:
+                        return HttpResponseNotFound()
 
                     data = {
                         'register_date': client.get('cli_date_created'),
@@ -262,43 +291,33 @@ class JsView(View):
                         'email': client.get('cli_email'),
                         'phone': client.get('cli_phone'),
                         'responsible': client.get('cli_responsible'),
-                        'region': client.get('country__cou_name'),
-                        'region_val': hash_gen(str(client.get('country__id'))),
-                        'flag': client.get('country__cou_image'),
-                        'state': client.get('state__sta_name'),
-                        'state_list': list(states),
-                        'state_val': client.get('state__id')
+                        'region': country['cou_name'],
+                        'region_val': country['hash'],
+                        'flag': country['cou_image'],
+                        'state': state['state'],
+                        'state_list': [
+                            dict(row) for row in registry.states(country['id'])
+                        ],
+                        'state_val': state['id']
                     }
 
                     return HttpResponse(
                         json.dumps(data, cls=DjangoJSONEncoder)
                     )
                 case '/board/labels/clients/form/js/':
-                    data = State.objects.select_related(
-                        'country'
-                    ).filter(
-                        sta_status=True,
-                        country__cou_status=True,
-                    ).extra(
-                        where=['MD5(country_id)=%s'],
-                        params=[self.request.POST.get('country')]
-                    ).order_by(
-                        'sta_name'
-                    ).values(
-                        'id',
-                        state=F('sta_name'),
-                        region=F('country__cou_name')
-                    )
+                    data = [
+                        dict(row) for row in regions().states(
+                            self.request.POST.get('country')
+                        )
+                    ]
 
                     return HttpResponse(
-                        json.dumps(list(data), cls=DjangoJSONEncoder)
+                        json.dumps(data, cls=DjangoJSONEncoder)
                     )
                 case '/board/labels/financial/js/':
                     detail = Financial.objects.filter(
                         fin_status=True,
-                    ).extra(
-                        where=['MD5(fin_slug)=%s'],
-                        params=[self.request.POST.get('detail')]
+                        fin_slug_hash=self.request.POST.get('detail')
                     ).values(
                         'fin_cost_center',
                         'fin_description',
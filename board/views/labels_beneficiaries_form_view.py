@@ -33,7 +33,7 @@ class LabelsBeneficiariesFormView(View):
         ).values(
             'user_id',
             'cat_description',
-            'cat_slug'
+            'cat_slug_hash'
         )
 
         # set initial context
@@ -74,10 +74,8 @@ class LabelsBeneficiariesFormView(View):
                                 Q(user=request_form.get('user')) |
                                 Q(user__isnull=True)
                             ),
-                            cat_status=True
-                        ).extra(
-                            where=['MD5(cat_slug)=%s'],
-                            params=[request_form.get('cat_description')]
+                            cat_status=True,
+                            cat_slug_hash=request_form.get('cat_description')
                         ).values('id')[0]
                         new = False
                         request_form['beneficiary_category'] = data.get('id')
@@ -137,10 +135,8 @@ class LabelsBeneficiariesFormView(View):
                 # get existing beneficiary type from database
                 data = BeneficiaryCategory.objects.filter(
                     user=credentials(self.request.session['auth'], 'whoami'),
-                    cat_status=True
-                ).extra(
-                    where=['MD5(cat_slug)=%s'],
-                    params=[self.request.POST.get('description')]
+                    cat_status=True,
+                    cat_slug_hash=self.request.POST.get('description')
                 )[0]
 
                 # updating all beneficiaries attached to this type
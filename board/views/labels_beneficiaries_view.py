@@ -5,17 +5,19 @@ from datetime import datetime
 from board.forms.beneficiary_category_form import (BeneficiaryCategoryForm,
                                                    BeneficiaryForm)
 from board.models import Beneficiary, BeneficiaryCategory
+from board.search import matches
 from django.db.models import Q
 from django.shortcuts import redirect, render
 from django.views import View
 from library.utils.auth import credentials
 from library.utils.decorators import auth_check
-from library.utils.helper import paginator
+from library.utils.helper import keyset_paginator, paginator
 from library.utils.logs import userlog
 from library.utils.output_handle import general_valid_output
 from slugify import slugify
 
 PG_LIMIT = int(os.getenv('PG_LIMIT', 25))
+PG_KEYSET = os.getenv('PG_KEYSET', '0') == '1'
 
 
 class LabelsBeneficiariesView(View):
@@ -41,25 +43,52 @@ class LabelsBeneficiariesView(View):
             'beneficiary_category__cat_description',
             'ben_name'
         ).values(
-            'ben_slug',
+            'id',
+            'ben_slug_hash',
             'ben_name',
             'ben_date_created',
             'beneficiary_category__cat_description',
-            'beneficiary_category__cat_slug'
+            'beneficiary_category__cat_slug_hash'
         )
 
         # Appling type filter, if applicable
         if self.request.GET.get('type'):
-            beneficiaries_all = beneficiaries_all.extra(
-                where=['MD5(cat_slug)=%s'],
-                params=[self.request.GET.get('type')]
+            beneficiaries_all = beneficiaries_all.filter(
+                beneficiary_category__cat_slug_hash=self.request.GET.get('type')  # noqa: E501
             )
 
-        # Separate rows for exposure
-        beneficiaries = beneficiaries_all[pg_offset:(pg_offset+PG_LIMIT)]
+        # Narrowing to the search index candidates, if applicable
+        if self.request.GET.get('search'):
+            beneficiaries_all = beneficiaries_all.filter(id__in=matches(
+                user=credentials(self.request.session['auth'], 'whoami'),
+                kind='beneficiary',
+                query=self.request.GET.get('search')
+            ))
+
+        # Separate rows for exposure, seeking by cursor in keyset mode
+        if PG_KEYSET:
+            pages = keyset_paginator(
+                beneficiaries_all,
+                keys=[
+                    'beneficiary_category__cat_description',
+                    'ben_name',
+                    'id'
+                ],
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+                limit=PG_LIMIT
+            )
+            beneficiaries = pages.pop('rows')
+        else:
+            beneficiaries = beneficiaries_all[pg_offset:(pg_offset+PG_LIMIT)]
 
-        # Counting total pages
-        total_pages = math.ceil(beneficiaries_all.count()/PG_LIMIT)
+            # Counting total pages and setting page range
+            total_pages = math.ceil(beneficiaries_all.count()/PG_LIMIT)
+            pages = {
+                'pg': pg,
+                'total_pg': total_pages,
+                'pg_range': paginator(pg, total_pages)
+            }
 
         # Select filter types
         types = BeneficiaryCategory.objects.filter(
@@ -71,13 +100,10 @@ class LabelsBeneficiariesView(View):
         ).order_by(
             'cat_description'
         ).values(
-            'cat_slug',
+            'cat_slug_hash',
             'cat_description'
         )
 
-        # Set page range
-        pg_range = paginator(pg, total_pages)
-
         # set initial context
         context = {
             'types': types,
@@ -86,11 +112,7 @@ class LabelsBeneficiariesView(View):
                 'type': self.request.GET.get('type', ''),
                 'search': self.request.GET.get('search', '')
             },
-            'pages': {
-                'pg': pg,
-                'total_pg': total_pages,
-                'pg_range': pg_range
-            }
+            'pages': pages
         }
 
         # set messages, if applicable
@@ -148,10 +170,8 @@ class LabelsBeneficiariesView(View):
                 else:
                     data = Beneficiary.objects.filter(
                         user=request_form.get('user'),
-                        ben_status=True
-                    ).extra(
-                        where=['MD5(ben_slug)=%s'],
-                        params=[request_form.get('edit_beneficiary')]
+                        ben_status=True,
+                        ben_slug_hash=request_form.get('edit_beneficiary')
                     ).values('beneficiary_category_id')[0]
                     request_form['beneficiary_category'] = data.get('beneficiary_category_id')  # noqa: E501
 
@@ -161,10 +181,8 @@ class LabelsBeneficiariesView(View):
 
                     # get existing beneficiary from database
                     data = Beneficiary.objects.filter(
-                        ben_status=True
-                    ).extra(
-                        where=['MD5(ben_slug)=%s'],
-                        params=[form.data.get('edit_beneficiary')]
+                        ben_status=True,
+                        ben_slug_hash=form.data.get('edit_beneficiary')
                     )[0]
 
                     # updating data and saving
@@ -193,10 +211,8 @@ class LabelsBeneficiariesView(View):
             case '/board/labels/beneficiaries/delete/':
                 # get existing beneficiary from database
                 data = Beneficiary.objects.filter(
-                    ben_status=True
-                ).extra(
-                    where=['MD5(ben_slug)=%s'],
-                    params=[self.request.POST.get('del_beneficiary')]
+                    ben_status=True,
+                    ben_slug_hash=self.request.POST.get('del_beneficiary')
                 )[0]
 
                 # updating data and saving - for delete status = 0
@@ -26,7 +26,7 @@ class LabelsCategoriesFormView(View):
             'cat_name'
         ).values(
             'cat_name',
-            'cat_slug'
+            'cat_slug_hash'
         )
 
         # set initial context
@@ -87,10 +87,8 @@ class LabelsCategoriesFormView(View):
                 else:
                     data = Category.objects.filter(
                         user=request_form.get('user'),
-                        cat_status=True
-                    ).extra(
-                        where=['MD5(cat_slug)=%s'],
-                        params=[request_form.get('cat_name')]
+                        cat_status=True,
+                        cat_slug_hash=request_form.get('cat_name')
                     ).values('id')[0]
 
                     request_form['category'] = data.get('id')
@@ -136,10 +134,8 @@ class LabelsCategoriesFormView(View):
                 # get existing beneficiary type from database
                 data = Category.objects.filter(
                     user=credentials(self.request.session['auth'], 'whoami'),
-                    cat_status=True
-                ).extra(
-                    where=['MD5(cat_slug)=%s'],
-                    params=[self.request.POST.get('name')]
+                    cat_status=True,
+                    cat_slug_hash=self.request.POST.get('name')
                 )[0]
 
                 # updating all subcategories attached to this category
@@ -4,16 +4,19 @@ from datetime import datetime
 
 from board.forms.category_form import CategoryForm, SubCategoryForm
 from board.models import Category, SubCategory
+from board.search import matches
+from django.db.models import F
 from django.shortcuts import redirect, render
 from django.views import View
 from library.utils.auth import credentials
 from library.utils.decorators import auth_check
-from library.utils.helper import paginator
+from library.utils.helper import keyset_paginator, paginator
 from library.utils.logs import userlog
 from library.utils.output_handle import general_valid_output
 from slugify import slugify
 
 PG_LIMIT = int(os.getenv('PG_LIMIT', 25))
+PG_KEYSET = os.getenv('PG_KEYSET', '0') == '1'
 
 
 class LabelsCategoriesView(View):
@@ -37,13 +40,19 @@ class LabelsCategoriesView(View):
         ).order_by(
             'cat_name',
             'subcategory__sub_name'
+        ).annotate(
+            # aliases keep keyset filters on the same subcategory join
+            sub_name=F('subcategory__sub_name'),
+            sub_id=F('subcategory__id')
         ).values(
+            'sub_name',
+            'sub_id',
             'cat_name',
-            'cat_slug',
+            'cat_slug_hash',
             'cat_type',
             'cat_date_created',
             'subcategory__sub_name',
-            'subcategory__sub_slug',
+            'subcategory__sub_slug_hash',
             'subcategory__sub_date_created'
         )
 
@@ -54,16 +63,38 @@ class LabelsCategoriesView(View):
             )
 
         if self.request.GET.get('label'):
-            categories_all = categories_all.extra(
-                where=['MD5(cat_slug)=%s'],
-                params=[self.request.GET.get('label')]
+            categories_all = categories_all.filter(
+                cat_slug_hash=self.request.GET.get('label')
             )
 
-        # Separate rows for exposure
-        categories = categories_all[pg_offset:(pg_offset+PG_LIMIT)]
+        # Narrowing to the search index candidates, if applicable
+        if self.request.GET.get('search'):
+            categories_all = categories_all.filter(sub_id__in=matches(
+                user=credentials(self.request.session['auth'], 'whoami'),
+                kind='subcategory',
+                query=self.request.GET.get('search')
+            ))
+
+        # Separate rows for exposure, seeking by cursor in keyset mode
+        if PG_KEYSET:
+            pages = keyset_paginator(
+                categories_all,
+                keys=['cat_name', 'sub_name', 'sub_id'],
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+                limit=PG_LIMIT
+            )
+            categories = pages.pop('rows')
+        else:
+            categories = categories_all[pg_offset:(pg_offset+PG_LIMIT)]
 
-        # Counting total pages
-        total_pages = math.ceil(categories_all.count()/PG_LIMIT)
+            # Counting total pages and setting page range
+            total_pages = math.ceil(categories_all.count()/PG_LIMIT)
+            pages = {
+                'pg': pg,
+                'total_pg': total_pages,
+                'pg_range': paginator(pg, total_pages)
+            }
 
         # Select filter types
         labels = Category.objects.filter(
@@ -72,13 +103,10 @@ class LabelsCategoriesView(View):
         ).order_by(
             'cat_name'
         ).values(
-            'cat_slug',
+            'cat_slug_hash',
             'cat_name'
         )
 
-        # Set page range
-        pg_range = paginator(pg, total_pages)
-
         # set initial context
         context = {
             'labels': labels,
@@ -88,11 +116,7 @@ class LabelsCategoriesView(View):
                 'search': self.request.GET.get('search', ''),
                 'label': self.request.GET.get('label', '')
             },
-            'pages': {
-                'pg': pg,
-                'total_pg': total_pages,
-                'pg_range': pg_range
-            }
+            'pages': pages
         }
 
         # set messages, if applicable
@@ -132,9 +156,7 @@ class LabelsCategoriesView(View):
                             user_id=request_form.get('user'),
                             cat_status=True,
                             subcategory__sub_status=True,
-                        ).extra(
-                            where=['MD5(sub_slug)=%s'],
-                            params=[request_form.get('edit_category')]
+                            subcategory__sub_slug_hash=request_form.get('edit_category')  # noqa: E501
                         )[0]
 
                         # updating data and saving
@@ -155,10 +177,8 @@ class LabelsCategoriesView(View):
                         return redirect('board:labels_categories')
                 else:
                     data = SubCategory.objects.filter(
-                        sub_status=True
-                    ).extra(
-                        where=['MD5(sub_slug)=%s'],
-                        params=[request_form.get('edit_category')]
+                        sub_status=True,
+                        sub_slug_hash=request_form.get('edit_category')
                     ).values('category_id')[0]
                     request_form['category'] = data.get('category_id')
 
@@ -168,10 +188,8 @@ class LabelsCategoriesView(View):
                 if form.is_valid():
                     # get existing subcategory from database
                     data = SubCategory.objects.filter(
-                        sub_status=True
-                    ).extra(
-                        where=['MD5(sub_slug)=%s'],
-                        params=[form.data.get('edit_category')]
+                        sub_status=True,
+                        sub_slug_hash=form.data.get('edit_category')
                     )[0]
 
                     # updating data and saving
@@ -200,10 +218,8 @@ class LabelsCategoriesView(View):
             case '/board/labels/categories/delete/':
                 # get existing beneficiary from database
                 data = SubCategory.objects.filter(
-                    sub_status=True
-                ).extra(
-                    where=['MD5(sub_slug)=%s'],
-                    params=[self.request.POST.get('del_subcategory')]
+                    sub_status=True,
+                    sub_slug_hash=self.request.POST.get('del_subcategory')
                 )[0]
 
                 # updating data and saving - for delete status = 0
@@ -1,5 +1,5 @@
 from board.forms.client_form import ClientForm
-from board.models import Country
+from board.regions import regions
 from django.shortcuts import redirect, render
 from django.views import View
 from library.utils.auth import credentials
@@ -18,14 +18,7 @@ class LabelsClientsFormView(View):
     @auth_check
     def get(self, *args, **kwargs):
         # dropdown menu type
-        countries = Country.objects.filter(
-            cou_status=True
-        ).order_by(
-            'cou_name'
-        ).values(
-            'id',
-            'cou_name',
-        )
+        countries = regions().countries
 
         # set initial context
         context = {
@@ -58,14 +51,8 @@ class LabelsClientsFormView(View):
         request_form['cli_phone'] = self.request.POST.get('phone')
         request_form['cli_responsible'] = self.request.POST.get('responsible')
 
-        country = Country.objects.filter(
-            cou_status=True
-        ).extra(
-            where=['MD5(id)=%s'],
-            params=[self.request.POST.get('country')]
-        ).values('id')[0]
-
-        request_form['country'] = country.get('id')
+        country = regions().country(self.request.POST.get('country'))
+        request_form['country'] = country['id'] if country else None
 
         form = ClientForm(request_form)
 
@@ -3,17 +3,20 @@ import os
 from datetime import datetime
 
 from board.forms.client_form import ClientForm
-from board.models import Client, Country
+from board.models import Client
+from board.regions import regions
+from board.search import matches
 from django.shortcuts import redirect, render
 from django.views import View
 from library.utils.auth import credentials
 from library.utils.decorators import auth_check
-from library.utils.helper import paginator
+from library.utils.helper import keyset_paginator, paginator
 from library.utils.logs import userlog
 from library.utils.output_handle import general_valid_output
 from slugify import slugify
 
 PG_LIMIT = int(os.getenv('PG_LIMIT', 25))
+PG_KEYSET = os.getenv('PG_KEYSET', '0') == '1'
 
 
 class LabelsClientsView(View):
@@ -43,8 +46,9 @@ class LabelsClientsView(View):
             'state__sta_name',
             'cli_name',
         ).values(
+            'id',
             'cli_name',
-            'cli_slug',
+            'cli_slug_hash',
             'cli_date_created',
             'country__cou_name',
             'country__cou_image',
@@ -53,30 +57,56 @@ class LabelsClientsView(View):
 
         # Appling country filters, if applicable
         if self.request.GET.get('country'):
-            clients_all = clients_all.extra(
-                where=['MD5(board_client.country_id)=%s'],
-                params=[self.request.GET.get('country')]
+            country = regions().country(self.request.GET.get('country'))
+            clients_all = clients_all.filter(
+                country_id=country['id'] if country else None
             )
 
-        # Separate rows for exposure
-        clients = clients_all[pg_offset:(pg_offset+PG_LIMIT)]
-
-        # Counting total pages
-        total_pages = math.ceil(clients_all.count()/PG_LIMIT)
+        # Narrowing to the search index candidates, if applicable
+        if self.request.GET.get('search'):
+            clients_all = clients_all.filter(id__in=matches(
+                user=credentials(self.request.session['auth'], 'whoami'),
+                kind='client',
+                query=self.request.GET.get('search')
+            ))
+
+        # Separate rows for exposure, seeking by cursor in keyset mode
+        if PG_KEYSET:
+            pages = keyset_paginator(
+                clients_all,
+                keys=[
+                    'country__cou_name',
+                    'state__sta_name',
+                    'cli_name',
+                    'id'
+                ],
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+                limit=PG_LIMIT
+            )
+            clients = pages.pop('rows')
+        else:
+            clients = clients_all[pg_offset:(pg_offset+PG_LIMIT)]
 
-        # Select filter types
-        countries = Country.objects.filter(
-            cou_status=True,
-            client__cli_status=True
-        ).order_by(
-            'cou_name'
-        ).values(
-            'id',
-            'cou_name'
-        ).distinct()
+            # Counting total pages and setting page range
+            total_pages = math.ceil(clients_all.count()/PG_LIMIT)
+            pages = {
+                'pg': pg,
+                'total_pg': total_pages,
+                'pg_range': paginator(pg, total_pages)
+            }
 
-        # Set page range
-        pg_range = paginator(pg, total_pages)
+        # Select filter types, names come from the in-memory registry
+        used = set(Client.objects.filter(
+            user=credentials(self.request.session['auth'], 'whoami'),
+            cli_status=True
+        ).values_list(
+            'country_id', flat=True
+        ).distinct())
+        countries = [
+            country for country in regions().countries
+            if country['id'] in used
+        ]
 
         # set initial context
         context = {
@@ -86,11 +116,7 @@ class LabelsClientsView(View):
                 'country': self.request.GET.get('country', ''),
                 'search': self.request.GET.get('search', '')
             },
-            'pages': {
-                'pg': pg,
-                'total_pg': total_pages,
-                'pg_range': pg_range
-            }
+            'pages': pages
         }
 
         # set messages, if applicable
@@ -122,24 +148,16 @@ class LabelsClientsView(View):
                 request_form['cli_responsible'] = self.request.POST.get('responsible')  # noqa: E501
                 request_form['edit_client'] = self.request.POST.get('edit_client')  # noqa: E501
 
-                country = Country.objects.filter(
-                    cou_status=True
-                ).extra(
-                    where=['MD5(id)=%s'],
-                    params=[self.request.POST.get('country')]
-                ).values('id')[0]
-
-                request_form['country'] = country.get('id')
+                country = regions().country(self.request.POST.get('country'))
+                request_form['country'] = country['id'] if country else None
 
                 form = ClientForm(request_form)
 
                 if form.is_valid():
                     # get existing subcategory from database
                     data = Client.objects.filter(
-                        cli_status=True
-                    ).extra(
-                        where=['MD5(cli_slug)=%s'],
-                        params=[form.data.get('edit_client')]
+                        cli_status=True,
+                        cli_slug_hash=form.data.get('edit_client')
                     )[0]
 
                     # updating data and saving
@@ -186,10 +204,8 @@ class LabelsClientsView(View):
             case '/board/labels/clients/delete/':
                 # get existing client from database
                 data = Client.objects.filter(
-                    cli_status=True
-                ).extra(
-                    where=['MD5(cli_slug)=%s'],
-                    params=[self.request.POST.get('del_client')]
+                    cli_status=True,
+                    cli_slug_hash=self.request.POST.get('del_client')
                 )[0]
 
                 # updating data and saving - for delete status = 0
@@ -4,17 +4,19 @@ from datetime import datetime
 
 from board.forms.financial_form import FinancialForm
 from board.models import Financial
+from board.search import matches
 from django.db.models import Q
 from django.shortcuts import redirect, render
 from django.views import View
 from library.utils.auth import credentials
 from library.utils.decorators import auth_check
-from library.utils.helper import paginator
+from library.utils.helper import keyset_paginator, paginator
 from library.utils.logs import userlog
 from library.utils.output_handle import general_valid_output
 from slugify import slugify
 
 PG_LIMIT = int(os.getenv('PG_LIMIT', 25))
+PG_KEYSET = os.getenv('PG_KEYSET', '0') == '1'
 
 
 class LabelsFinancialView(View):
@@ -46,7 +48,8 @@ class LabelsFinancialView(View):
             'fin_bank_branch',
             'fin_bank_account',
         ).values(
-            'fin_slug',
+            'id',
+            'fin_slug_hash',
             'fin_cost_center',
             'fin_description',
             'fin_bank_name',
@@ -62,14 +65,42 @@ class LabelsFinancialView(View):
                 fin_type=self.request.GET.get('type')
             )
 
-        # Separate rows for exposure
-        financial = financial_all[pg_offset:(pg_offset+PG_LIMIT)]
-
-        # Counting total pages
-        total_pages = math.ceil(financial_all.count()/PG_LIMIT)
+        # Narrowing to the search index candidates, if applicable
+        if self.request.GET.get('search'):
+            financial_all = financial_all.filter(id__in=matches(
+                user=credentials(self.request.session['auth'], 'whoami'),
+                kind='financial',
+                query=self.request.GET.get('search')
+            ))
+
+        # Separate rows for exposure, seeking by cursor in keyset mode
+        if PG_KEYSET:
+            pages = keyset_paginator(
+                financial_all,
+                keys=[
+                    '-fin_type',
+                    'fin_cost_center',
+                    'fin_description',
+                    'fin_bank_name',
+                    'fin_bank_branch',
+                    'fin_bank_account',
+                    'id'
+                ],
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+                limit=PG_LIMIT
+            )
+            financial = pages.pop('rows')
+        else:
+            financial = financial_all[pg_offset:(pg_offset+PG_LIMIT)]
 
-        # Set page range
-        pg_range = paginator(pg, total_pages)
+            # Counting total pages and setting page range
+            total_pages = math.ceil(financial_all.count()/PG_LIMIT)
+            pages = {
+                'pg': pg,
+                'total_pg': total_pages,
+                'pg_range': paginator(pg, total_pages)
+            }
 
         # set initial context
         context = {
@@ -78,11 +109,7 @@ class LabelsFinancialView(View):
                 'type': self.request.GET.get('type', ''),
                 'search': self.request.GET.get('search', '')
             },
-            'pages': {
-                'pg': pg,
-                'total_pg': total_pages,
-                'pg_range': pg_range
-            }
+            'pages': pages
         }
 
         # set messages, if applicable
@@ -115,10 +142,8 @@ class LabelsFinancialView(View):
 
                 # get existing financial label from database
                 data = Financial.objects.filter(
-                    fin_status=True
-                ).extra(
-                    where=['MD5(fin_slug)=%s'],
-                    params=[request_form.get('edit_financial')]
+                    fin_status=True,
+                    fin_slug_hash=request_form.get('edit_financial')
                 )[0]
 
                 request_form['fin_type'] = data.fin_type
@@ -187,10 +212,8 @@ class LabelsFinancialView(View):
             case '/board/labels/financial/delete/':
                 # get existing client from database
                 data = Financial.objects.filter(
-                    fin_status=True
-                ).extra(
-                    where=['MD5(fin_slug)=%s'],
-                    params=[self.request.POST.get('del_financial')]
+                    fin_status=True,
+                    fin_slug_hash=self.request.POST.get('del_financial')
                 )[0]
 
                 # updating data and saving - for delete status = 0
@@ -0,0 +1,101 @@
+import json
+from datetime import date, datetime
+from itertools import islice
+
+from board.ledger.forecast import (FORECAST_MAX_MONTHS, FORECAST_MONTHS,
+                                   forecast)
+from board.ledger.report import (GRANULARITIES, REPORT_MAX_POINTS, periods,
+                                 report)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseBadRequest
+from django.views import View
+from library.utils.auth import credentials
+from library.utils.decorators import auth_check
+from library.utils.logs import userlog
+
+
+class BoardReportView(View):
+    @auth_check
+    def dispatch(self, *args, **kwargs):
+        userlog(self.request)
+        return super().dispatch(self.request, *args, **kwargs)
+
+    @auth_check
+    def get(self, *args, **kwargs):
+        # date range (YYYY-MM-DD), both ends included, current year default
+        granularity = self.request.GET.get('granularity', 'month')
+        try:
+            start = datetime.strptime(
+                self.request.GET.get('from', f'{date.today():%Y}-01-01'),
+                '%Y-%m-%d'
+            ).date()
+            end = datetime.strptime(
+                self.request.GET.get('to', f'{date.today():%Y}-12-31'),
+                '%Y-%m-%d'
+            ).date()
+        except ValueError:
+            return _error('Invalid date, use the YYYY-MM-DD format.')
+
+        if granularity not in GRANULARITIES:
+            return _error(
+                f'Invalid granularity, use {", ".join(GRANULARITIES)}.'
+            )
+        if start > end:
+            return _error('The range start must not be after its end.')
+        # counting stops right past the limit, however long the range is
+        points = islice(
+            periods(start, end, granularity), REPORT_MAX_POINTS + 1
+        )
+        if sum(1 for _ in points) > REPORT_MAX_POINTS:
+            return _error('Range too long for this granularity.')
+
+        data = report(
+            user=credentials(self.request.session['auth'], 'whoami'),
+            start=start,
+            end=end,
+            granularity=granularity
+        )
+        data = {'granularity': granularity, 'from': start, 'to': end, **data}
+
+        return HttpResponse(
+            json.dumps(data, cls=DjangoJSONEncoder),
+            content_type='application/json'
+        )
+
+
+class BoardForecastView(View):
+    @auth_check
+    def dispatch(self, *args, **kwargs):
+        userlog(self.request)
+        return super().dispatch(self.request, *args, **kwargs)
+
+    @auth_check
+    def get(self, *args, **kwargs):
+        # projected daily balances for the next months
+        try:
+            months = int(self.request.GET.get('months', FORECAST_MONTHS))
+        except ValueError:
+            months = 0
+        if not 1 <= months <= FORECAST_MAX_MONTHS:
+            return _error(
+                f'Invalid months, use 1 to {FORECAST_MAX_MONTHS}.'
+            )
+
+        today = date.today()
+        data = forecast(
+            user=credentials(self.request.session['auth'], 'whoami'),
+            today=today,
+            months=months
+        )
+        data = {'from': today, 'months': months, **data}
+
+        return HttpResponse(
+            json.dumps(data, cls=DjangoJSONEncoder),
+            content_type='application/json'
+        )
+
+
+def _error(message):
+    return HttpResponseBadRequest(
+        json.dumps({'error': message}), content_type='application/json'
+    )
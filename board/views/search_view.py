@@ -0,0 +1,29 @@
+import json
+
+from board.search import search
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.views import View
+from library.utils.auth import credentials
+from library.utils.decorators import auth_check
+from library.utils.logs import userlog
+
+
+class BoardSearchView(View):
+    @auth_check
+    def dispatch(self, *args, **kwargs):
+        userlog(self.request)
+        return super().dispatch(self.request, *args, **kwargs)
+
+    @auth_check
+    def get(self, *args, **kwargs):
+        # labels and entries ranked together, best matches first
+        data = search(
+            user=credentials(self.request.session['auth'], 'whoami'),
+            query=self.request.GET.get('q', '')
+        )
+
+        return HttpResponse(
+            json.dumps(data, cls=DjangoJSONEncoder),
+            content_type='application/json'
+        )
@@ -0,0 +1,5 @@
+import os
+
+# the userlog worker writes through its own connection, outside the test
+# transactions, so records are saved on every put while testing
+os.environ['LOG_ASYNC'] = '0'
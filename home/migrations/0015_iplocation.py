@@ -0,0 +1,23 @@
+# Generated by Django 4.0.3 on 2026-10-18 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0014_alter_userlog_log_location_alter_userlog_log_method'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IpLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ipl_ip_address', models.CharField(max_length=64, unique=True)),
+                ('ipl_json', models.TextField()),
+                ('ipl_date_created', models.DateTimeField(editable=False)),
+                ('ipl_date_updated', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -69,3 +69,20 @@ class UserLog(models.Model):
     def save(self, *args, **kwargs):
         self.log_date_created = datetime.now()
         return super().save(*args, **kwargs)
+
+
+class IpLocation(models.Model):
+    ipl_ip_address = models.CharField(unique=True, max_length=64)
+    ipl_json = models.TextField()
+    ipl_date_created = models.DateTimeField(editable=False)
+    ipl_date_updated = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return self.ipl_ip_address
+
+    def save(self, *args, **kwargs):
+        ''' On save, update timestamps '''
+        if not self.id:
+            self.ipl_date_created = datetime.now()
+        self.ipl_date_updated = datetime.now()
+        return super().save(*args, **kwargs)
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import jwt
+import pytest
+from django.test import TestCase
+from django.urls import reverse
+from home.tests.test_home_helper import HomeHelperMixin
+from library.utils.auth import auth, credentials, decoded
+
+
+@pytest.mark.fast
+class TestHomeAuth(TestCase, HomeHelperMixin):
+    def setUp(self) -> None:
+        decoded.clear()
+        self.user = self.make_user(use_is_valid=True)
+        return super().setUp()
+
+    def login(self, minutes):
+        payload = {
+            'whoami': self.user.id,
+            'login': 'jane.doe@email.com',
+            'manager': False,
+            'iss': datetime.now().strftime('%s'),
+            'exp': (datetime.now() + timedelta(minutes=minutes)).strftime('%s')  # noqa: E501
+        }
+        session = self.client.session
+        session.update({
+            'auth': auth(payload)
+        })
+        session.save()
+        return session['auth']
+
+    # repeated credentials lookups decode the token only once
+    def test_auth_credentials_memoized(self):
+        token = self.login(minutes=30)
+        with patch('library.utils.auth.jwt.decode', wraps=jwt.decode) as decode:  # noqa: E501
+            for _ in range(10):
+                self.assertEqual(credentials(token, 'whoami'), self.user.id)
+                self.assertEqual(
+                    credentials(token, 'login'), 'jane.doe@email.com'
+                )
+        self.assertEqual(decode.call_count, 1)
+
+    # a fresh token is verified once per request and not re-issued
+    def test_auth_fresh_token_kept(self):
+        token = self.login(minutes=30)
+        with patch('library.utils.auth.jwt.decode', wraps=jwt.decode) as decode:  # noqa: E501
+            response = self.client.get(reverse('board:profile'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.session['auth'], token)
+        self.assertEqual(decode.call_count, 1)
+
+    # a token close to expiry is re-issued
+    def test_auth_expiring_token_renewed(self):
+        token = self.login(minutes=1)
+        response = self.client.get(reverse('board:profile'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(self.client.session['auth'], token)
+        self.assertGreater(
+            int(credentials(self.client.session['auth'], 'exp')),
+            int((datetime.now() + timedelta(minutes=29)).strftime('%s'))
+        )
@@ -18,3 +18,16 @@ class HomeHelperMixin:
             use_is_manager=use_is_manager,
             use_status=use_status
         )
+
+    def ipwhois_stub(self, ip_address):
+        # local replacement for the ipwhois.app API
+        return {
+            'ip': ip_address,
+            'type': 'IPv4',
+            'country': 'Brazil',
+            'country_flag': 'https://cdn.ipwhois.io/flags/br.svg',
+            'region': 'Sao Paulo',
+            'city': 'Sao Paulo',
+            'latitude': -23.5505199,
+            'longitude': -46.6333094
+        }
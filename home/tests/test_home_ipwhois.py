@@ -0,0 +1,101 @@
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+from django.test import TestCase
+from home.models import IpLocation
+from home.tests.test_home_helper import HomeHelperMixin
+from library.ipwhois import client
+from library.ipwhois.client import IpRanges, ipwhois
+
+
+@pytest.mark.fast
+class TestHomeIpWhois(TestCase, HomeHelperMixin):
+    def setUp(self) -> None:
+        client.memory.clear()
+        self.ip_address = '200.100.50.25'
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        client.memory.clear()
+        return super().tearDown()
+
+    def make_ranges_file(self):
+        file = tempfile.NamedTemporaryFile(
+            mode='w', suffix='.csv', delete=False
+        )
+        file.write(
+            'start,end,type,country,country_flag,region,city\n'
+            '200.100.0.0,200.100.255.255,IPv4,Brazil,br.svg,SP,Sao Paulo\n'
+            '8.8.8.0,8.8.8.255,IPv4,United States,us.svg,CA,Mountain View\n'
+            '2001:db8::,2001:db8::ffff,IPv6,Canada,ca.svg,ON,Toronto\n'
+        )
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    # repeated lookups for the same ip only reach the API once
+    @patch.object(client, 'IPWHOIS_OFFLINE', False)
+    @patch('library.ipwhois.client._remote')
+    def test_ipwhois_memory_cache(self, remote):
+        remote.side_effect = self.ipwhois_stub
+        for _ in range(3):
+            whois = ipwhois(self.ip_address)
+        self.assertEqual(remote.call_count, 1)
+        self.assertEqual(whois.get('country'), 'Brazil')
+
+    # the disk table answers after the memory cache is gone
+    @patch.object(client, 'IPWHOIS_OFFLINE', False)
+    @patch('library.ipwhois.client._remote')
+    def test_ipwhois_disk_cache(self, remote):
+        remote.side_effect = self.ipwhois_stub
+        ipwhois(self.ip_address)
+        client.memory.clear()
+        whois = ipwhois(self.ip_address)
+
+        self.assertEqual(remote.call_count, 1)
+        self.assertEqual(whois.get('city'), 'Sao Paulo')
+        location = IpLocation.objects.get(ipl_ip_address=self.ip_address)
+        self.assertEqual(json.loads(location.ipl_json), whois)
+
+    # failed lookups are neither kept in memory nor on disk
+    @patch.object(client, 'IPWHOIS_OFFLINE', False)
+    @patch('library.ipwhois.client._remote')
+    def test_ipwhois_failed_lookup(self, remote):
+        remote.return_value = {'success': False, 'message': 'invalid IP'}
+        ipwhois(self.ip_address)
+        whois = ipwhois(self.ip_address)
+
+        self.assertEqual(remote.call_count, 2)
+        self.assertFalse(whois.get('success'))
+        self.assertFalse(IpLocation.objects.exists())
+
+    # a stale disk entry is updated in place
+    def test_ipwhois_store_update(self):
+        client._store(self.ip_address, {'city': 'Campinas'})
+        client._store(self.ip_address, {'city': 'Sao Paulo'})
+        location = IpLocation.objects.get(ipl_ip_address=self.ip_address)
+        self.assertEqual(json.loads(location.ipl_json), {'city': 'Sao Paulo'})
+
+    # offline mode never reaches the API
+    @patch('library.ipwhois.client._remote')
+    def test_ipwhois_offline_mode(self, remote):
+        ranges = IpRanges.load(self.make_ranges_file())
+        with patch.object(client, 'IPWHOIS_OFFLINE', True), \
+             patch.object(client, '_ranges', ranges):
+            whois = ipwhois(self.ip_address)
+        self.assertEqual(remote.call_count, 0)
+        self.assertEqual(whois.get('country'), 'Brazil')
+        self.assertEqual(whois.get('ip'), self.ip_address)
+
+    # binary search over the range index
+    def test_ipwhois_ranges_find(self):
+        ranges = IpRanges.load(self.make_ranges_file())
+        self.assertEqual(len(ranges), 3)
+        self.assertEqual(ranges.find('8.8.8.8').get('city'), 'Mountain View')
+        self.assertEqual(ranges.find('2001:db8::1').get('country'), 'Canada')
+        self.assertEqual(ranges.find('8.8.9.1'), {})
+        self.assertEqual(ranges.find('1.1.1.1'), {})
+        self.assertEqual(ranges.find('invalid'), {})
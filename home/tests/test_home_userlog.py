@@ -0,0 +1,129 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from django.db import IntegrityError
+from django.test import TestCase
+from home.models import UserLog
+from home.tests.test_home_helper import HomeHelperMixin
+from library.utils.logs import UserLogPipeline
+
+
+@pytest.mark.fast
+class TestHomeUserLogPipeline(TestCase, HomeHelperMixin):
+    def setUp(self) -> None:
+        self.user = self.make_user()
+        self.pipeline = UserLogPipeline(
+            max_size=3, flush_size=2, run_async=False
+        )
+        return super().setUp()
+
+    def make_record(self, ip_address='200.100.50.25', **kwargs):
+        record = {
+            'user_id': self.user.id,
+            'log_user_agent': 'Mozilla/5.0',
+            'log_ip_address': ip_address,
+            'log_location': '/board/',
+            'log_method': 'GET',
+            'log_risk_level': 0,
+            'log_risk_comment': None,
+            'log_date_created': datetime.now()
+        }
+        record.update(kwargs)
+        return record
+
+    # records are enriched by the ipwhois stub and saved in bulk
+    @patch('library.utils.logs.ipwhois')
+    def test_userlog_pipeline_enrich_and_save(self, ipwhois):
+        ipwhois.side_effect = self.ipwhois_stub
+        self.pipeline.run_async = True  # keep records queued
+        self.pipeline._start = lambda: None
+        self.pipeline.put(self.make_record())
+        self.pipeline.put(self.make_record())
+        self.pipeline.put(self.make_record(ip_address='127.0.0.1'))
+
+        self.assertEqual(self.pipeline.flush(), 3)
+        self.assertEqual(ipwhois.call_count, 1)
+
+        log = UserLog.objects.filter(log_ip_address='200.100.50.25')[0]
+        self.assertEqual(log.user_id, self.user.id)
+        self.assertEqual(log.log_ip_country, 'Brazil')
+        self.assertEqual(log.log_ip_country_flag, 'br.svg')
+        self.assertIsNotNone(log.log_date_created)
+        self.assertEqual(self.pipeline.stats()['saved'], 3)
+
+    # synchronous mode writes on every put
+    @patch('library.utils.logs.ipwhois')
+    def test_userlog_pipeline_synchronous_mode(self, ipwhois):
+        ipwhois.side_effect = self.ipwhois_stub
+        self.pipeline.put(self.make_record())
+        self.assertEqual(UserLog.objects.count(), 1)
+        self.assertEqual(self.pipeline.stats()['pending'], 0)
+
+    # full queue drops records instead of blocking the request
+    def test_userlog_pipeline_backpressure(self):
+        self.pipeline.run_async = True
+        self.pipeline._start = lambda: None
+        for _ in range(5):
+            self.pipeline.put(self.make_record(ip_address='127.0.0.1'))
+        stats = self.pipeline.stats()
+        self.assertEqual(stats['queued'], 3)
+        self.assertEqual(stats['dropped'], 2)
+        self.assertEqual(stats['pending'], 3)
+
+    # invalid records are counted and skipped, the batch is still saved
+    @patch('library.utils.logs.ipwhois')
+    def test_userlog_pipeline_invalid_record(self, ipwhois):
+        ipwhois.side_effect = self.ipwhois_stub
+        self.pipeline.put(self.make_record(log_user_agent=None))
+        self.pipeline.put(self.make_record())
+        self.assertEqual(UserLog.objects.count(), 1)
+        self.assertEqual(self.pipeline.stats()['failed'], 1)
+
+    # a row failing its constraints is dropped alone, not the whole batch
+    def test_userlog_pipeline_integrity_error(self):
+        save = UserLog.save
+
+        def checked_save(log, *args, **kwargs):
+            if log.user_id is None:
+                raise IntegrityError('user')
+            return save(log, *args, **kwargs)
+
+        self.pipeline.run_async = True
+        self.pipeline._start = lambda: None
+        self.pipeline.put(self.make_record(ip_address='127.0.0.1'))
+        self.pipeline.put(self.make_record(
+            ip_address='127.0.0.1', user_id=None
+        ))
+        with patch.object(UserLog.objects, 'bulk_create') as bulk_create, \
+             patch.object(UserLog, 'save', checked_save), \
+             self.assertLogs('library.utils.logs', 'ERROR'):
+            bulk_create.side_effect = IntegrityError('user')
+            self.assertEqual(self.pipeline.flush(), 1)
+
+        self.assertEqual(UserLog.objects.count(), 1)
+        self.assertEqual(self.pipeline.stats()['failed'], 1)
+
+    # ipwhois failures never break logging
+    @patch('library.utils.logs.ipwhois')
+    def test_userlog_pipeline_ipwhois_error(self, ipwhois):
+        ipwhois.side_effect = Exception('timeout')
+        self.pipeline.put(self.make_record())
+        log = UserLog.objects.all()[0]
+        self.assertIsNone(log.log_ip_country)
+
+    # closing saves the records still queued
+    def test_userlog_pipeline_close(self):
+        self.pipeline.run_async = True
+        self.pipeline._start = lambda: None
+        for _ in range(3):
+            self.pipeline.put(self.make_record(ip_address='127.0.0.1'))
+        self.assertEqual(self.pipeline.close(), 3)
+        self.assertEqual(UserLog.objects.count(), 3)
+
+    # closing wakes a worker waiting on the empty queue
+    def test_userlog_pipeline_close_worker(self):
+        self.pipeline.flush_interval = 60
+        self.pipeline._start()
+        self.assertEqual(self.pipeline.close(timeout=5), 0)
+        self.assertFalse(self.pipeline._worker.is_alive())
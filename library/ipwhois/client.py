@@ -1,13 +1,121 @@
+import csv
+import ipaddress
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
 import requests
+from home.models import IpLocation
+from library.utils.cache import TTLCache
+
+IPWHOIS_URL = 'http://ipwhois.app/json/'
+IPWHOIS_TIMEOUT = float(os.getenv('IPWHOIS_TIMEOUT', 5))
+IPWHOIS_CACHE_SIZE = int(os.getenv('IPWHOIS_CACHE_SIZE', 4096))
+IPWHOIS_CACHE_TTL = int(os.getenv('IPWHOIS_CACHE_TTL', 86400))
+IPWHOIS_OFFLINE = os.getenv('IPWHOIS_OFFLINE', '0') == '1'
+IPWHOIS_RANGES = os.getenv('IPWHOIS_RANGES', '')
+
+memory = TTLCache(max_size=IPWHOIS_CACHE_SIZE, ttl=IPWHOIS_CACHE_TTL)
 
 
 def ipwhois(ip_address):
-    curlopt_url = 'http://ipwhois.app/json/' + ip_address
+    # memory -> offline ranges or disk table -> remote API
+    whois = memory.get(ip_address)
+    if whois is None:
+        if IPWHOIS_OFFLINE:
+            whois = ranges().find(ip_address)
+        else:
+            whois = _stored(ip_address)
+            if whois is None:
+                whois = _remote(ip_address)
+                if whois.get('success') is False:
+                    # failed lookups are not cached, the next one retries
+                    return whois
+                _store(ip_address, whois)
+        memory.set(ip_address, whois)
+    return whois
 
+
+def _remote(ip_address):
     response = requests.request(
         method='GET',
-        url=curlopt_url,
+        url=IPWHOIS_URL + ip_address,
         data={},
-        timeout=12000
+        timeout=IPWHOIS_TIMEOUT
     )
     return response.json()
+
+
+def _stored(ip_address):
+    location = IpLocation.objects.filter(
+        ipl_ip_address=ip_address,
+        ipl_date_updated__gte=datetime.now() - timedelta(
+            seconds=IPWHOIS_CACHE_TTL
+        )
+    ).values('ipl_json').first()
+
+    if location:
+        return json.loads(location.get('ipl_json'))
+
+
+def _store(ip_address, whois):
+    # concurrent first lookups of an ip race on its unique column
+    IpLocation.objects.update_or_create(
+        ipl_ip_address=ip_address,
+        defaults={'ipl_json': json.dumps(whois)}
+    )
+
+
+class IpRanges:
+    # sorted, non-overlapping ranges searched with bisect over array indexes
+    def __init__(self, rows=()):
+        self.index = {4: (array('L'), array('L'), []),
+                      6: ([], [], [])}
+        rows = sorted(rows, key=lambda row: (row[0].version, int(row[0])))
+        for start, end, whois in rows:
+            starts, ends, values = self.index[start.version]
+            starts.append(int(start))
+            ends.append(int(end))
+            values.append(whois)
+
+    @classmethod
+    def load(cls, path):
+        # csv header: start,end,type,country,country_flag,region,city,...
+        rows = []
+        if path and os.path.exists(path):
+            with open(path, newline='') as file:
+                for row in csv.DictReader(file):
+                    start = ipaddress.ip_address(row.pop('start'))
+                    end = ipaddress.ip_address(row.pop('end'))
+                    rows.append((start, end, row))
+        return cls(rows)
+
+    def find(self, ip_address):
+        try:
+            address = ipaddress.ip_address(ip_address)
+        except ValueError:
+            return {}
+        starts, ends, values = self.index[address.version]
+        position = bisect_right(starts, int(address)) - 1
+        if position >= 0 and int(address) <= ends[position]:
+            return dict(values[position], ip=ip_address)
+        return {}
+
+    def __len__(self):
+        return sum(len(starts) for starts, _, _ in self.index.values())
+
+
+_ranges = None
+_ranges_lock = threading.Lock()
+
+
+def ranges():
+    global _ranges
+    if _ranges is None:
+        with _ranges_lock:
+            if _ranges is None:
+                _ranges = IpRanges.load(IPWHOIS_RANGES)
+    return _ranges
@@ -1,6 +1,14 @@
 import os
+from datetime import datetime, timedelta
 
 import jwt
+from library.utils.cache import TTLCache
+
+# credentials are renewed only when less than this many seconds remain
+AUTH_RENEW_THRESHOLD = int(os.getenv('AUTH_RENEW_THRESHOLD', 600))
+
+# tokens are immutable, so their decoded claims can be reused freely
+decoded = TTLCache(max_size=4096)
 
 
 def auth(payload):
@@ -13,10 +21,43 @@ def auth(payload):
 
 def credentials(payload, key):
     if payload:
-        decoded = jwt.decode(
-            jwt=payload,
+        claims = decoded.get(payload)
+        if claims is None:
+            claims = jwt.decode(
+                jwt=payload,
+                key=os.getenv('JWT_SECRET', 'INSECURE'),
+                algorithms=[os.getenv('JWT_ALGORITHM', 'INSECURE')],
+                options={'verify_signature': False}
+            )
+            decoded.set(payload, claims)
+        return claims[key]
+
+
+def request_claims(request):
+    ''' Verified session claims, decoded once per request and token '''
+    token = request.session.get('auth')
+    if getattr(request, 'auth_token', None) != token or \
+       not hasattr(request, 'auth_claims'):
+        claims = jwt.decode(
+            jwt=token,
             key=os.getenv('JWT_SECRET', 'INSECURE'),
-            algorithms=[os.getenv('JWT_ALGORITHM', 'INSECURE')],
-            options={'verify_signature': False}
+            algorithms=[os.getenv('JWT_ALGORITHM', 'INSECURE')]
+        ) if token else None
+        if claims:
+            decoded.set(token, claims)
+        request.auth_token, request.auth_claims = token, claims
+    return request.auth_claims
+
+
+def renew(request, claims):
+    # re-issue the token only once it gets close to expiring
+    now = datetime.now()
+    remaining = int(claims.get('exp', 0)) - int(now.strftime('%s'))
+    if remaining < AUTH_RENEW_THRESHOLD:
+        claims = dict(
+            claims,
+            exp=(now + timedelta(minutes=30)).strftime('%s')
         )
-        return decoded[key]
+        request.session['auth'] = auth(payload=claims)
+        request.auth_token, request.auth_claims = request.session['auth'], claims  # noqa: E501
+        decoded.set(request.auth_token, claims)
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+
+class TTLCache:
+    # thread-safe LRU cache whose entries also expire after ttl seconds
+    def __init__(self, max_size=1024, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                return default
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def versioned(namespace, key, build, timeout=DEFAULT_TIMEOUT, variant=None):
+    # value and version are fetched together; a stale version rebuilds it,
+    # variants of the same key share its version
+    version_key = f'{namespace}:{key}:version'
+    value_key = f'{namespace}:{key}' + (f':{variant}' if variant else '')
+    cached = cache.get_many([version_key, value_key])
+
+    version = cached.get(version_key)
+    if version is None:
+        # seeded from the clock so an evicted counter never repeats
+        cache.add(version_key, time.time_ns(), None)
+        version = cache.get(version_key)
+    elif value_key in cached and cached[value_key][0] == version:
+        return cached[value_key][1]
+
+    value = build()
+    cache.set(value_key, (version, value), timeout)
+    return value
+
+
+def current_version(namespace, key):
+    # lets in-process caches tell whether a shared value went stale
+    version_key = f'{namespace}:{key}:version'
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), None)
+        version = cache.get(version_key)
+    return version
+
+
+def bump_version(namespace, key):
+    version_key = f'{namespace}:{key}:version'
+    if not cache.add(version_key, time.time_ns(), None):
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            cache.add(version_key, time.time_ns(), None)
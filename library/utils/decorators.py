@@ -1,9 +1,6 @@
-import os
-from datetime import datetime, timedelta
-
 import jwt
 from django.shortcuts import redirect
-from library.utils.auth import auth
+from library.utils.auth import renew, request_claims
 
 
 def auth_check(func) -> dict:
@@ -17,15 +14,10 @@ def auth_check(func) -> dict:
             else:
                 try:
                     # check if credentials are up to date
-                    payload = jwt.decode(
-                        jwt=self.request.session['auth'],
-                        key=os.getenv('JWT_SECRET', 'INSECURE'),
-                        algorithms=[os.getenv('JWT_ALGORITHM', 'INSECURE')]  # noqa: E501
-                    )
+                    claims = request_claims(self.request)
 
                     # renew credentials
-                    payload['exp'] = (datetime.now() + timedelta(minutes=30)).strftime('%s')  # noqa: E501
-                    self.request.session['auth'] = auth(payload=payload)
+                    renew(self.request, claims)
 
                     return func(self)
                 except jwt.ExpiredSignatureError:
@@ -0,0 +1,131 @@
+import csv
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+XLSX_EPOCH = date(1899, 12, 30)
+XML_INVALID = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+XLSX_STATIC = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'  # noqa: E501
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'  # noqa: E501
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'  # noqa: E501
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'  # noqa: E501
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'  # noqa: E501
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'  # noqa: E501
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'  # noqa: E501
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'  # noqa: E501
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'  # noqa: E501
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'  # noqa: E501
+        '</Relationships>'
+    ),
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'  # noqa: E501
+        '<fonts count="1"><font/></fonts>'
+        '<fills count="1"><fill/></fills>'
+        '<borders count="1"><border/></borders>'
+        '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+        '<cellXfs count="2"><xf/><xf numFmtId="14" applyNumberFormat="1"/></cellXfs>'  # noqa: E501
+        '</styleSheet>'
+    ),
+}
+
+
+class Pipe:
+    # write-only file object whose content is drained between yields
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def csv_stream(header, rows):
+    ''' Yield CSV encoded lines, one row at a time '''
+    pipe = Pipe()
+    writer = csv.writer(_Text(pipe))
+    writer.writerow(header)
+    yield b'\xef\xbb\xbf' + pipe.drain()
+    for row in rows:
+        writer.writerow(row)
+        yield pipe.drain()
+
+
+def xlsx_stream(header, rows, sheet='Sheet1', flush_every=500):
+    ''' Yield a single sheet XLSX file, zipped while rows are produced '''
+    pipe = Pipe()
+    with zipfile.ZipFile(pipe, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_STATIC.items():
+            archive.writestr(name, content)
+        archive.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '  # noqa: E501
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'  # noqa: E501
+            f'<sheets><sheet name="{escape(sheet)}" sheetId="1" r:id="rId1"/></sheets>'  # noqa: E501
+            '</workbook>'
+        ))
+        yield pipe.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w',
+                          force_zip64=True) as worksheet:
+            worksheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'  # noqa: E501
+                '<sheetData>' + _xlsx_row(header)
+            ).encode())
+            for count, row in enumerate(rows, start=1):
+                worksheet.write(_xlsx_row(row).encode())
+                if count % flush_every == 0:
+                    yield pipe.drain()
+            worksheet.write(b'</sheetData></worksheet>')
+    yield pipe.drain()
+
+
+def _xlsx_row(values):
+    cells = []
+    for value in values:
+        if value is None:
+            cells.append('<c/>')
+        elif isinstance(value, bool):
+            cells.append(f'<c t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, (int, float, Decimal)):
+            cells.append(f'<c><v>{value}</v></c>')
+        elif isinstance(value, date):
+            day = value.date() if isinstance(value, datetime) else value
+            cells.append(f'<c s="1"><v>{(day - XLSX_EPOCH).days}</v></c>')
+        else:
+            text = escape(XML_INVALID.sub('', str(value)))
+            cells.append(f'<c t="inlineStr"><is><t>{text}</t></is></c>')
+    return '<row>' + ''.join(cells) + '</row>'
+
+
+class _Text:
+    # csv.writer needs a text file; encode straight into the pipe
+    def __init__(self, pipe):
+        self.pipe = pipe
+
+    def write(self, value):
+        return self.pipe.write(value.encode())
@@ -1,6 +1,12 @@
+import base64
 import hashlib
+import json
 import re
-from typing import List
+from datetime import date
+from typing import List, Optional, Tuple
+
+from django.core.exceptions import FieldError, ValidationError
+from django.db.models import Q
 
 
 def hash_gen(str2hash: str) -> str:
@@ -31,3 +37,97 @@ def paginator(pg: int, pg_total: int) -> List[int]:
         pg_init = 1
         pg_end = pg_total
     return list(range(pg_init, (pg_end + 1)))
+
+
+def month_range(year: int, month: int) -> Tuple[date, date]:
+    # half-open [first day, first day of next month) range
+    start = date(year, month, 1)
+    if month == 12:
+        return start, date(year + 1, 1, 1)
+    return start, date(year, month + 1, 1)
+
+
+def cursor_encode(values: list) -> str:
+    return base64.urlsafe_b64encode(
+        json.dumps(values, default=str).encode()
+    ).decode()
+
+
+def cursor_decode(cursor: str) -> Optional[list]:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        return None
+
+
+def _cursor_values(queryset, keys: List[str], cursor) -> Optional[list]:
+    # a tampered cursor is no cursor at all, each value must fit its key
+    if not isinstance(cursor, list) or len(cursor) != len(keys):
+        return None
+    query = queryset.query.chain()
+    values = []
+    for key, value in zip(keys, cursor):
+        if value is not None:
+            if not isinstance(value, (str, int, float, bool)):
+                return None
+            try:
+                field = query.resolve_ref(key.lstrip('-')).output_field
+                value = field.to_python(value)
+            except (FieldError, ValidationError):
+                return None
+        values.append(value)
+    return values
+
+
+def _seek(keys: List[str], values: list, forward: bool) -> Q:
+    # rows strictly after (or before) values in keys order, nulls first
+    seek = Q(pk__in=[])
+    for position, key in enumerate(keys):
+        field, value = key.lstrip('-'), values[position]
+        if key.startswith('-') != forward:
+            condition = Q(**{f'{field}__gt': value}) if value is not None \
+                else Q(**{f'{field}__isnull': False})
+        elif value is not None:
+            condition = Q(**{f'{field}__lt': value}) | \
+                Q(**{f'{field}__isnull': True})
+        else:
+            continue
+        for previous, equal in zip(keys[:position], values):
+            condition &= Q(**{previous.lstrip('-'): equal})
+        seek |= condition
+    return seek
+
+
+def keyset_paginator(queryset, keys: List[str], after: Optional[str],
+                     before: Optional[str], limit: int) -> dict:
+    # keys must be a unique ordering and be part of the selected values
+    cursor = _cursor_values(
+        queryset, keys, cursor_decode(before or after or '')
+    )
+    forward = not before or cursor is None
+    if cursor is not None:
+        queryset = queryset.filter(_seek(keys, cursor, forward))
+
+    if forward:
+        rows = list(queryset.order_by(*keys)[:limit + 1])
+    else:
+        reverse = [key[1:] if key.startswith('-') else f'-{key}' for key in keys]  # noqa: E501
+        rows = list(queryset.order_by(*reverse)[:limit + 1])
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if not forward:
+        rows.reverse()
+
+    def position(row):
+        return cursor_encode([row[key.lstrip('-')] for key in keys])
+
+    return {
+        'rows': rows,
+        'keyset': True,
+        'prev': position(rows[0]) if rows and (
+            more if not forward else cursor is not None
+        ) else None,
+        'next': position(rows[-1]) if rows and (
+            more if forward else True
+        ) else None
+    }
@@ -1,36 +1,212 @@
-from home.forms.user_log_form import UserLogForm
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from home.models import UserLog
 from library.ipwhois.client import ipwhois
 from library.utils.auth import credentials
 
+logger = logging.getLogger(__name__)
 
-def userlog(request, risk=0, comment=None):
-    if request.META.get('REMOTE_ADDR') == '127.0.0.1':
-        whois = {}
-    else:
-        whois = ipwhois(request.META.get('REMOTE_ADDR'))
+LOG_ASYNC = os.getenv('LOG_ASYNC', '1') == '1'
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+LOG_FLUSH_SIZE = int(os.getenv('LOG_FLUSH_SIZE', 200))
+LOG_FLUSH_INTERVAL = float(os.getenv('LOG_FLUSH_INTERVAL', 5))
+LOG_EXIT_TIMEOUT = float(os.getenv('LOG_EXIT_TIMEOUT', 10))
+
+
+class UserLogPipeline:
+    def __init__(self, max_size=LOG_QUEUE_SIZE, flush_size=LOG_FLUSH_SIZE,
+                 flush_interval=LOG_FLUSH_INTERVAL, run_async=LOG_ASYNC):
+        self.queue = queue.Queue(maxsize=max_size)
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.run_async = run_async
+        self.counters = {'queued': 0, 'dropped': 0, 'failed': 0, 'saved': 0}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._worker = None
+
+    def put(self, record):
+        # never block the request: a full queue drops the record (backpressure)
+        try:
+            self.queue.put_nowait(record)
+            self._count('queued')
+        except queue.Full:
+            self._count('dropped')
+            return
+
+        if self.run_async:
+            self._start()
+        else:
+            self.flush()
+
+    def flush(self):
+        # drain everything currently queued, in batches of flush_size
+        saved = 0
+        while True:
+            batch = self._take(self.flush_size)
+            if not batch:
+                return saved
+            saved += self._write(batch)
+
+    def close(self, timeout=LOG_EXIT_TIMEOUT):
+        # stop the worker, then save whatever it left queued
+        self._stopped.set()
+        try:
+            # wakes a worker waiting on the empty queue
+            self.queue.put_nowait(None)
+        except queue.Full:
+            pass
+        if self._worker is not None:
+            self._worker.join(timeout)
+        return self.flush()
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, pending=self.queue.qsize())
+
+    def _start(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._run, name='userlog-worker', daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.flush_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    record = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if record is None:
+                    break
+                batch.append(record)
+
+            if batch:
+                self._write(batch)
+                # the worker owns its own connection, release it between runs
+                connection.close()
+
+    def _take(self, size):
+        batch = []
+        while len(batch) < size:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is not None:
+                batch.append(record)
+        return batch
+
+    def _write(self, batch):
+        whois_cache = {}
+        logs = []
+        for record in batch:
+            ip_address = record.get('log_ip_address')
+            if ip_address not in whois_cache:
+                whois_cache[ip_address] = _whois(ip_address)
+            log = _build_log(record, whois_cache[ip_address])
 
-    country_flag = _get_country_flag(whois.get('country_flag'))
+            try:
+                log.full_clean(exclude=['user'])
+            except ValidationError:
+                self._count('failed')
+                continue
+            logs.append(log)
 
-    request_form = {
-        'user': credentials(request.session.get('auth'), 'whoami'),
+        try:
+            with transaction.atomic():
+                UserLog.objects.bulk_create(logs, batch_size=self.flush_size)
+        except IntegrityError:
+            # a bad row must not take the rest of the batch down with it
+            return self._write_rows(logs)
+        except Exception:
+            logger.exception('userlog: unable to save %s records', len(logs))
+            self._count('failed', len(logs))
+            return 0
+
+        self._count('saved', len(logs))
+        return len(logs)
+
+    def _write_rows(self, logs):
+        saved = 0
+        for log in logs:
+            try:
+                with transaction.atomic():
+                    log.save()
+            except Exception:
+                logger.exception('userlog: unable to save record')
+                self._count('failed')
+            else:
+                saved += 1
+        self._count('saved', saved)
+        return saved
+
+    def _count(self, counter, value=1):
+        with self._lock:
+            self.counters[counter] += value
+
+
+pipeline = UserLogPipeline()
+# the worker is a daemon thread, records still queued at exit are saved here
+atexit.register(pipeline.close)
+
+
+def userlog(request, risk=0, comment=None):
+    # only cheap request data is collected here, enrichment happens later
+    pipeline.put({
+        'user_id': credentials(request.session.get('auth'), 'whoami'),
         'log_user_agent': request.META.get('HTTP_USER_AGENT'),
         'log_ip_address': request.META.get('REMOTE_ADDR'),
-        'log_ip_type': whois.get('type'),
-        'log_ip_country': whois.get('country'),
-        'log_ip_country_flag': country_flag,
-        'log_ip_region': whois.get('region'),
-        'log_ip_city': whois.get('city'),
-        'log_ip_latitude': whois.get('latitude'),
-        'log_ip_longitude': whois.get('longitude'),
         'log_location': request.path,
         'log_method': request.META.get('REQUEST_METHOD'),
         'log_risk_level': risk,
-        'log_risk_comment': comment
-    }
+        'log_risk_comment': comment,
+        'log_date_created': datetime.now()
+    })
+
+
+def _whois(ip_address):
+    if not ip_address or ip_address == '127.0.0.1':
+        return {}
+    try:
+        return ipwhois(ip_address)
+    except Exception:
+        return {}
+
+
+def _build_log(record, whois):
+    return UserLog(
+        **record,
+        log_ip_type=whois.get('type'),
+        log_ip_country=whois.get('country'),
+        log_ip_country_flag=_get_country_flag(whois.get('country_flag')),
+        log_ip_region=whois.get('region'),
+        log_ip_city=whois.get('city'),
+        log_ip_latitude=_coordinate(whois.get('latitude')),
+        log_ip_longitude=_coordinate(whois.get('longitude'))
+    )
+
 
-    form = UserLogForm(request_form)
-    if form.is_valid():
-        form.save()
+def _coordinate(value):
+    # the API answers with floats, keep their literal digits
+    if value is not None:
+        return str(value)
 
 
 def _get_country_flag(country_flag):
@@ -0,0 +1,15 @@
+import jwt
+from library.utils.auth import request_claims
+
+
+class AuthClaimsMiddleware:
+    # attaches request.auth_claims; invalid tokens are left to auth_check
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            request_claims(request)
+        except jwt.InvalidTokenError:
+            pass
+        return self.get_response(request)
@@ -0,0 +1,41 @@
+from bisect import bisect_left
+
+from slugify import slugify
+
+
+def normalize(text):
+    return slugify(text or '', separator=' ')
+
+
+class PrefixIndex:
+    # immutable sorted array of label words, matched by word prefix
+    def __init__(self, items):
+        self.items = list(items)
+        words = sorted(
+            (word, position)
+            for position, (_, text) in enumerate(self.items)
+            for word in set(normalize(text).split())
+        )
+        self.words = [word for word, _ in words]
+        self.positions = [position for _, position in words]
+
+    def lookup(self, query, offset=0, limit=20):
+        ''' Items with a word starting with each query word, in item order '''
+        positions = None
+        for term in normalize(query).split():
+            start = bisect_left(self.words, term)
+            end = bisect_left(self.words, term + '\uffff', lo=start)
+            found = set(self.positions[start:end])
+            positions = found if positions is None else positions & found
+
+        if positions is None:
+            positions = range(len(self.items))
+        else:
+            positions = sorted(positions)
+        return (
+            [self.items[position] for position in positions[offset:offset + limit]],  # noqa: E501
+            len(positions) > offset + limit
+        )
+
+    def __len__(self):
+        return len(self.items)
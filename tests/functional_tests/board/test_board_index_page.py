@@ -106,6 +106,24 @@ class TestBoardIndexPage(TestHelperStatic, HomeHelperMixin,
         self.browser.execute_script('window.location.href += "?y=2022&m=05"')
         self.sleep(1)
 
+    def choose_typeahead(self, select, term, option):
+        # User opens the select dropdown and types part of the option
+        self.browser.find_element(
+            by=By.XPATH,
+            value=f'//span[@aria-labelledby="select2-{select}-container"]'
+        ).click()
+        self.browser.find_element(
+            by=By.XPATH,
+            value='//input[@class="select2-search__field"]'
+        ).send_keys(term)
+        self.sleep(1)
+
+        # User picks the option the server suggested
+        self.browser.find_element(
+            by=By.XPATH,
+            value=f'//li[contains(@class, "select2-results__option") and text()="{option}"]'  # noqa: E501
+        ).click()
+
     # Testing user login in with a existing email of a validated user
     # going to index view details
     def test_board_index_login_in_view_details(self):
@@ -420,24 +438,17 @@ class TestBoardIndexPage(TestHelperStatic, HomeHelperMixin,
         entry_date.clear()
         entry_date.send_keys('02-01-2022')
 
-        # User finds category select area and click on it
-        self.browser.find_element(
-            by=By.XPATH,
-            value='//select[@id="category"]/option[text()="Category"]'
-        ).click()
+        # User finds category select area, types and picks the option
+        self.choose_typeahead('category', 'Cat', 'Category')
         self.sleep(1)
 
-        # User finds beneficiary select area and click on it
-        self.browser.find_element(
-            by=By.XPATH,
-            value='//select[@id="beneficiary"]/option[text()="DES-Beneficiary"]'  # noqa: E501
-        ).click()
+        # User finds beneficiary select area, types and picks the option
+        self.choose_typeahead('beneficiary', 'Ben', 'DES-Beneficiary')
 
-        # User finds account select area and click on it
-        self.browser.find_element(
-            by=By.XPATH,
-            value='//select[@id="account"]/option[text()="Bank Name: 1234 / 123456789"]'  # noqa: E501
-        ).click()
+        # User finds account select area, types and picks the option
+        self.choose_typeahead(
+            'account', 'Bank', 'Bank Name: 1234 / 123456789'
+        )
 
         # User finds amount input area and click on it
         amount = self.browser.find_element(